@@ -0,0 +1,116 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compare the throughput and quality of the article extractors.
+
+Every page of `corpus/` is extracted by each extractor; the text of the
+extracted markdown is compared with the main text of the page written down
+in the `.txt` file next to it. Quality is the precision, recall and F1 of
+the extracted words (CJK characters count as words) against that text.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.extraction.benchmark --repeat 20
+
+Readability.js needs Node and downloads its dependencies on first use, so it
+is only measured with `--readability-js`.
+"""
+
+import argparse
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+from src.crawler.fast_extractor import FastExtractor
+from src.crawler.readability_extractor import ReadabilityExtractor
+from src.utils.text_budget import terms
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def load_corpus() -> list[tuple[str, str, str]]:
+    """Return the (name, html, main text) of every page of the corpus."""
+    return [
+        (
+            path.stem,
+            path.read_text("utf-8"),
+            path.with_suffix(".txt").read_text("utf-8"),
+        )
+        for path in sorted(CORPUS.glob("*.html"))
+    ]
+
+
+def score(extracted: str, expected: str) -> tuple[float, float, float]:
+    """Precision, recall and F1 of the words of `extracted` against `expected`."""
+    got, want = Counter(terms(extracted)), Counter(terms(expected))
+    overlap = sum((got & want).values())
+    precision = overlap / sum(got.values()) if got else 0.0
+    recall = overlap / sum(want.values()) if want else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+    return precision, recall, f1
+
+
+def run(extractor, corpus, repeat: int) -> dict:
+    """Extract every page `repeat` times; quality is scored on the last run."""
+    seconds, qualities = [], {}
+    for name, html, expected in corpus:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            article = extractor.extract_article(html)
+            markdown = article.to_markdown(including_title=False)
+            seconds.append(time.perf_counter() - started)
+        qualities[name] = score(markdown, expected)
+    return {
+        "pages_per_second": len(seconds) / sum(seconds),
+        "median_ms": statistics.median(seconds) * 1000,
+        "precision": statistics.mean(q[0] for q in qualities.values()),
+        "recall": statistics.mean(q[1] for q in qualities.values()),
+        "f1": statistics.mean(q[2] for q in qualities.values()),
+        "pages": qualities,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10, help="runs per page")
+    parser.add_argument(
+        "--readability-js", action="store_true", help="also measure Readability.js"
+    )
+    parser.add_argument("--pages", action="store_true", help="show F1 per page")
+    args = parser.parse_args()
+
+    extractors = {
+        "fast": FastExtractor(),
+        "readability (python)": ReadabilityExtractor(use_readability=False),
+    }
+    if args.readability_js:
+        extractors["readability (js)"] = ReadabilityExtractor(use_readability=True)
+
+    corpus = load_corpus()
+    print(f"{len(corpus)} pages, {args.repeat} run(s) each\n")
+    print(
+        f"{'extractor':<22}{'pages/s':>10}{'median ms':>11}"
+        f"{'precision':>11}{'recall':>8}{'F1':>7}"
+    )
+    results = {}
+    for name, extractor in extractors.items():
+        results[name] = result = run(extractor, corpus, args.repeat)
+        print(
+            f"{name:<22}{result['pages_per_second']:>10.1f}"
+            f"{result['median_ms']:>11.2f}{result['precision']:>11.3f}"
+            f"{result['recall']:>8.3f}{result['f1']:>7.3f}"
+        )
+    if args.pages:
+        print()
+        for page, *_ in corpus:
+            f1s = ", ".join(
+                f"{name} F1={result['pages'][page][2]:.3f}"
+                for name, result in results.items()
+            )
+            print(f"{page:<22}{f1s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the per-request cost of building the workflow graphs.
+
+Before the graph registry, the podcast, ppt and prose handlers built and
+compiled their graph on every request; now every request gets the graph
+compiled once by the registry. For every workflow this compares building
+it from scratch with fetching it from the registry.
+
+Run from the repository root (the graphs import the LLM config, so a
+`conf.yaml` is needed):
+
+    uv run python -m benchmarks.graphs.benchmark --repeat 50
+"""
+
+import argparse
+import statistics
+import time
+
+from src.utils.graph_registry import GRAPHS, GraphRegistry, _load
+
+# Functions building each workflow from scratch
+BUILDERS = {
+    "main": "src.graph.builder:build_graph_with_memory",
+    "enhanced": "src.graph.builder:build_enhanced_graph_with_memory",
+    "podcast": "src.podcast.graph.builder:build_graph",
+    "ppt": "src.ppt.graph.builder:build_graph",
+    "prose": "src.prose.graph.builder:build_graph",
+}
+
+
+def measure(function, repeat: int) -> float:
+    """Median milliseconds of a call of `function`."""
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20, help="calls per graph")
+    args = parser.parse_args()
+
+    registry = GraphRegistry()
+    for name, spec in GRAPHS.items():
+        registry.register(name, _load(spec))
+    compile_seconds = registry.compile_all()
+
+    print(
+        f"{'graph':<10}{'startup ms':>12}{'build ms':>10}"
+        f"{'registry ms':>13}{'saved ms':>10}"
+    )
+    for name, spec in BUILDERS.items():
+        build = measure(_load(spec), args.repeat)
+        cached = measure(lambda: registry.get(name), args.repeat)
+        print(
+            f"{name:<10}{compile_seconds[name] * 1000:>12.1f}{build:>10.2f}"
+            f"{cached:>13.4f}{build - cached:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
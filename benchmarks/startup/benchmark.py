@@ -0,0 +1,58 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Profile the imports run at startup of the API server and the CLI.
+
+Every module is imported in a fresh interpreter with `python -X importtime`;
+this prints the wall time of the import and the modules taking longest to
+import with their own imports. With `--budget-ms` it exits with an error
+when an import takes longer, e.g. in CI.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.startup.benchmark
+    uv run python -m benchmarks.startup.benchmark src.server.app --top 40
+"""
+
+import argparse
+import json
+import sys
+
+from src.utils.import_profile import profile_import
+
+MODULES = ["src.server.app", "main"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules shown")
+    parser.add_argument("--budget-ms", type=float, help="maximum import time")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    profiles = [profile_import(module) for module in args.modules]
+    if args.json:
+        print(json.dumps([p.report(args.top) for p in profiles], indent=2))
+    else:
+        for profile in profiles:
+            print(f"{profile.module}: {profile.total_ms:.0f} ms")
+            print(f"  {'self ms':>9}{'cumulative ms':>15}  module")
+            for m in profile.slowest(args.top):
+                print(
+                    f"  {m.self_us / 1000:>9.1f}{m.cumulative_us / 1000:>15.1f}"
+                    f"  {'  ' * m.depth}{m.name}"
+                )
+    over = [p for p in profiles if args.budget_ms and p.total_ms > args.budget_ms]
+    for profile in over:
+        print(
+            f"{profile.module} took {profile.total_ms:.0f} ms, "
+            f"over the budget of {args.budget_ms:.0f} ms",
+            file=sys.stderr,
+        )
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,6 @@ import asyncio
 from InquirerPy import inquirer
 
 from src.config.questions import BUILT_IN_QUESTIONS, BUILT_IN_QUESTIONS_ZH_CN
-from src.workflow import run_agent_workflow_async
 
 
 def ask(
@@ -30,6 +29,9 @@ def ask(
         max_step_num: Maximum number of steps in a plan
         enable_background_investigation: If True, performs web search before planning to enhance context
     """
+    # Importing the workflow builds the graph, `--help` and the prompts skip it
+    from src.workflow import run_agent_workflow_async
+
     asyncio.run(
         run_agent_workflow_async(
             user_input=question,
@@ -6,6 +6,10 @@ from langgraph.prebuilt import create_react_agent
 from src.prompts import apply_prompt_template
 from src.llms.llm import get_llm_by_type
 from src.config.agents import AGENT_LLM_MAP
+from src.utils.context_compaction import (
+    CompactingAgentState,
+    context_compaction_hook,
+)
 
 
 # Create agents using configured LLM types
@@ -16,4 +20,7 @@ def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template:
         model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
         tools=tools,
         prompt=lambda state: apply_prompt_template(prompt_template, state),
+        # Old tool results are cut down once the history exceeds its token budget
+        pre_model_hook=context_compaction_hook(agent_name),
+        state_schema=CompactingAgentState,
     )
@@ -15,6 +15,11 @@ class Configuration:
     max_plan_iterations: int = 1  # Maximum number of plan iterations
     max_step_num: int = 3  # Maximum number of steps in a plan
     max_search_results: int = 3  # Maximum number of search results
+    max_parallel_steps: int = 1  # Maximum number of plan steps executed concurrently
+    early_start_steps: bool = False  # Start ready steps while the plan is streamed
+    findings_token_budget: int = 6000  # Tokens of earlier findings given to a step
+    report_token_budget: int = 24000  # Tokens of findings given to the reporter
+    agent_context_token_budget: int = 32000  # Tokens of an agent's history per LLM call
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
 
     @classmethod
@@ -13,7 +13,17 @@ class SearchEngine(enum.Enum):
     DUCKDUCKGO = "duckduckgo"
     BRAVE_SEARCH = "brave_search"
     ARXIV = "arxiv"
+    FEDERATED = "federated"
 
 
 # Tool configuration
 SELECTED_SEARCH_ENGINE = os.getenv("SEARCH_API", SearchEngine.TAVILY.value)
+
+# Engines queried concurrently when SEARCH_API is federated
+FEDERATED_SEARCH_ENGINES = [
+    engine.strip()
+    for engine in os.getenv("FEDERATED_SEARCH_ENGINES", "tavily,duckduckgo").split(",")
+    if engine.strip()
+]
+# Deadline of each engine in a federated search
+SEARCH_ENGINE_TIMEOUT_SECONDS = float(os.getenv("SEARCH_ENGINE_TIMEOUT_SECONDS", "10"))
@@ -1,10 +1,21 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .article import Article
-from .crawler import Crawler
+import importlib
 
-__all__ = [
-    "Article",
-    "Crawler",
-]
+# Imported on first use, the HTML parsers behind them are slow to import
+_EXPORTS = {
+    "Article": ".article",
+    "Crawler": ".crawler",
+}
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_EXPORTS)
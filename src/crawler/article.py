@@ -1,37 +1,72 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import re
+from typing import Iterator, Optional
 from urllib.parse import urljoin
 
-from markdownify import markdownify as md
+from .markdown_stream import iter_markdown, split_images, take
 
 
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(
+        self, title: str, html_content: str, markdown_content: Optional[str] = None
+    ):
         self.title = title
         self.html_content = html_content
+        # Markdown of the content, converted once
+        self._markdown_content = markdown_content
 
-    def to_markdown(self, including_title: bool = True) -> str:
-        markdown = ""
+    def _blocks(self, including_title: bool) -> Iterator[str]:
+        """Markdown blocks of the article, converted as they are consumed."""
         if including_title:
-            markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
-        return markdown
+            yield f"# {self.title}"
+        if self._markdown_content is not None:
+            if self._markdown_content:
+                yield self._markdown_content
+        else:
+            yield from iter_markdown(self.html_content)
 
-    def to_message(self) -> list[dict]:
-        image_pattern = r"!\[.*?\]\((.*?)\)"
+    def to_markdown(
+        self, including_title: bool = True, max_chars: Optional[int] = None
+    ) -> str:
+        """
+        Convert the article to markdown.
 
-        content: list[dict[str, str]] = []
-        parts = re.split(image_pattern, self.to_markdown())
+        Args:
+            including_title: Whether to start with the title as a heading
+            max_chars: Stop converting once the markdown reaches this size
 
-        for i, part in enumerate(parts):
-            if i % 2 == 1:
-                image_url = urljoin(self.url, part.strip())
-                content.append({"type": "image_url", "image_url": {"url": image_url}})
-            else:
-                content.append({"type": "text", "text": part.strip()})
+        Returns:
+            The markdown of the article
+        """
+        if max_chars is None and self._markdown_content is None:
+            self._markdown_content = "\n\n".join(iter_markdown(self.html_content))
+        return "\n\n".join(take(self._blocks(including_title), max_chars))
+
+    def to_message(self, max_chars: Optional[int] = None) -> list[dict]:
+        """
+        Convert the article to message content, alternating text and images.
 
+        Args:
+            max_chars: Stop converting once the markdown reaches this size
+
+        Returns:
+            The text and image_url parts of the article
+        """
+        content: list[dict] = []
+        text: list[str] = []
+        for i, block in enumerate(take(self._blocks(True), max_chars)):
+            if i:
+                text.append("\n\n")
+            for kind, value in split_images(block):
+                if kind == "text":
+                    text.append(value)
+                    continue
+                content.append({"type": "text", "text": "".join(text).strip()})
+                text = []
+                image_url = urljoin(self.url, value.strip())
+                content.append({"type": "image_url", "image_url": {"url": image_url}})
+        content.append({"type": "text", "text": "".join(text).strip()})
         return content
@@ -0,0 +1,406 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Persistent cache of crawled articles.
+
+Articles are stored on disk under `CRAWL_CACHE_DIR`, addressed by the hash of
+their content so pages served under several URLs are kept once, and indexed
+by normalized URL in a SQLite file. Their markdown is stored with them, so a
+cache hit is not converted again. The cache is bounded to
+`CRAWL_CACHE_MAX_MB` and evicts least recently used entries first.
+
+An entry is served as is for `CRAWL_CACHE_TTL_SECONDS`. After that it is
+revalidated against the origin with its ETag/Last-Modified validators when
+the origin provided any, and crawled again otherwise.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from src.utils.http_client import async_http_request, http_request
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|msclkid|mc_cid|mc_eid)$")
+# Validator requests only decide whether a cached page is still current
+_VALIDATOR_TIMEOUT = httpx.Timeout(5.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES objects (digest),
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return the cache key of a URL.
+
+    The scheme and host are lowercased, default ports, fragments and tracking
+    parameters are dropped, and the remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc += f":{parts.port}"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _TRACKING_PARAM.match(key)
+        )
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+@dataclass
+class Validators:
+    """HTTP validators of a page, used for conditional revalidation."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "Validators":
+        return cls(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def request_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def unchanged(self, response: httpx.Response) -> bool:
+        """Tell whether the origin response confirms the page did not change."""
+        if response.status_code == 304:
+            return True
+        # Some servers ignore conditional HEAD requests and answer 200
+        current = Validators.from_response(response)
+        return response.is_success and bool(current) and current == self
+
+
+def fetch_validators(url: str) -> Validators:
+    """Fetch the validators of a page from its origin, empty if unavailable."""
+    try:
+        response = http_request("HEAD", url, retries=0, timeout=_VALIDATOR_TIMEOUT)
+        return (
+            Validators.from_response(response) if response.is_success else Validators()
+        )
+    except httpx.HTTPError as e:
+        logger.debug(f"Could not fetch validators of {url}: {e!r}")
+        return Validators()
+
+
+async def afetch_validators(url: str) -> Validators:
+    """Async version of `fetch_validators`."""
+    try:
+        response = await async_http_request(
+            "HEAD", url, retries=0, timeout=_VALIDATOR_TIMEOUT
+        )
+        return (
+            Validators.from_response(response) if response.is_success else Validators()
+        )
+    except httpx.HTTPError as e:
+        logger.debug(f"Could not fetch validators of {url}: {e!r}")
+        return Validators()
+
+
+def revalidate(url: str, validators: Validators) -> bool:
+    """Ask the origin whether a cached page is still current."""
+    try:
+        response = http_request(
+            "HEAD",
+            url,
+            retries=0,
+            timeout=_VALIDATOR_TIMEOUT,
+            headers=validators.request_headers(),
+        )
+        return validators.unchanged(response)
+    except httpx.HTTPError as e:
+        logger.debug(f"Could not revalidate {url}: {e!r}")
+        return False
+
+
+async def arevalidate(url: str, validators: Validators) -> bool:
+    """Async version of `revalidate`."""
+    try:
+        response = await async_http_request(
+            "HEAD",
+            url,
+            retries=0,
+            timeout=_VALIDATOR_TIMEOUT,
+            headers=validators.request_headers(),
+        )
+        return validators.unchanged(response)
+    except httpx.HTTPError as e:
+        logger.debug(f"Could not revalidate {url}: {e!r}")
+        return False
+
+
+@dataclass
+class CachedArticle:
+    """An article read from the cache."""
+
+    article: Article
+    validators: Validators
+    fresh: bool
+
+
+class CrawlCache:
+    """
+    Disk-backed, size-bounded LRU cache of extracted articles.
+
+    Args:
+        directory: Directory holding the index and the article files
+        max_bytes: Maximum total size of the stored articles
+        ttl_seconds: Age after which an entry must be revalidated
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(directory, "index.sqlite"),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def get(self, url: str) -> Optional[CachedArticle]:
+        """
+        Look up the article crawled from a URL.
+
+        Args:
+            url: The crawled URL
+
+        Returns:
+            The cached article, or None on a miss
+        """
+        key = normalize_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag, last_modified, fetched_at FROM entries"
+                " WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            digest, etag, last_modified, fetched_at = row
+            try:
+                with open(self._object_path(digest), encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable crawl cache entry {key}: {e!r}")
+                self._delete_entry(key, digest)
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), key)
+            )
+
+        # Entries written before the markdown was cached are converted again
+        article = Article(
+            title=data["title"],
+            html_content=data["html_content"],
+            markdown_content=data.get("markdown_content"),
+        )
+        article.url = url
+        fresh = time.time() - fetched_at < self.ttl_seconds
+        if fresh:
+            self.hits += 1
+        else:
+            self.stale += 1
+        return CachedArticle(article, Validators(etag, last_modified), fresh)
+
+    def put(
+        self, url: str, article: Article, validators: Optional[Validators] = None
+    ) -> None:
+        """
+        Store the article crawled from a URL, evicting old entries if needed.
+
+        Args:
+            url: The crawled URL
+            article: The extracted article, stored with its markdown
+            validators: The validators of the page at its origin
+        """
+        key = normalize_url(url)
+        validators = validators or Validators()
+        data = json.dumps(
+            {
+                "title": article.title,
+                "html_content": article.html_content,
+                "markdown_content": article.to_markdown(including_title=False),
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT digest FROM entries WHERE url = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR IGNORE INTO objects (digest, size) VALUES (?, ?)",
+                (digest, len(data)),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, validators.etag, validators.last_modified, now, now),
+            )
+            if previous and previous[0] != digest:
+                self._drop_unreferenced(previous[0])
+            self._evict()
+
+    def renew(self, url: str) -> None:
+        """Mark a cached entry as fresh again after a successful revalidation."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET fetched_at = ? WHERE url = ?",
+                (time.time(), normalize_url(url)),
+            )
+        self.revalidations += 1
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drop the entry of a URL, or every entry when no URL is given."""
+        with self._lock:
+            if url is None:
+                rows = self._db.execute("SELECT url, digest FROM entries").fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT url, digest FROM entries WHERE url = ?",
+                    (normalize_url(url),),
+                ).fetchall()
+            for key, digest in rows:
+                self._delete_entry(key, digest)
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the current size of the cache."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()[0]
+        # Stale entries confirmed by the origin are served without crawling
+        served = self.hits + self.revalidations
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "revalidations": self.revalidations,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _delete_entry(self, key: str, digest: str) -> None:
+        self._db.execute("DELETE FROM entries WHERE url = ?", (key,))
+        self._drop_unreferenced(digest)
+
+    def _drop_unreferenced(self, digest: str) -> None:
+        referenced = self._db.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if referenced:
+            return
+        self._db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        try:
+            os.remove(self._object_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM objects"
+        ).fetchone()[0]
+        while size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT url, digest FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._delete_entry(*row)
+            self.evictions += 1
+            size = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()[0]
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the process-wide crawl cache, None if disabled."""
+    global _crawl_cache
+    max_mb = float(os.getenv("CRAWL_CACHE_MAX_MB") or 512)
+    if max_mb <= 0:
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            _crawl_cache = CrawlCache(
+                directory=os.getenv("CRAWL_CACHE_DIR") or ".cache/crawl",
+                max_bytes=int(max_mb * 1024 * 1024),
+                ttl_seconds=float(os.getenv("CRAWL_CACHE_TTL_SECONDS") or 24 * 3600),
+            )
+        return _crawl_cache
@@ -1,11 +1,26 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Union
+from urllib.parse import urlparse
 
 from .article import Article
+from .cache import (
+    afetch_validators,
+    arevalidate,
+    fetch_validators,
+    get_crawl_cache,
+    revalidate,
+)
+from .extraction import get_extraction_service
 from .jina_client import JinaClient
-from .readability_extractor import ReadabilityExtractor
+
+# Fetches the validators of a page while it is crawled
+_validators_pool = ThreadPoolExecutor(thread_name_prefix="crawl-validators")
 
 
 class Crawler:
@@ -20,13 +35,85 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
-        article.url = url
+        #
+        # Crawled articles are cached on disk, so pages read by an earlier
+        # step or session are only revalidated against their origin.
+        cache = get_crawl_cache()
+        if cache is None:
+            html = JinaClient().crawl(url, return_format="html")
+            return get_extraction_service().extract(html, url)
+
+        cached = cache.get(url)
+        if cached is not None:
+            if cached.fresh:
+                return cached.article
+            if cached.validators and revalidate(url, cached.validators):
+                cache.renew(url)
+                return cached.article
+
+        # Ask the origin for its validators while Jina crawls the page
+        validators = _validators_pool.submit(fetch_validators, url)
+        html = JinaClient().crawl(url, return_format="html")
+        article = get_extraction_service().extract(html, url)
+        cache.put(url, article, validators.result())
+        return article
+
+    async def acrawl(self, url: str) -> Article:
+        """Async version of `crawl`, extracting the article in a worker process."""
+        # The cache reads and writes files and sqlite, off the event loop
+        cache = get_crawl_cache()
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, url)
+            if cached is not None:
+                if cached.fresh:
+                    return cached.article
+                if cached.validators and await arevalidate(url, cached.validators):
+                    await asyncio.to_thread(cache.renew, url)
+                    return cached.article
+
+        if cache is None:
+            html = await JinaClient().acrawl(url, return_format="html")
+        else:
+            html, validators = await asyncio.gather(
+                JinaClient().acrawl(url, return_format="html"),
+                afetch_validators(url),
+            )
+        article = await get_extraction_service().aextract(html, url)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, url, article, validators)
         return article
 
+    async def acrawl_many(
+        self, urls: Iterable[str], max_concurrency_per_host: int = 2
+    ) -> AsyncIterator[tuple[str, Union[Article, Exception]]]:
+        """
+        Crawl several URLs concurrently and yield each result as it completes.
+
+        Args:
+            urls: URLs to crawl, duplicates are crawled once
+            max_concurrency_per_host: Maximum concurrent requests to one host
+
+        Yields:
+            (url, article) pairs in completion order, with the exception
+            instead of the article when crawling that URL failed
+        """
+        host_limits = defaultdict(lambda: asyncio.Semaphore(max_concurrency_per_host))
+
+        async def crawl_one(url: str) -> tuple[str, Union[Article, Exception]]:
+            async with host_limits[urlparse(url).netloc]:
+                try:
+                    return url, await self.acrawl(url)
+                except Exception as e:
+                    return url, e
+
+        tasks = [asyncio.create_task(crawl_one(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
 
 if __name__ == "__main__":
     if len(sys.argv) == 2:
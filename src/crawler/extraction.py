@@ -0,0 +1,354 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Article extraction in a pool of worker processes.
+
+Readability extraction and the conversion of articles to markdown are CPU
+bound, and readabilipy may run Node for every page. They run in a bounded
+pool of warm worker processes, so they neither block the event loop nor
+hold the GIL of the API process:
+
+- `CRAWL_EXTRACTION_WORKERS`: number of worker processes (0 extracts in a
+  thread of the calling process instead)
+- `CRAWL_MAX_HTML_MB`: HTML beyond this size is truncated before extraction
+- `CRAWL_EXTRACTION_TIMEOUT_SECONDS`: extractions taking longer fail with
+  `ExtractionTimeout`, and the pool replaces its workers; an extraction
+  running in a thread cannot be stopped and finishes unobserved
+- `CRAWL_READABILITY_JS`: set to false to use readabilipy's pure Python mode
+- `CRAWL_EXTRACTOR`: `readability` (default) or `fast`, the lxml based
+  `FastExtractor`
+- `CRAWL_MAX_MARKDOWN_CHARS`: markdown conversion stops at this size (0 for
+  no limit)
+"""
+
+import asyncio
+import bisect
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from .article import Article
+from .fast_extractor import FastExtractor
+from .readability_extractor import ReadabilityExtractor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS = ("readability", "fast")
+
+# Upper bounds, in seconds, of the extraction time histogram buckets
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class ExtractionTimeout(TimeoutError):
+    """Raised when extracting an article takes longer than the timeout."""
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _extract(
+    html: str,
+    extractor: str,
+    use_readability: bool,
+    max_markdown_chars: Optional[int] = None,
+) -> tuple[str, str, str]:
+    """Extract the article of a page; runs in the worker processes."""
+    if extractor == "fast":
+        article = FastExtractor().extract_article(html)
+    else:
+        article = ReadabilityExtractor(use_readability).extract_article(html)
+    markdown = article.to_markdown(False, max_chars=max_markdown_chars)
+    return article.title, article.html_content, markdown
+
+
+class ExtractionStats:
+    """Counters and the distribution of extraction times."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._durations: deque[float] = deque(maxlen=window)
+        self._buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.extractions = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.truncated = 0
+
+    def record(self, seconds: float, outcome: str = "ok") -> None:
+        with self._lock:
+            self.extractions += 1
+            if outcome == "failure":
+                self.failures += 1
+            elif outcome == "timeout":
+                self.timeouts += 1
+            self._durations.append(seconds)
+            self._buckets[bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+
+    def record_truncated(self) -> None:
+        with self._lock:
+            self.truncated += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            durations = sorted(self._durations)
+            buckets = list(self._buckets)
+            counters = {
+                "extractions": self.extractions,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "truncated": self.truncated,
+            }
+
+        def percentile(p: float) -> Optional[float]:
+            if not durations:
+                return None
+            return round(durations[min(len(durations) - 1, int(p * len(durations)))], 4)
+
+        labels = [f"le_{bound}s" for bound in HISTOGRAM_BUCKETS] + ["inf"]
+        return {
+            **counters,
+            "seconds": {
+                "mean": (
+                    round(sum(durations) / len(durations), 4) if durations else None
+                ),
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": round(durations[-1], 4) if durations else None,
+            },
+            "histogram": dict(zip(labels, buckets)),
+        }
+
+
+class ExtractionService:
+    """
+    Extracts articles from HTML in a pool of worker processes.
+
+    Args:
+        workers: Number of worker processes, 0 to extract in threads
+        timeout_seconds: Deadline of every extraction
+        max_html_bytes: HTML beyond this size is truncated
+        use_readability: Whether readabilipy may use Readability.js
+        extractor: "readability" or "fast"
+        max_markdown_chars: Markdown conversion stops at this size, None for
+            no limit
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        timeout_seconds: float = 30,
+        max_html_bytes: int = 5 * 1024 * 1024,
+        use_readability: bool = True,
+        extractor: str = "readability",
+        max_markdown_chars: Optional[int] = 200_000,
+    ):
+        if extractor not in EXTRACTORS:
+            raise ValueError(
+                f"Unknown extractor: {extractor}, expected one of {EXTRACTORS}"
+            )
+        self.extractor = extractor
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.max_html_bytes = max_html_bytes
+        self.use_readability = use_readability
+        self.max_markdown_chars = max_markdown_chars or None
+        self.stats = ExtractionStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Runs the extractions when there are no worker processes
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process running threads and an event loop is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(thread_name_prefix="extraction")
+            return self._threads
+
+    def _replace_pool(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the workers of a pool stuck on an extraction."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # Extractions still queued on the pool fail with BrokenProcessPool
+        # and are resubmitted to the new workers
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+        logger.warning("Replaced the article extraction workers")
+
+    def start(self) -> None:
+        """Start all worker processes, so the first pages are not slowed down."""
+        if self.workers <= 0:
+            return
+        pool = self._pool()
+        pids = {f.result() for f in [pool.submit(_ping) for _ in range(self.workers)]}
+        logger.info(f"Started {len(pids)} article extraction worker(s)")
+
+    def _prepare(self, html: str) -> str:
+        encoded = html.encode("utf-8")
+        if len(encoded) <= self.max_html_bytes:
+            return html
+        self.stats.record_truncated()
+        logger.warning(
+            f"Truncating HTML of {len(encoded)} bytes to {self.max_html_bytes} bytes"
+        )
+        return encoded[: self.max_html_bytes].decode("utf-8", errors="ignore")
+
+    @staticmethod
+    def _article(result: tuple[str, str, str], url: str) -> Article:
+        title, html_content, markdown = result
+        article = Article(title, html_content, markdown_content=markdown)
+        article.url = url
+        return article
+
+    def _arguments(self) -> tuple:
+        return self.extractor, self.use_readability, self.max_markdown_chars
+
+    def _submit(self, html: str) -> tuple[ProcessPoolExecutor, Future]:
+        pool = self._pool()
+        try:
+            return pool, pool.submit(_extract, html, *self._arguments())
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            pool = self._pool()
+            return pool, pool.submit(_extract, html, *self._arguments())
+
+    def extract(self, html: str, url: str) -> Article:
+        """
+        Extract the article of a page.
+
+        Args:
+            html: HTML of the page
+            url: URL of the page
+
+        Returns:
+            The article, with its markdown already converted
+        """
+        html = self._prepare(html)
+        started = time.perf_counter()
+        outcome = "failure"
+        try:
+            if self.workers <= 0:
+                future = self._thread_pool().submit(_extract, html, *self._arguments())
+                try:
+                    result = future.result(timeout=self.timeout_seconds)
+                except TimeoutError:
+                    outcome = "timeout"
+                    raise ExtractionTimeout(
+                        f"Extracting {url} took longer than {self.timeout_seconds}s"
+                    )
+            else:
+                pool, future = self._submit(html)
+                try:
+                    result = future.result(timeout=self.timeout_seconds)
+                except TimeoutError:
+                    outcome = "timeout"
+                    self._replace_pool(pool)
+                    raise ExtractionTimeout(
+                        f"Extracting {url} took longer than {self.timeout_seconds}s"
+                    )
+                except BrokenProcessPool:
+                    # The workers were replaced because of another page
+                    self._replace_pool(pool)
+                    _, future = self._submit(html)
+                    result = future.result(timeout=self.timeout_seconds)
+            outcome = "ok"
+            return self._article(result, url)
+        finally:
+            self.stats.record(time.perf_counter() - started, outcome)
+
+    async def aextract(self, html: str, url: str) -> Article:
+        """Async version of `extract`."""
+        html = self._prepare(html)
+        started = time.perf_counter()
+        outcome = "failure"
+        try:
+            if self.workers <= 0:
+                future = self._thread_pool().submit(_extract, html, *self._arguments())
+                try:
+                    result = await asyncio.wait_for(
+                        asyncio.wrap_future(future), self.timeout_seconds
+                    )
+                except asyncio.TimeoutError:
+                    outcome = "timeout"
+                    raise ExtractionTimeout(
+                        f"Extracting {url} took longer than {self.timeout_seconds}s"
+                    )
+            else:
+                pool, future = self._submit(html)
+                try:
+                    result = await asyncio.wait_for(
+                        asyncio.wrap_future(future), self.timeout_seconds
+                    )
+                except asyncio.TimeoutError:
+                    outcome = "timeout"
+                    self._replace_pool(pool)
+                    raise ExtractionTimeout(
+                        f"Extracting {url} took longer than {self.timeout_seconds}s"
+                    )
+                except BrokenProcessPool:
+                    # The workers were replaced because of another page
+                    self._replace_pool(pool)
+                    _, future = self._submit(html)
+                    result = await asyncio.wait_for(
+                        asyncio.wrap_future(future), self.timeout_seconds
+                    )
+            outcome = "ok"
+            return self._article(result, url)
+        finally:
+            self.stats.record(time.perf_counter() - started, outcome)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            threads, self._threads = self._threads, None
+        for pool in (executor, threads):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+_extraction_service: Optional[ExtractionService] = None
+_extraction_service_lock = threading.Lock()
+
+
+def get_extraction_service() -> ExtractionService:
+    """Return the process-wide extraction service."""
+    global _extraction_service
+    with _extraction_service_lock:
+        if _extraction_service is None:
+            _extraction_service = ExtractionService(
+                workers=int(os.getenv("CRAWL_EXTRACTION_WORKERS") or 4),
+                timeout_seconds=float(
+                    os.getenv("CRAWL_EXTRACTION_TIMEOUT_SECONDS") or 30
+                ),
+                max_html_bytes=int(
+                    float(os.getenv("CRAWL_MAX_HTML_MB") or 5) * 1024 * 1024
+                ),
+                use_readability=os.getenv("CRAWL_READABILITY_JS", "true").lower()
+                not in ("0", "false", "no"),
+                extractor=os.getenv("CRAWL_EXTRACTOR") or "readability",
+                max_markdown_chars=int(
+                    os.getenv("CRAWL_MAX_MARKDOWN_CHARS") or 200_000
+                ),
+            )
+        return _extraction_service
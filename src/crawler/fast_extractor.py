@@ -0,0 +1,200 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process article extractor based on lxml.
+
+A faster alternative to `ReadabilityExtractor` that needs neither Node nor
+the pure Python Readability port: boilerplate elements are dropped, text
+blocks are scored by their length and link density, and the container
+holding the densest text is kept along with the sibling blocks that look
+like part of the article. Select it with `CRAWL_EXTRACTOR=fast`.
+"""
+
+import re
+from typing import Optional
+
+import lxml.html
+from lxml.etree import ParserError
+from lxml.html import HtmlElement
+
+from .article import Article
+
+# Elements that never hold article content
+_BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "form",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "svg",
+    "button",
+    "input",
+    "select",
+    "textarea",
+    "template",
+    "dialog",
+)
+_NEGATIVE = re.compile(
+    r"comment|footer|sidebar|side-bar|\bnav|menu|share|social|related|advert"
+    r"|\bads?\b|promo|sponsor|cookie|banner|subscribe|newsletter|breadcrumb"
+    r"|popup|modal|masthead|widget|disqus|rss|signup|toolbar|pagination",
+    re.IGNORECASE,
+)
+_POSITIVE = re.compile(
+    r"article|content|main|post|entry|story|text|body|blog|prose", re.IGNORECASE
+)
+_TEXT_BLOCKS = ("p", "pre", "blockquote", "td", "li", "dd")
+_KEPT_ATTRIBUTES = {"href", "src", "alt", "title", "colspan", "rowspan"}
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>", re.IGNORECASE)
+# Blocks shorter than this are not scored as content
+_MIN_BLOCK_CHARS = 25
+
+
+def _text_length(element: HtmlElement) -> int:
+    return len(" ".join(element.text_content().split()))
+
+
+def _link_density(element: HtmlElement) -> float:
+    text = _text_length(element)
+    if not text:
+        return 1.0 if element.xpath(".//a") else 0.0
+    links = sum(_text_length(link) for link in element.iter("a"))
+    return links / text
+
+
+def _class_weight(element: HtmlElement) -> int:
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    if not names.strip():
+        return 0
+    weight = 0
+    if _NEGATIVE.search(names):
+        weight -= 25
+    if _POSITIVE.search(names):
+        weight += 25
+    return weight
+
+
+def _comma_count(text: str) -> int:
+    return text.count(",") + text.count("，") + text.count("、")
+
+
+class FastExtractor:
+    def extract_article(self, html: str) -> Article:
+        try:
+            document = lxml.html.document_fromstring(_XML_DECLARATION.sub("", html))
+        except (ParserError, ValueError):
+            return Article(title="", html_content="")
+        title = self._title(document)
+        self._remove_boilerplate(document)
+        content = self._content(document)
+        if content is None:
+            return Article(title=title, html_content="")
+        self._clean(content)
+        return Article(
+            title=title,
+            html_content=lxml.html.tostring(content, encoding="unicode"),
+        )
+
+    def _title(self, document: HtmlElement) -> str:
+        for xpath in (
+            "//meta[@property='og:title']/@content",
+            "//title/text()",
+            "//h1",
+        ):
+            for found in document.xpath(xpath):
+                text = found if isinstance(found, str) else found.text_content()
+                text = " ".join(text.split())
+                if text:
+                    return text
+        return ""
+
+    def _remove_boilerplate(self, document: HtmlElement) -> None:
+        for element in list(document.iter(*_BOILERPLATE_TAGS)):
+            if element.getparent() is not None:
+                element.drop_tree()
+        for element in list(document.iter()):
+            if element.tag in ("html", "body") or element.getparent() is None:
+                continue
+            if not isinstance(element.tag, str):
+                # Comments and processing instructions
+                element.drop_tree()
+            elif _class_weight(element) < 0 and element.tag not in ("article", "main"):
+                element.drop_tree()
+
+    def _content(self, document: HtmlElement) -> Optional[HtmlElement]:
+        # Every text block adds its score to its parent and half of it to
+        # its grandparent, as in Readability
+        scores: dict[HtmlElement, float] = {}
+        for block in document.iter(*_TEXT_BLOCKS):
+            text = " ".join(block.text_content().split())
+            if len(text) < _MIN_BLOCK_CHARS:
+                continue
+            score = 1 + _comma_count(text) + min(len(text) / 100, 3)
+            parent = block.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+                if ancestor is None:
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = _class_weight(ancestor) + (
+                        5 if ancestor.tag in ("article", "main") else 0
+                    )
+                scores[ancestor] += score * share
+        if not scores:
+            body = document.find("body")
+            return body if body is not None and _text_length(body) else None
+
+        # Links dilute the score: menus and link lists are not content
+        best = max(scores, key=lambda e: scores[e] * (1 - _link_density(e)))
+        best_score = scores[best] * (1 - _link_density(best))
+
+        # Keep siblings that belong to the article, like paragraphs split
+        # into several containers
+        parent = best.getparent()
+        if parent is None:
+            return best
+        threshold = max(10, best_score * 0.2)
+        container = lxml.html.Element("div")
+        for sibling in list(parent):
+            if not isinstance(sibling.tag, str):
+                continue
+            keep = sibling is best
+            if not keep and sibling in scores:
+                keep = scores[sibling] * (1 - _link_density(sibling)) >= threshold
+            if not keep and sibling.tag == "p":
+                text_length = _text_length(sibling)
+                density = _link_density(sibling)
+                keep = (text_length > 80 and density < 0.25) or (
+                    0 < text_length <= 80
+                    and density == 0
+                    and "." in sibling.text_content()
+                )
+            if keep:
+                container.append(sibling)
+        return container
+
+    def _clean(self, content: HtmlElement) -> None:
+        for element in list(content.iter()):
+            if element is content or element.getparent() is None:
+                continue
+            if element.tag in ("ul", "ol", "div", "section", "table"):
+                # Link lists and leftover widgets inside the article
+                if _link_density(element) > 0.5 and _text_length(element) < 500:
+                    element.drop_tree()
+                    continue
+            if (
+                element.tag in ("p", "div", "span", "section")
+                and not _text_length(element)
+                and not element.xpath(".//img")
+            ):
+                element.drop_tree()
+        for element in content.iter():
+            if isinstance(element.tag, str):
+                for attribute in list(element.attrib):
+                    if attribute not in _KEPT_ATTRIBUTES:
+                        del element.attrib[attribute]
@@ -4,13 +4,13 @@
 import logging
 import os
 
-import requests
+from src.utils.http_client import async_http_request, http_request, max_retries
 
 logger = logging.getLogger(__name__)
 
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def _headers(self, return_format: str) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +21,30 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
+        return headers
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        data = {"url": url}
+        response = http_request(
+            "POST",
+            "https://r.jina.ai/",
+            headers=self._headers(return_format),
+            json=data,
+            # Reading a page has no side effect, retry it like a GET
+            retries=max_retries(),
+        )
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
         data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        response = await async_http_request(
+            "POST",
+            "https://r.jina.ai/",
+            headers=self._headers(return_format),
+            json=data,
+            # Reading a page has no side effect, retry it like a GET
+            retries=max_retries(),
+        )
+        response.raise_for_status()
         return response.text
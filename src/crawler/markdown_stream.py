@@ -0,0 +1,138 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Streaming conversion of article HTML to markdown.
+
+`markdownify` converts a whole document into one string. Here the parsed
+tree is walked once and converted block by block: containers holding block
+elements are descended into, every other element is converted on its own
+with markdownify's rules. Blocks are yielded as they are converted, so
+consumers can stop at a size budget without converting the rest of the
+page, and split out images one small block at a time.
+"""
+
+import re
+from typing import Iterable, Iterator, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from markdownify import MarkdownConverter, should_remove_whitespace_outside
+
+IMAGE_PATTERN = re.compile(r"!\[.*?\]\((.*?)\)")
+
+# Elements whose own conversion only separates their children
+_CONTAINERS = frozenset(
+    ("[document]", "html", "body", "div", "section", "article", "main", "header")
+)
+_HEADING = re.compile(r"^h[1-6]$")
+
+
+def _is_block(node) -> bool:
+    if not isinstance(node, Tag):
+        return False
+    return bool(
+        should_remove_whitespace_outside(node)
+        or _HEADING.match(node.name)
+        or node.name in ("hr", "figure")
+        or node.name in _CONTAINERS
+    )
+
+
+def _is_text(node) -> bool:
+    # Comments, doctypes and other special strings are not content
+    return type(node) is NavigableString
+
+
+class StreamingMarkdownConverter(MarkdownConverter):
+    """A markdownify converter yielding the markdown of a document block by block."""
+
+    def iter_blocks(self, html: str) -> Iterator[str]:
+        """
+        Convert HTML to markdown, one block at a time.
+
+        Args:
+            html: The HTML to convert
+
+        Yields:
+            The markdown of every block, without surrounding blank lines
+        """
+        yield from self._iter_node(BeautifulSoup(html, "html.parser"), frozenset())
+
+    def _iter_node(self, node: Tag, parent_tags: frozenset) -> Iterator[str]:
+        children_tags = set(parent_tags | {node.name})
+        inline: list[str] = []
+        for child in node.children:
+            if isinstance(child, Tag):
+                if _is_block(child):
+                    yield from self._flush(inline)
+                    if child.name in _CONTAINERS and any(
+                        _is_block(grandchild) for grandchild in child.children
+                    ):
+                        yield from self._iter_node(child, frozenset(children_tags))
+                    else:
+                        yield from self._flush(
+                            [self.process_tag(child, parent_tags=children_tags)]
+                        )
+                else:
+                    inline.append(self.process_tag(child, parent_tags=children_tags))
+            elif _is_text(child):
+                inline.append(self.process_text(child, parent_tags=children_tags))
+        yield from self._flush(inline)
+
+    @staticmethod
+    def _flush(inline: list[str]) -> Iterator[str]:
+        if inline:
+            text = "".join(inline).strip()
+            inline.clear()
+            if text:
+                yield text
+
+
+def iter_markdown(html: Optional[str]) -> Iterator[str]:
+    """Yield the markdown of `html` block by block."""
+    if not html:
+        return
+    yield from StreamingMarkdownConverter().iter_blocks(html)
+
+
+def split_images(block: str) -> Iterator[tuple[str, str]]:
+    """
+    Split a markdown block into its text and images.
+
+    Yields:
+        ("text", text) and ("image", url) parts, in order
+    """
+    position = 0
+    for match in IMAGE_PATTERN.finditer(block):
+        yield "text", block[position : match.start()]
+        yield "image", match.group(1)
+        position = match.end()
+    yield "text", block[position:]
+
+
+def take(blocks: Iterable[str], max_chars: Optional[int]) -> Iterator[str]:
+    """
+    Yield blocks until their markdown, joined by blank lines, fills `max_chars`.
+
+    The block reaching the budget is cut at the last whitespace that fits;
+    later blocks are never converted.
+    """
+    if max_chars is None:
+        yield from blocks
+        return
+    used = 0
+    for block in blocks:
+        separator = 2 if used else 0
+        remaining = max(0, max_chars - used - separator)
+        if len(block) > remaining:
+            cut = block[:remaining]
+            words = cut.rsplit(None, 1)
+            if not block[remaining].isspace() and len(words) > 1:
+                cut = words[0]
+            if cut.strip():
+                yield cut.rstrip()
+            return
+        used += separator + len(block)
+        yield block
+        if used + 2 >= max_chars:
+            return
@@ -7,8 +7,14 @@ from .article import Article
 
 
 class ReadabilityExtractor:
+    def __init__(self, use_readability: bool = True):
+        # Readability.js runs in Node, pure Python extraction is used without it
+        self.use_readability = use_readability
+
     def extract_article(self, html: str) -> Article:
-        article = simple_json_from_html_string(html, use_readability=True)
+        article = simple_json_from_html_string(
+            html, use_readability=self.use_readability
+        )
         return Article(
             title=article.get("title"),
             html_content=article.get("content"),
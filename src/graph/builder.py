@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: MIT
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+
+from src.utils.checkpoint import create_memory_checkpointer
 
 from .types import State
 from .nodes import (
@@ -44,19 +45,23 @@ def _build_enhanced_graph():
     builder.add_node("background_investigator", background_investigation_node)
     builder.add_node("planner", planner_node)
     builder.add_node("enhanced_reporter", enhanced_reporter_node)
+    # The planner and research team route to the plain reporter unless
+    # `use_enhanced_reporter` is set, so it must exist for the graph to compile
+    builder.add_node("reporter", reporter_node)
     builder.add_node("research_team", research_team_node)
     builder.add_node("researcher", researcher_node)
     builder.add_node("coder", coder_node)
     builder.add_node("human_feedback", human_feedback_node)
+    builder.add_edge("reporter", END)
     builder.add_edge("enhanced_reporter", END)
     return builder
 
 
 def build_graph_with_memory():
     """Build and return the agent workflow graph with memory."""
-    # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    # use bounded memory to save conversation history; the API server swaps in
+    # the durable checkpointer selected by CHECKPOINT_BACKEND at startup
+    memory = create_memory_checkpointer()
 
     # build state graph
     builder = _build_base_graph()
@@ -65,7 +70,7 @@ def build_graph_with_memory():
 
 def build_enhanced_graph_with_memory():
     """Build and return the enhanced agent workflow graph with memory."""
-    memory = MemorySaver()
+    memory = create_memory_checkpointer()
     builder = _build_enhanced_graph()
     return builder.compile(checkpointer=memory)
 
@@ -81,6 +86,3 @@ def build_enhanced_graph():
     """Build and return the enhanced agent workflow graph without memory."""
     builder = _build_enhanced_graph()
     return builder.compile()
-
-
-graph = build_graph()
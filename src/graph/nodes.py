@@ -2,6 +2,7 @@ import json
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
 import os
 from typing import Annotated, Literal
@@ -9,24 +10,29 @@ from typing import Annotated, Literal
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langgraph.types import Command, interrupt
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langgraph.config import get_stream_writer
+from langgraph.types import Command, Send, interrupt
+from pydantic import ValidationError
 
 from src.agents import create_agent
 from src.tools.search import LoggedTavilySearch
 from src.tools import (
+    crawl_many_tool,
     crawl_tool,
     get_web_search_tool,
+    local_retrieve_tool,
     python_repl_tool,
 )
 
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
 from src.llms.llm import get_llm_by_type
-from src.prompts.planner_model import Plan, StepType
+from src.prompts.planner_model import Plan, Step, StepType
 from src.prompts.template import apply_prompt_template
-from src.utils.json_utils import repair_json_output
+from src.utils.json_utils import StreamingJSONParser, repair_json_output
+from src.utils.mcp_pool import get_mcp_client_pool
 from src.utils.mcp_tools import get_installed_mcp_tools, recommend_tools_for_step
+from src.utils.observation_store import ObservationStore
 
 from .types import State
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
@@ -79,7 +85,7 @@ def background_investigation_node(
     )
 
 
-def planner_node(
+async def planner_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["human_feedback", "reporter", "enhanced_reporter"]]:
     """Planner node that generate the full plan."""
@@ -106,20 +112,61 @@ def planner_node(
 
     llm = get_llm_by_type(AGENT_LLM_MAP["planner"])
 
-    # 统一使用llm.stream(messages)，兼容openrouter流式返回格式
-    response = llm.stream(messages)
-    full_response = ""
-    for chunk in response:
-        if hasattr(chunk, 'content') and chunk.content:
-            full_response += chunk.content
-        else:
-            logger.warning(f"[openrouter流式兼容] 跳过无content字段的chunk: {chunk}")
-    logger.debug(f"Current state messages: {state['messages']}")
-    logger.info(f"Planner response: {full_response}")
+    # 统一使用llm.astream(messages)，兼容openrouter流式返回格式
+    # Stream asynchronously so other sessions keep running while planning, and
+    # publish the plan to the client as its fields and steps are completed
+    writer = get_stream_writer()
+    parser = StreamingJSONParser("steps")
+    chunks: list[str] = []
+    # Opt-in: run the first ready steps of an auto-accepted plan while the
+    # planner is still writing the remaining ones
+    early_start = state.get("auto_accepted_plan", False) and str(
+        configurable.early_start_steps
+    ).lower() in ("true", "1")
+    max_parallel_steps = max(1, int(configurable.max_parallel_steps))
+    early_steps: dict[int, tuple[dict, asyncio.Task]] = {}
+    try:
+        async for chunk in llm.astream(messages):
+            if not (hasattr(chunk, "content") and chunk.content):
+                logger.warning(f"[openrouter流式兼容] 跳过无content字段的chunk: {chunk}")
+                continue
+            chunks.append(chunk.content)
+            completed_fields = len(parser.fields)
+            new_steps = parser.feed(chunk.content)
+            if not new_steps and len(parser.fields) == completed_fields:
+                continue
+            writer({"type": "partial_plan", "id": chunk.id, "plan": parser.partial})
+            if early_start and new_steps:
+                _start_early_steps(
+                    state, config, parser.partial, early_steps, max_parallel_steps
+                )
+        full_response = "".join(chunks)
+        return await _finish_plan(
+            state, config, configurable, full_response, plan_iterations, early_steps
+        )
+    finally:
+        for _, task in early_steps.values():
+            task.cancel()
 
+
+async def _finish_plan(
+    state: State,
+    config: RunnableConfig,
+    configurable: Configuration,
+    full_response: str,
+    plan_iterations: int,
+    early_steps: dict[int, tuple[dict, asyncio.Task]],
+) -> Command[Literal["human_feedback", "reporter", "enhanced_reporter"]]:
+    """Parse the complete planner response and route to the next node."""
     try:
         curr_plan = json.loads(repair_json_output(full_response))
-        
+        # Keep the early started steps only if the final plan still has them
+        early_steps_kept = {
+            index: task
+            for index, (streamed_step, task) in early_steps.items()
+            if curr_plan.get("steps", [])[index : index + 1] == [streamed_step]
+        }
+
         # === 修改：从 configurable.mcp_settings 构建工具列表 ===
         available_mcp_tools = []
         if configurable.mcp_settings and "servers" in configurable.mcp_settings:
@@ -149,6 +196,16 @@ def planner_node(
                 # 如果是，则这里也应该用 t["tool"]
                 tool_str = ", ".join(f'`{t["tool"]}`' for t in recommended) # 确认使用 "tool" 键
                 step["description"] = step.get("description", "") + f"\n\n建议使用的MCP工具：{tool_str}"
+
+        # Validate the step dependency graph, fall back to running the steps in order
+        try:
+            Plan.model_validate(curr_plan)
+        except ValidationError as e:
+            logger.warning(f"Invalid step dependencies, running steps in order: {e}")
+            early_steps_kept = {}
+            for position, step in enumerate(curr_plan.get("steps", []), start=1):
+                step["id"] = position
+                step["depends_on"] = list(range(1, position))
     except json.JSONDecodeError:
         logger.warning("Planner response is not a valid JSON")
         if plan_iterations > 0:
@@ -169,13 +226,75 @@ def planner_node(
             },
             goto="enhanced_reporter" if use_enhanced_reporter else "reporter",
         )
-    return Command(
-        update={
-            "messages": [AIMessage(content=full_response, name="planner")],
-            "current_plan": full_response,
-        },
-        goto="human_feedback",
-    )
+    update = {
+        "messages": [AIMessage(content=full_response, name="planner")],
+        "current_plan": json.dumps(curr_plan, ensure_ascii=False),
+    }
+    if early_steps_kept:
+        step_results, step_messages = await _collect_early_steps(early_steps_kept)
+        update["messages"] += step_messages
+        update["step_results"] = step_results
+    return Command(update=update, goto="human_feedback")
+
+
+def _start_early_steps(
+    state: State,
+    config: RunnableConfig,
+    partial_plan: dict,
+    early_steps: dict[int, tuple[dict, asyncio.Task]],
+    max_parallel_steps: int,
+) -> None:
+    """Start the ready steps of a plan that is still being streamed."""
+    if partial_plan.get("has_enough_context") or len(early_steps) >= max_parallel_steps:
+        return
+    try:
+        plan = Plan.model_validate(
+            {
+                "locale": state.get("locale", "en-US"),
+                "has_enough_context": False,
+                "thought": "",
+                "title": "",
+                **partial_plan,
+            }
+        )
+    except ValidationError:
+        # e.g. a step depends on a step that has not been streamed yet
+        return
+    agent_nodes = {"researcher": researcher_node, "coder": coder_node}
+    for index in plan.next_step_batch(max_parallel_steps):
+        if index in early_steps or len(early_steps) >= max_parallel_steps:
+            continue
+        step = plan.steps[index]
+        logger.info(f"Starting step '{step.title}' before the plan is complete")
+        step_state = {
+            **state,
+            "current_plan": plan,
+            "step_index": index,
+            "locale": plan.locale,
+        }
+        task = asyncio.create_task(
+            agent_nodes[_agent_for_step(step)](step_state, config)
+        )
+        early_steps[index] = (partial_plan["steps"][index], task)
+
+
+async def _collect_early_steps(
+    early_steps: dict[int, asyncio.Task],
+) -> tuple[dict[int, str], list]:
+    """Wait for the early started steps and return their results and messages."""
+    step_results: dict[int, str] = {}
+    messages = []
+    for index, task in early_steps.items():
+        try:
+            command = await task
+        except Exception as e:
+            # research_team will run the step again
+            logger.warning(f"Early started step {index} failed: {e!r}")
+            continue
+        update = command.update or {}
+        step_results.update(update.get("step_results", {}))
+        messages += update.get("messages", [])
+    return step_results, messages
 
 
 def human_feedback_node(
@@ -285,10 +404,24 @@ async def enhanced_reporter_node(state: State, config: RunnableConfig):
     current_plan = state.get("current_plan")
     observations = state.get("observations", [])
     
+    # Findings beyond the token budget are abridged, the full text stays
+    # readable page by page through the read_findings tool
+    observation_store = ObservationStore.from_observations(observations)
+    findings = observation_store.select(
+        f"{current_plan.title}\n{current_plan.thought}",
+        int(configurable.report_token_budget),
+    )
+    paging_hint = ""
+    if not all(finding.complete for finding in findings):
+        paging_hint = " Some findings are abridged where marked with [...]; use the `read_findings` tool to read them in full when needed."
+
     # 准备基础工具
     default_tools = [
         get_web_search_tool(configurable.max_search_results),  # 用于事实核查
         crawl_tool,  # 用于深度信息获取
+        crawl_many_tool,
+        local_retrieve_tool,
+        observation_store.as_tool(),
     ]
     
     # 准备报告员的输入数据，模拟一个"报告生成"步骤
@@ -296,8 +429,8 @@ async def enhanced_reporter_node(state: State, config: RunnableConfig):
         "messages": [
             HumanMessage(
                 content=f"# Report Generation Task\n\n## Research Topic\n\n{current_plan.title}\n\n## Research Description\n\n{current_plan.thought}\n\n## Research Findings\n\n" + 
-                "\n\n".join([f"### Finding {i+1}\n{obs}" for i, obs in enumerate(observations)]) +
-                f"\n\n## Instructions\n\nGenerate a comprehensive research report based on the above findings. Use available tools to verify key facts, fill information gaps, and enhance the report quality. Ensure all information is accurate and up-to-date.\n\n## Locale\n\n{state.get('locale', 'en-US')}"
+                "\n\n".join([f"### Finding {i+1}\n{finding.content}" for i, finding in enumerate(findings)]) +
+                f"\n\n## Instructions\n\nGenerate a comprehensive research report based on the above findings. Use available tools to verify key facts, fill information gaps, and enhance the report quality. Ensure all information is accurate and up-to-date.{paging_hint}\n\n## Locale\n\n{state.get('locale', 'en-US')}"
             )
         ]
     }
@@ -339,30 +472,29 @@ async def enhanced_reporter_node(state: State, config: RunnableConfig):
     # Create and execute agent with MCP tools if available
     if mcp_servers:
         try:
-            async with MultiServerMCPClient(mcp_servers) as client:
-                loaded_tools = default_tools[:]
-                for tool in client.get_tools():
-                    if tool.name in enabled_tools:
-                        tool.description = (
-                            f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
-                        )
-                        loaded_tools.append(tool)
-                
-                # 创建增强版报告员代理，使用专门的提示模板
-                agent = create_agent("enhanced_reporter", "enhanced_reporter", loaded_tools, "enhanced_reporter")
-                
-                # 执行报告生成
-                result = await agent.ainvoke(
-                    input=reporter_input, 
-                    config={"recursion_limit": 25}
-                )
-                
-                # 提取报告内容
-                response_content = result["messages"][-1].content
-                # logger.info(f"Enhanced reporter response: {response_content}") # 暂时注释掉
-                
-                return {"final_report": response_content}
-                
+            loaded_tools = default_tools[:]
+            for tool in await get_mcp_client_pool().get_tools(mcp_servers):
+                if tool.name in enabled_tools:
+                    tool.description = (
+                        f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
+                    )
+                    loaded_tools.append(tool)
+
+            # 创建增强版报告员代理，使用专门的提示模板
+            agent = create_agent("enhanced_reporter", "enhanced_reporter", loaded_tools, "enhanced_reporter")
+
+            # 执行报告生成
+            result = await agent.ainvoke(
+                input=reporter_input, 
+                config={"recursion_limit": 25}
+            )
+
+            # 提取报告内容
+            response_content = result["messages"][-1].content
+            # logger.info(f"Enhanced reporter response: {response_content}") # 暂时注释掉
+
+            return {"final_report": response_content}
+
         except Exception as e:
             logger.warning(f"Failed to start MCP servers for enhanced reporter: {e}. Using default tools instead.")
             # Fall back to default tools if MCP server startup fails
@@ -386,9 +518,10 @@ async def enhanced_reporter_node(state: State, config: RunnableConfig):
         return {"final_report": response_content}
 
 
-def reporter_node(state: State):
+def reporter_node(state: State, config: RunnableConfig):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
     current_plan = state.get("current_plan")
     input_ = {
         "messages": [
@@ -409,10 +542,15 @@ def reporter_node(state: State):
         )
     )
 
-    for observation in observations:
+    # Observations beyond the token budget are cut down to their most relevant passages
+    findings = ObservationStore.from_observations(observations).select(
+        f"{current_plan.title}\n{current_plan.thought}",
+        int(configurable.report_token_budget),
+    )
+    for finding in findings:
         invoke_messages.append(
             HumanMessage(
-                content=f"Below are some observations for the research task:\n\n{observation}",
+                content=f"Below are some observations for the research task:\n\n{finding.content}",
                 name="observation",
             )
         )
@@ -425,23 +563,59 @@ def reporter_node(state: State):
 
 
 def research_team_node(
-    state: State,
+    state: State, config: RunnableConfig
 ) -> Command[Literal["planner", "researcher", "coder"]]:
     """Research team node that collaborates on tasks."""
     logger.info("Research team is collaborating on tasks.")
+    configurable = Configuration.from_runnable_config(config)
     current_plan = state.get("current_plan")
     if not current_plan or not current_plan.steps:
         return Command(goto="planner")
+
+    # Merge the results of the previous parallel wave back in plan order
+    update = {}
+    step_results = state.get("step_results")
+    if step_results:
+        observations = list(state.get("observations", []))
+        for index, step in enumerate(current_plan.steps):
+            if index in step_results and not step.execution_res:
+                step.execution_res = step_results[index]
+                observations.append(step_results[index])
+        update = {
+            "current_plan": current_plan,
+            "observations": observations,
+            "step_results": None,
+        }
+
     if all(step.execution_res for step in current_plan.steps):
-        return Command(goto="planner")
-    for step in current_plan.steps:
-        if not step.execution_res:
-            break
-    if step.step_type and step.step_type == StepType.RESEARCH:
-        return Command(goto="researcher")
-    if step.step_type and step.step_type == StepType.PROCESSING:
-        return Command(goto="coder")
-    return Command(goto="planner")
+        return Command(update=update, goto="planner")
+
+    max_parallel_steps = max(1, int(configurable.max_parallel_steps))
+    batch = current_plan.next_step_batch(max_parallel_steps)
+    if not batch:
+        logger.warning("No executable step found, returning to planner.")
+        return Command(update=update, goto="planner")
+    if len(batch) > 1:
+        logger.info(f"Fanning out {len(batch)} independent steps: {batch}")
+
+    # Every dispatched step is told its index so it only sees its own context
+    payload = {**state, **update}
+    payload.pop("step_results", None)
+    return Command(
+        update=update,
+        goto=[
+            Send(
+                _agent_for_step(current_plan.steps[index]),
+                {**payload, "step_index": index},
+            )
+            for index in batch
+        ],
+    )
+
+
+def _agent_for_step(step: Step) -> Literal["researcher", "coder"]:
+    """Return the agent node responsible for executing the given step."""
+    return "coder" if step.step_type == StepType.PROCESSING else "researcher"
 
 
 def _get_intelligent_tool_recommendations(step_title: str, step_description: str, agent_type: str) -> dict:
@@ -661,23 +835,16 @@ async def _setup_and_execute_agent_step(
 
     configurable = Configuration.from_runnable_config(config)
     current_plan = state.get("current_plan")
-    observations = state.get("observations", []) # Get observations at the beginning
-
-    # Get current step for intelligent tool selection and execution
-    # This is the step that will be executed by the agent
-    current_step_to_execute = None
-    completed_steps_for_input = [] # For providing context to the agent
-    if current_plan and current_plan.steps:
-        for step_obj in current_plan.steps:
-            if not step_obj.execution_res:
-                current_step_to_execute = step_obj
-                break # Found the step to execute
-            else:
-                completed_steps_for_input.append(step_obj)
-    
-    if not current_step_to_execute:
-        logger.warning(f"No unexecuted step found for {agent_type}. Returning to research_team.")
+
+    # research_team (or the planner, for early started steps) dispatches
+    # every step with its index
+    step_index = state.get("step_index")
+    if step_index is None or not current_plan:
+        logger.warning(f"No step dispatched to {agent_type}. Returning to research_team.")
         return Command(goto="research_team")
+    current_step_to_execute = current_plan.steps[step_index]
+    # Only feed the findings of the steps this step depends on
+    completed_steps_for_input = current_plan.context_steps(current_step_to_execute)
 
     # Get intelligent tool recommendations
     recommendations = {}
@@ -740,10 +907,17 @@ async def _setup_and_execute_agent_step(
         
         completed_steps_info_str = ""
         if completed_steps_context:
-            completed_steps_info_str = "# Existing Research Findings\\n\\n"
-            for i, c_step in enumerate(completed_steps_context):
-                completed_steps_info_str += f"## Existing Finding {i+1}: {c_step.title}\\n\\n"
-                completed_steps_info_str += f"<finding>\\n{c_step.execution_res}\\n</finding>\\n\\n"
+            # Earlier findings are cut down to the passages relevant to this step
+            findings = ObservationStore(
+                (c_step.title, c_step.execution_res) for c_step in completed_steps_context
+            ).select(
+                f"{step_to_run.title}\n{step_to_run.description}",
+                int(configurable.findings_token_budget),
+            )
+            completed_steps_info_str = "# Existing Research Findings\n\n"
+            for i, finding in enumerate(findings):
+                completed_steps_info_str += f"## Existing Finding {i+1}: {finding.title}\n\n"
+                completed_steps_info_str += f"<finding>\n{finding.content}\n</finding>\n\n"
 
         agent_input_dict = {
             "messages": [
@@ -773,15 +947,22 @@ async def _setup_and_execute_agent_step(
         result = await agent_instance.ainvoke(input=agent_input_dict, config={"recursion_limit": recursion_limit})
         logger.info(f"[DEBUG] Agent '{agent_type}' raw result: {result}")
 
+        tokens_saved = sum(
+            record["tokens_saved"] for record in result.get("context_compaction", [])
+        )
+        if tokens_saved:
+            logger.info(f"Context compaction saved {tokens_saved} tokens over the {agent_type} step")
+
         response_content = result["messages"][-1].content
         logger.debug(f"{agent_type.capitalize()} full response: {response_content}") # 恢复此行日志
-        step_to_run.execution_res = response_content # Update the original step object
         logger.info(f"Step '{step_to_run.title}' execution completed by {agent_type}")
 
+        # Steps report back through the step_results channel and
+        # research_team merges them into the plan in plan order
         return Command(
             update={
                 "messages": [HumanMessage(content=response_content, name=agent_type)],
-                "observations": observations + [response_content], # Use observations from outer scope
+                "step_results": {step_index: response_content},
             },
             goto="research_team",
         )
@@ -790,39 +971,38 @@ async def _setup_and_execute_agent_step(
     if mcp_servers_config:
         try:
             logger.info(f"🔌 Attempting to connect to {len(mcp_servers_config)} MCP server(s): {list(mcp_servers_config.keys())}")
-            # Correctly manage MultiServerMCPClient lifecycle
-            # Timeout can wrap the 'async with' if using asyncio.timeout (Python 3.11+)
-            # For now, focusing on ClosedResourceError by correct 'async with' usage
-            async with MultiServerMCPClient(mcp_servers_config) as client:
-                logger.info("✅ MCP servers connected successfully (client context entered)")
-                
-                loaded_mcp_tools = default_tools[:] # Start with default tools
-                actual_mcp_tools_loaded = [] # For logging
-                
-                for tool_instance in client.get_tools():
-                    if tool_instance.name in enabled_mcp_tools:
-                        tool_instance.description = (
-                            f"Powered by '{enabled_mcp_tools[tool_instance.name]}'.\\n{tool_instance.description}"
-                        )
-                        actual_mcp_tools_loaded.append(tool_instance)
-                
-                if current_step_to_execute and actual_mcp_tools_loaded:
-                    actual_mcp_tools_loaded = _enhance_tool_descriptions_with_context(
-                        actual_mcp_tools_loaded, 
-                        current_step_to_execute.title, 
-                        current_step_to_execute.description, 
-                        recommendations
+            # Servers are kept warm by the process-wide pool instead of being
+            # spawned and torn down for every step
+            pooled_tools = await get_mcp_client_pool().get_tools(mcp_servers_config)
+            logger.info("✅ MCP servers connected successfully (pooled sessions)")
+
+            loaded_mcp_tools = default_tools[:] # Start with default tools
+            actual_mcp_tools_loaded = [] # For logging
+
+            for tool_instance in pooled_tools:
+                if tool_instance.name in enabled_mcp_tools:
+                    tool_instance.description = (
+                        f"Powered by '{enabled_mcp_tools[tool_instance.name]}'.\\n{tool_instance.description}"
                     )
-                
-                loaded_mcp_tools.extend(actual_mcp_tools_loaded)
-                
-                if actual_mcp_tools_loaded:
-                    tool_names = [t.name for t in actual_mcp_tools_loaded]
-                    logger.info(f"🔧 Enhanced {agent_type} with {len(actual_mcp_tools_loaded)} MCP tools: {tool_names}")
-                
-                mcp_agent = create_agent(agent_type, agent_type, loaded_mcp_tools, agent_type)
-                return await _invoke_agent_on_step(mcp_agent, current_step_to_execute, completed_steps_for_input)
-                
+                    actual_mcp_tools_loaded.append(tool_instance)
+
+            if current_step_to_execute and actual_mcp_tools_loaded:
+                actual_mcp_tools_loaded = _enhance_tool_descriptions_with_context(
+                    actual_mcp_tools_loaded, 
+                    current_step_to_execute.title, 
+                    current_step_to_execute.description, 
+                    recommendations
+                )
+
+            loaded_mcp_tools.extend(actual_mcp_tools_loaded)
+
+            if actual_mcp_tools_loaded:
+                tool_names = [t.name for t in actual_mcp_tools_loaded]
+                logger.info(f"🔧 Enhanced {agent_type} with {len(actual_mcp_tools_loaded)} MCP tools: {tool_names}")
+
+            mcp_agent = create_agent(agent_type, agent_type, loaded_mcp_tools, agent_type)
+            return await _invoke_agent_on_step(mcp_agent, current_step_to_execute, completed_steps_for_input)
+
         except asyncio.TimeoutError: # If a timeout wraps the above block and triggers
             logger.warning("⏰ MCP server operation timed out.")
             logger.info("🔄 Falling back to default tools")
@@ -851,7 +1031,12 @@ async def researcher_node(
         state,
         config,
         "researcher",
-        [get_web_search_tool(configurable.max_search_results), crawl_tool],
+        [
+            get_web_search_tool(configurable.max_search_results),
+            crawl_tool,
+            crawl_many_tool,
+            local_retrieve_tool,
+        ],
     )
 
 
@@ -9,6 +9,15 @@ from langgraph.graph import MessagesState
 from src.prompts.planner_model import Plan
 
 
+def merge_step_results(
+    left: dict[int, str] | None, right: dict[int, str] | None
+) -> dict[int, str]:
+    """Merge results of steps executed in parallel, `None` resets the channel."""
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
@@ -21,3 +30,4 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    step_results: Annotated[dict[int, str], merge_step_results] = {}
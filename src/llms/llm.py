@@ -2,18 +2,19 @@
 # SPDX-License-Identifier: MIT
 
 from pathlib import Path
-from typing import Any, Dict
-
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING, Any, Dict
 
 from src.config import load_yaml_config
 from src.config.agents import LLMType
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 # Cache for LLM instances
-_llm_cache: dict[LLMType, ChatOpenAI] = {}
+_llm_cache: dict[LLMType, "ChatOpenAI"] = {}
 
 
-def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAI:
+def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> "ChatOpenAI":
     llm_type_map = {
         "reasoning": conf.get("REASONING_MODEL"),
         "basic": conf.get("BASIC_MODEL"),
@@ -24,12 +25,15 @@ def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAI:
         raise ValueError(f"Unknown LLM type: {llm_type}")
     if not isinstance(llm_conf, dict):
         raise ValueError(f"Invalid LLM Conf: {llm_type}")
+    # langchain_openai and the openai client are slow to import
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(**llm_conf)
 
 
 def get_llm_by_type(
     llm_type: LLMType,
-) -> ChatOpenAI:
+) -> "ChatOpenAI":
     """
     Get LLM instance by type. Returns cached instance if available.
     """
@@ -44,8 +48,12 @@ def get_llm_by_type(
     return llm
 
 
-# Initialize LLMs for different purposes - now these will be cached
-basic_llm = get_llm_by_type("basic")
+def __getattr__(name: str):
+    # basic_llm is created on first use, not when the module is imported
+    if name == "basic_llm":
+        return get_llm_by_type("basic")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # In the future, we will use reasoning_llm and vl_llm for different purposes
 # reasoning_llm = get_llm_by_type("reasoning")
@@ -53,4 +61,4 @@ basic_llm = get_llm_by_type("basic")
 
 
 if __name__ == "__main__":
-    print(basic_llm.invoke("Hello"))
+    print(get_llm_by_type("basic").invoke("Hello"))
@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Streaming of podcast audio while the script is being synthesized.
+
+Lines are synthesized concurrently and their MP3 audio is emitted in the
+order of the script as soon as every line before it is ready, so playback
+starts after the first line instead of the whole episode. Lines finished
+ahead of their turn wait in a spooled temporary file, which moves to disk
+once it grows beyond `PODCAST_SPOOL_MAX_MB`.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import AsyncIterator
+
+from src.podcast.graph.tts_node import TTSError, synthesize_line
+from src.podcast.types import ScriptLine
+from src.tools.tts import VolcengineTTS
+
+logger = logging.getLogger(__name__)
+
+
+class AudioSpool:
+    """
+    Audio of lines waiting for their turn, kept in a spooled temporary file.
+
+    Args:
+        max_memory_bytes: The audio moves to disk beyond this size
+    """
+
+    def __init__(self, max_memory_bytes: int):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        # Offset and length of the audio of every waiting line
+        self._chunks: dict[int, tuple[int, int]] = {}
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._chunks
+
+    @property
+    def on_disk(self) -> bool:
+        return self._file._rolled
+
+    def put(self, index: int, audio: bytes) -> None:
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(audio)
+        self._chunks[index] = (offset, len(audio))
+
+    def pop(self, index: int) -> bytes:
+        offset, length = self._chunks.pop(index)
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def stream_podcast_audio(
+    tts_client: VolcengineTTS,
+    lines: list[ScriptLine],
+    concurrency: int = 4,
+    retries: int = 2,
+    retry_delay: float = 0.5,
+    spool_max_bytes: int = 16 * 1024 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize the lines of a script and yield their audio in script order.
+
+    Args:
+        tts_client: The TTS client
+        lines: Lines of the script
+        concurrency: Maximum number of requests in flight
+        retries: Retries of every failed line
+        retry_delay: Delay before the first retry, doubled for each next one
+        spool_max_bytes: Audio waiting for its turn moves to disk beyond this
+
+    Yields:
+        The MP3 audio of every line; raises TTSError at the first line
+        failing every attempt
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(
+            synthesize_line(tts_client, index, line, semaphore, retries, retry_delay)
+        )
+        for index, line in enumerate(lines)
+    ]
+    spool = AudioSpool(spool_max_bytes)
+    started = time.perf_counter()
+    next_index = 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            synthesis = await finished
+            if synthesis.audio is None:
+                raise TTSError(
+                    f"Failed to synthesize line {synthesis.index}: {synthesis.error}"
+                )
+            if synthesis.index != next_index:
+                spool.put(synthesis.index, synthesis.audio)
+                synthesis.audio = None
+                continue
+            if next_index == 0:
+                logger.info(
+                    f"First podcast audio after {time.perf_counter() - started:.2f}s"
+                )
+            yield synthesis.audio
+            synthesis.audio = None
+            next_index += 1
+            while next_index in spool:
+                yield spool.pop(next_index)
+                next_index += 1
+        logger.info(
+            f"Streamed {len(lines)} podcast lines in "
+            f"{time.perf_counter() - started:.2f}s"
+            + (", spooled to disk" if spool.on_disk else "")
+        )
+    finally:
+        # The client went away or a line failed: stop the other requests
+        for task in tasks:
+            task.cancel()
+        spool.close()
@@ -26,12 +26,14 @@ def build_graph():
 workflow = build_graph()
 
 if __name__ == "__main__":
+    import asyncio
+
     from dotenv import load_dotenv
 
     load_dotenv()
 
     report_content = open("examples/nanjing_tangbao.md").read()
-    final_state = workflow.invoke({"input": report_content})
+    final_state = asyncio.run(workflow.ainvoke({"input": report_content}))
     for line in final_state["script"].lines:
         print("<M>" if line.speaker == "male" else "<F>", line.text)
 
@@ -20,3 +20,5 @@ class PodcastState(MessagesState):
     # Assets
     script: Optional[Script] = None
     audio_chunks: list[bytes] = []
+    # Attempts and latency of the synthesis of every line
+    tts_report: list[dict] = []
@@ -1,36 +1,151 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import logging
 import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Optional
 
 from src.podcast.graph.state import PodcastState
+from src.podcast.types import ScriptLine
 from src.tools.tts import VolcengineTTS
 
 logger = logging.getLogger(__name__)
 
 
-def tts_node(state: PodcastState):
+class TTSError(Exception):
+    """Raised when lines of the script could not be synthesized."""
+
+
+@dataclass
+class LineSynthesis:
+    """Outcome of synthesizing one line of the script."""
+
+    index: int
+    audio: Optional[bytes] = None
+    attempts: int = 0
+    # Duration of every attempt, in seconds
+    latencies: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def report(self) -> dict:
+        return {
+            "line": self.index,
+            "success": self.audio is not None,
+            "attempts": self.attempts,
+            "seconds": round(sum(self.latencies), 3),
+            "error": self.error,
+        }
+
+
+def _voice_type(line: ScriptLine) -> str:
+    return "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
+
+
+async def synthesize_line(
+    tts_client: VolcengineTTS,
+    index: int,
+    line: ScriptLine,
+    semaphore: asyncio.Semaphore,
+    retries: int,
+    retry_delay: float,
+) -> LineSynthesis:
+    """Synthesize one line, retrying it with exponential backoff on failure."""
+    synthesis = LineSynthesis(index)
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+        async with semaphore:
+            started = time.perf_counter()
+            result = await tts_client.atext_to_speech(
+                line.paragraph, speed_ratio=1.05, voice_type=_voice_type(line)
+            )
+            synthesis.latencies.append(time.perf_counter() - started)
+        synthesis.attempts += 1
+        if result["success"]:
+            synthesis.audio = base64.b64decode(result["audio_data"])
+            synthesis.error = None
+            return synthesis
+        synthesis.error = str(result["error"])
+        logger.warning(
+            f"TTS of line {index} failed (attempt {synthesis.attempts}): "
+            f"{synthesis.error}"
+        )
+    return synthesis
+
+
+async def synthesize_lines(
+    tts_client: VolcengineTTS,
+    lines: list[ScriptLine],
+    concurrency: int = 4,
+    retries: int = 2,
+    retry_delay: float = 0.5,
+) -> list[LineSynthesis]:
+    """
+    Synthesize the lines of a script concurrently.
+
+    Args:
+        tts_client: The TTS client
+        lines: Lines of the script
+        concurrency: Maximum number of requests in flight
+        retries: Retries of every failed line
+        retry_delay: Delay before the first retry, doubled for each next one
+
+    Returns:
+        The synthesis of every line, in the order of the script
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return list(
+        await asyncio.gather(
+            *(
+                synthesize_line(
+                    tts_client, index, line, semaphore, retries, retry_delay
+                )
+                for index, line in enumerate(lines)
+            )
+        )
+    )
+
+
+def tts_options() -> dict:
+    """Concurrency and retries of the synthesis, from the environment."""
+    return {
+        "concurrency": int(os.getenv("PODCAST_TTS_CONCURRENCY") or 4),
+        "retries": int(os.getenv("PODCAST_TTS_RETRIES") or 2),
+    }
+
+
+async def tts_node(state: PodcastState):
     logger.info("Generating audio chunks for podcast...")
-    tts_client = _create_tts_client()
-    for line in state["script"].lines:
-        tts_client.voice_type = (
-            "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
+    tts_client = create_tts_client()
+    lines = state["script"].lines
+    started = time.perf_counter()
+    syntheses = await synthesize_lines(tts_client, lines, **tts_options())
+    report = [synthesis.report() for synthesis in syntheses]
+    latencies = [line["seconds"] for line in report]
+    if latencies:
+        logger.info(
+            f"Synthesized {len(lines)} lines in {time.perf_counter() - started:.2f}s, "
+            f"per line median {statistics.median(latencies):.2f}s, "
+            f"max {max(latencies):.2f}s"
+        )
+    failed = [synthesis for synthesis in syntheses if synthesis.audio is None]
+    if failed:
+        raise TTSError(
+            f"Failed to synthesize {len(failed)} of {len(lines)} lines: "
+            + "; ".join(f"line {s.index}: {s.error}" for s in failed)
         )
-        result = tts_client.text_to_speech(line.paragraph, speed_ratio=1.05)
-        if result["success"]:
-            audio_data = result["audio_data"]
-            audio_chunk = base64.b64decode(audio_data)
-            state["audio_chunks"].append(audio_chunk)
-        else:
-            logger.error(result["error"])
     return {
-        "audio_chunks": state["audio_chunks"],
+        "audio_chunks": [synthesis.audio for synthesis in syntheses],
+        "tts_report": report,
     }
 
 
-def _create_tts_client():
+def create_tts_client() -> VolcengineTTS:
     app_id = os.getenv("VOLCENGINE_TTS_APPID", "")
     if not app_id:
         raise Exception("VOLCENGINE_TTS_APPID is not set")
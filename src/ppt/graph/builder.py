@@ -29,3 +29,5 @@ if __name__ == "__main__":
 
     report_content = open("examples/nanjing_tangbao.md").read()
     final_state = workflow.invoke({"input": report_content})
+    with open("final.pptx", "wb") as f:
+        f.write(final_state["output"])
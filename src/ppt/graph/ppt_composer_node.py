@@ -2,10 +2,8 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-import os
-import uuid
 
-from langchain.schema import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
 from src.llms.llm import get_llm_by_type
@@ -26,8 +24,4 @@ def ppt_composer_node(state: PPTState):
         ],
     )
     logger.info(f"ppt_content: {ppt_content}")
-    # save the ppt content in a temp file
-    temp_ppt_file_path = os.path.join(os.getcwd(), f"ppt_content_{uuid.uuid4()}.md")
-    with open(temp_ppt_file_path, "w") as f:
-        f.write(ppt_content.content)
-    return {"ppt_content": ppt_content, "ppt_file_path": temp_ppt_file_path}
+    return {"ppt_content": ppt_content.content}
@@ -2,11 +2,9 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-import os
-import subprocess
-import uuid
 
 from src.ppt.graph.state import PPTState
+from src.ppt.renderer import get_marp_renderer
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +13,6 @@ def ppt_generator_node(state: PPTState):
     logger.info("Generating ppt file...")
     # use marp cli to generate ppt file
     # https://github.com/marp-team/marp-cli?tab=readme-ov-file
-    generated_file_path = os.path.join(
-        os.getcwd(), f"generated_ppt_{uuid.uuid4()}.pptx"
-    )
-    subprocess.run(["marp", state["ppt_file_path"], "-o", generated_file_path])
-    # remove the temp file
-    os.remove(state["ppt_file_path"])
-    logger.info(f"generated_file_path: {generated_file_path}")
-    return {"generated_file_path": generated_file_path}
+    output = get_marp_renderer().render(state["ppt_content"])
+    logger.info(f"Generated a ppt file of {len(output)} bytes")
+    return {"output": output}
@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Rendering of Marp markdown to PowerPoint.
+
+Starting the Marp CLI costs a Node startup for every deck. Instead, a small
+pool of long-lived `marp --server` processes is kept warm, each serving its
+own directory of the renderer's temporary directory; a deck is rendered by
+writing its markdown there and requesting it with `?pptx`. Rendered decks
+are cached on disk by the hash of their markdown.
+
+- `PPT_MARP_COMMAND`: command running the Marp CLI, e.g.
+  `npx @marp-team/marp-cli`
+- `PPT_RENDER_WORKERS`: warm Marp servers (0 runs the CLI for every deck)
+- `PPT_RENDER_TIMEOUT_SECONDS`: deadline of a rendering
+- `PPT_RENDER_CACHE_DIR` / `PPT_RENDER_CACHE_MAX_ENTRIES`: cache of
+  rendered decks (0 entries disables it)
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import shlex
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import httpx
+
+from src.utils.http_client import http_request
+
+logger = logging.getLogger(__name__)
+
+
+class RenderError(Exception):
+    """Raised when a deck could not be rendered."""
+
+
+class _ServerGone(RenderError):
+    """Raised when a Marp server stopped answering."""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class MarpServer:
+    """
+    A `marp --server` process converting the markdown files of its directory.
+
+    Args:
+        command: Command running the Marp CLI
+        directory: Directory served by the process
+    """
+
+    def __init__(self, command: Sequence[str], directory: Path):
+        self.command = list(command)
+        self.directory = directory
+        self.port = _free_port()
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            self._process = subprocess.Popen(
+                [*self.command, "--server", str(self.directory)],
+                env={**os.environ, "PORT": str(self.port)},
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise _ServerGone(f"Failed to start {self.command[0]}: {e}") from e
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.alive:
+                raise _ServerGone(
+                    f"Marp server exited with code {self._process.returncode}"
+                )
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    logger.info(f"Started a Marp server on port {self.port}")
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise _ServerGone(f"Marp server did not start within {timeout}s")
+
+    def render(self, markdown: str, timeout: float) -> bytes:
+        path = self.directory / f"{uuid.uuid4().hex}.md"
+        path.write_text(markdown, encoding="utf-8")
+        try:
+            response = http_request(
+                "GET", f"{self.url}/{path.name}?pptx", timeout=timeout, retries=0
+            )
+        except httpx.HTTPError as e:
+            raise _ServerGone(f"Marp server request failed: {e!r}") from e
+        finally:
+            path.unlink(missing_ok=True)
+        if response.status_code != 200 or not response.content:
+            raise RenderError(f"Marp server answered {response.status_code}")
+        return response.content
+
+    def stop(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class MarpRenderer:
+    """
+    Renders Marp markdown to pptx with warm Marp servers and a result cache.
+
+    Args:
+        command: Command running the Marp CLI
+        workers: Number of warm Marp servers, 0 to run the CLI for every deck
+        timeout_seconds: Deadline of a rendering
+        cache_dir: Directory of the cache of rendered decks
+        cache_max_entries: Decks kept in the cache, 0 disables it
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] = ("marp",),
+        workers: int = 2,
+        timeout_seconds: float = 120,
+        cache_dir: Union[str, Path] = ".cache/ppt",
+        cache_max_entries: int = 64,
+    ):
+        self.command = list(command)
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.cache_dir = Path(cache_dir)
+        self.cache_max_entries = cache_max_entries
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="marp-"))
+        # Servers are started on first use; None marks a free slot
+        self._servers: queue.Queue[Optional[MarpServer]] = queue.Queue()
+        for _ in range(workers):
+            self._servers.put(None)
+        self._cache_lock = threading.Lock()
+
+    def render(self, markdown: str) -> bytes:
+        """
+        Render a Marp markdown deck to pptx.
+
+        Args:
+            markdown: The Marp markdown of the deck
+
+        Returns:
+            The pptx file; raises RenderError when the rendering failed
+        """
+        key = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.info(f"Rendered deck {key[:12]} found in the cache")
+            return cached
+        started = time.perf_counter()
+        if self.workers > 0:
+            pptx = self._render_with_server(markdown)
+        else:
+            pptx = self._render_once(markdown)
+        logger.info(f"Rendered deck {key[:12]} in {time.perf_counter() - started:.2f}s")
+        self._cache_put(key, pptx)
+        return pptx
+
+    def _render_with_server(self, markdown: str) -> bytes:
+        try:
+            server = self._servers.get(timeout=self.timeout_seconds)
+        except queue.Empty:
+            raise RenderError(f"No Marp server free within {self.timeout_seconds}s")
+        try:
+            if server is None or not server.alive:
+                if server is not None:
+                    logger.warning(f"Restarting the Marp server on port {server.port}")
+                    server.stop()
+                server = MarpServer(self.command, self.temp_dir / uuid.uuid4().hex)
+                server.start(self.timeout_seconds)
+            return server.render(markdown, self.timeout_seconds)
+        except _ServerGone:
+            server.stop()
+            server = None
+            raise
+        finally:
+            self._servers.put(server)
+
+    def _render_once(self, markdown: str) -> bytes:
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as directory:
+            source = Path(directory) / "slides.md"
+            output = Path(directory) / "slides.pptx"
+            source.write_text(markdown, encoding="utf-8")
+            try:
+                subprocess.run(
+                    [*self.command, str(source), "-o", str(output)],
+                    check=True,
+                    capture_output=True,
+                    timeout=self.timeout_seconds,
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                raise RenderError(f"Marp failed: {e}") from e
+            if not output.exists():
+                raise RenderError("Marp wrote no output")
+            return output.read_bytes()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pptx"
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        if self.cache_max_entries <= 0:
+            return None
+        path = self._cache_path(key)
+        try:
+            pptx = path.read_bytes()
+            # Recently used decks are evicted last; unlike `touch`, this does
+            # not create the file again when it was just evicted
+            os.utime(path)
+        except OSError:
+            return None
+        # An empty file is not a deck
+        return pptx or None
+
+    def _cache_put(self, key: str, pptx: bytes) -> None:
+        if self.cache_max_entries <= 0:
+            return
+        with self._cache_lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_path(key)
+            temp = path.with_suffix(".tmp")
+            temp.write_bytes(pptx)
+            os.replace(temp, path)
+            entries = sorted(
+                self.cache_dir.glob("*.pptx"), key=lambda p: p.stat().st_mtime
+            )
+            for stale in entries[: max(0, len(entries) - self.cache_max_entries)]:
+                stale.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Stop the Marp servers and remove the temporary directory."""
+        while True:
+            try:
+                server = self._servers.get_nowait()
+            except queue.Empty:
+                break
+            if server is not None:
+                server.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+_marp_renderer: Optional[MarpRenderer] = None
+_marp_renderer_lock = threading.Lock()
+
+
+def get_marp_renderer() -> MarpRenderer:
+    """Return the process-wide Marp renderer."""
+    global _marp_renderer
+    with _marp_renderer_lock:
+        if _marp_renderer is None:
+            _marp_renderer = MarpRenderer(
+                command=shlex.split(os.getenv("PPT_MARP_COMMAND") or "marp"),
+                workers=int(os.getenv("PPT_RENDER_WORKERS") or 2),
+                timeout_seconds=float(os.getenv("PPT_RENDER_TIMEOUT_SECONDS") or 120),
+                cache_dir=os.getenv("PPT_RENDER_CACHE_DIR") or ".cache/ppt",
+                cache_max_entries=int(os.getenv("PPT_RENDER_CACHE_MAX_ENTRIES") or 64),
+            )
+        return _marp_renderer
+
+
+def close_marp_renderer() -> None:
+    """Stop the Marp servers of the process-wide renderer."""
+    global _marp_renderer
+    with _marp_renderer_lock:
+        renderer, _marp_renderer = _marp_renderer, None
+    if renderer is not None:
+        renderer.close()
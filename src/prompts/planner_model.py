@@ -4,7 +4,7 @@
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class StepType(str, Enum):
@@ -19,6 +19,12 @@ class Step(BaseModel):
     title: str
     description: str = Field(..., description="Specify exactly what data to collect")
     step_type: StepType = Field(..., description="Indicates the nature of the step")
+    id: Optional[int] = Field(
+        default=None, description="Unique step id, defaults to the step position"
+    )
+    depends_on: Optional[List[int]] = Field(
+        default=None, description="Ids of the steps whose findings this step needs"
+    )
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
@@ -36,6 +42,92 @@ class Plan(BaseModel):
         description="Research & Processing steps to get more context",
     )
 
+    @model_validator(mode="after")
+    def validate_step_dependencies(self) -> "Plan":
+        """Assign missing step ids and check the dependencies form a DAG."""
+        for position, step in enumerate(self.steps, start=1):
+            if step.id is None:
+                step.id = position
+        ids = [step.id for step in self.steps]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Step ids must be unique, got {ids}")
+        for step in self.steps:
+            for dependency in step.depends_on or []:
+                if dependency == step.id or dependency not in ids:
+                    raise ValueError(
+                        f"Step {step.id} has an invalid dependency: {dependency}"
+                    )
+
+        # Kahn's algorithm: every step must eventually become ready
+        remaining = {step.id: set(self._dependency_ids(step)) for step in self.steps}
+        while remaining:
+            ready = [step_id for step_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"Step dependencies contain a cycle: {sorted(remaining)}"
+                )
+            for step_id in ready:
+                del remaining[step_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return self
+
+    def _dependency_ids(self, step: Step) -> List[int]:
+        """
+        Return the ids of the steps that must finish before `step` can run.
+
+        Declared `depends_on` ids are used as is. For plans that do not declare
+        dependencies, a processing step works on everything collected before
+        it, and a research step only waits for earlier processing steps.
+        """
+        if step.depends_on is not None:
+            return list(step.depends_on)
+        position = next(i for i, s in enumerate(self.steps) if s is step)
+        return [
+            earlier.id
+            for earlier in self.steps[:position]
+            if step.step_type == StepType.PROCESSING
+            or earlier.step_type == StepType.PROCESSING
+        ]
+
+    def context_steps(self, step: Step) -> List[Step]:
+        """
+        Return the executed steps whose findings should be given to `step`.
+
+        Only the declared dependencies are returned when `depends_on` is set,
+        otherwise every executed step is shared as before.
+        """
+        if step.depends_on is not None:
+            return [
+                s for s in self.steps if s.id in step.depends_on and s.execution_res
+            ]
+        return [s for s in self.steps if s.execution_res]
+
+    def next_step_batch(self, max_parallel_steps: int = 1) -> List[int]:
+        """
+        Return the indices of the pending steps that should be executed next.
+
+        Steps are scheduled in topological waves: a step is ready once all the
+        steps it depends on have been executed, and up to `max_parallel_steps`
+        ready steps are returned in plan order to be fanned out together.
+
+        Args:
+            max_parallel_steps: Maximum number of steps to run concurrently
+
+        Returns:
+            Indices of the steps to execute, in plan order (empty if all done)
+        """
+        executed = {step.id for step in self.steps if step.execution_res}
+        batch: List[int] = []
+        for index, step in enumerate(self.steps):
+            if len(batch) >= max_parallel_steps:
+                break
+            if step.execution_res:
+                continue
+            if executed.issuperset(self._dependency_ids(step)):
+                batch.append(index)
+        return batch
+
     class Config:
         json_schema_extra = {
             "examples": [
@@ -53,6 +145,8 @@ class Plan(BaseModel):
                                 "Collect data on market size, growth rates, major players, and investment trends in AI sector."
                             ),
                             "step_type": "research",
+                            "id": 1,
+                            "depends_on": [],
                         }
                     ],
                 }
@@ -4,12 +4,14 @@
 import os
 import dataclasses
 from datetime import datetime
+from typing import TYPE_CHECKING
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from langgraph.prebuilt.chat_agent_executor import AgentState
 from src.config.configuration import Configuration
-from src.utils.mcp_tools import get_installed_mcp_tools, build_mcp_tools_section, recommend_tools_for_step
 import logging
 
+if TYPE_CHECKING:
+    from langgraph.prebuilt.chat_agent_executor import AgentState
+
 # Initialize Jinja2 environment
 env = Environment(
     loader=FileSystemLoader(os.path.dirname(__file__)),
@@ -40,7 +42,7 @@ def get_prompt_template(prompt_name: str) -> str:
 
 
 def apply_prompt_template(
-    prompt_name: str, state: AgentState, configurable: Configuration = None
+    prompt_name: str, state: "AgentState", configurable: Configuration = None
 ) -> list:
     """
     Apply template variables to a prompt template and return formatted messages.
@@ -64,6 +66,8 @@ def apply_prompt_template(
 
     # 动态插入MCP工具说明
     if prompt_name == "planner":
+        # Imported here, the MCP client libraries are slow to import
+        from src.utils.mcp_tools import build_mcp_tools_section
         # mcp_tools = get_installed_mcp_tools() # 旧的调用方式
         
         # === 新逻辑：从 configurable.mcp_settings 构建工具列表 ===
@@ -1,23 +1,27 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import List, cast
 from uuid import uuid4
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, ToolMessage, BaseMessage
 from langgraph.types import Command
 
-from src.graph.builder import build_graph_with_memory
-from src.podcast.graph.builder import build_graph as build_podcast_graph
-from src.ppt.graph.builder import build_graph as build_ppt_graph
-from src.prose.graph.builder import build_graph as build_prose_graph
+from src.crawler.cache import get_crawl_cache
+from src.crawler.extraction import get_extraction_service
+from src.podcast.audio_stream import stream_podcast_audio
+from src.podcast.graph.tts_node import create_tts_client, tts_options
+from src.ppt.renderer import close_marp_renderer
 from src.server.chat_request import (
     ChatMessage,
     ChatRequest,
@@ -29,6 +33,13 @@ from src.server.chat_request import (
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
 from src.server.mcp_utils import load_mcp_tools
 from src.tools import VolcengineTTS
+from src.tools.search_cache import get_search_cache
+from src.utils.checkpoint import open_checkpointer
+from src.utils.graph_registry import get_graph_registry
+from src.utils.http_client import close_http_clients, get_async_http_client
+from src.utils.jobs import JobArtifact, QueueFull, get_job_queue
+from src.utils.mcp_catalog import MCPToolCatalog
+from src.utils.mcp_pool import get_mcp_client_pool
 
 
 # 自定义日志过滤器，屏蔽特定的 404 请求
@@ -47,10 +58,42 @@ logging.getLogger("uvicorn.access").addFilter(IgnoreBackuperFilter())
 
 logger = logging.getLogger(__name__)
 
+
+async def _compile_graphs() -> None:
+    try:
+        compile_seconds = await asyncio.to_thread(get_graph_registry().compile_all)
+        logger.info(f"Graphs compiled at startup (seconds): {compile_seconds}")
+    except Exception:
+        logger.exception("Failed to compile the graphs at startup")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the connection pool shared by search, crawl and TTS requests
+    get_async_http_client()
+    # Start the article extraction workers before the first crawl
+    await asyncio.to_thread(get_extraction_service().start)
+    # Keep the chat threads in the checkpointer selected by CHECKPOINT_BACKEND
+    async with open_checkpointer() as checkpointer:
+        get_graph_registry().use_checkpointer(checkpointer)
+        # Compile every workflow once in the background, so the server answers
+        # right away; requests share the compiled graphs
+        compiling = asyncio.create_task(_compile_graphs())
+        yield
+        await asyncio.wait([compiling])
+    # Shut down the MCP servers kept warm across requests
+    await get_mcp_client_pool().close()
+    await get_job_queue().close()
+    close_marp_renderer()
+    await close_http_clients()
+    get_extraction_service().shutdown()
+
+
 app = FastAPI(
     title="ResearcherNexus API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -62,9 +105,6 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-graph = build_graph_with_memory()
-
-
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     thread_id = request.thread_id
@@ -112,7 +152,8 @@ async def _astream_workflow_generator(
         if messages:
             resume_msg += f" {messages[-1]['content']}"
         input_ = Command(resume=resume_msg)
-    async for agent, _, event_data in graph.astream(
+    graph = await get_graph_registry().aget("main")
+    async for agent, mode, event_data in graph.astream(
         input_,
         config={
             "thread_id": thread_id,
@@ -121,9 +162,23 @@ async def _astream_workflow_generator(
             "max_search_results": max_search_results,
             "mcp_settings": mcp_settings,
         },
-        stream_mode=["messages", "updates"],
+        stream_mode=["messages", "updates", "custom"],
         subgraphs=True,
     ):
+        if mode == "custom":
+            if event_data.get("type") == "partial_plan":
+                # Plan fields parsed so far from the planner output
+                yield _make_event(
+                    "partial_plan",
+                    {
+                        "thread_id": thread_id,
+                        "agent": "planner",
+                        "id": event_data["id"],
+                        "role": "assistant",
+                        "plan": event_data["plan"],
+                    },
+                )
+            continue
         if isinstance(event_data, dict):
             if "__interrupt__" in event_data:
                 yield _make_event(
@@ -246,8 +301,8 @@ async def generate_podcast(request: GeneratePodcastRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_podcast_graph()
-        final_state = workflow.invoke({"input": report_content})
+        workflow = await get_graph_registry().aget("podcast")
+        final_state = await workflow.ainvoke({"input": report_content})
         audio_bytes = final_state["output"]
         return Response(content=audio_bytes, media_type="audio/mp3")
     except Exception as e:
@@ -255,18 +310,43 @@ async def generate_podcast(request: GeneratePodcastRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/podcast/stream")
+async def stream_podcast(request: GeneratePodcastRequest):
+    """Stream the podcast audio, line by line as soon as it is synthesized."""
+    # Imported on first use, the prompts and LLM clients are slow to import
+    from src.podcast.graph.script_writer_node import script_writer_node
+
+    try:
+        tts_client = create_tts_client()
+        state = await asyncio.to_thread(script_writer_node, {"input": request.content})
+    except Exception as e:
+        logger.exception(f"Error occurred during podcast generation: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        stream_podcast_audio(
+            tts_client,
+            state["script"].lines,
+            spool_max_bytes=int(
+                float(os.getenv("PODCAST_SPOOL_MAX_MB") or 16) * 1024 * 1024
+            ),
+            **tts_options(),
+        ),
+        media_type="audio/mp3",
+    )
+
+
 @app.post("/api/ppt/generate")
 async def generate_ppt(request: GeneratePPTRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_ppt_graph()
-        final_state = workflow.invoke({"input": report_content})
-        generated_file_path = final_state["generated_file_path"]
-        with open(generated_file_path, "rb") as f:
-            ppt_bytes = f.read()
+        workflow = await get_graph_registry().aget("ppt")
+        # The LLM call and marp block, keep them off the event loop
+        final_state = await asyncio.to_thread(
+            workflow.invoke, {"input": report_content}
+        )
         return Response(
-            content=ppt_bytes,
+            content=final_state["output"],
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
         )
     except Exception as e:
@@ -274,11 +354,104 @@ async def generate_ppt(request: GeneratePPTRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _submit_job(kind: str, function) -> dict:
+    try:
+        job = get_job_queue().submit(kind, function)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.snapshot()
+
+
+@app.post("/api/jobs/podcast", status_code=202)
+async def submit_podcast_job(request: GeneratePodcastRequest):
+    """Generate a podcast in the background, see /api/jobs/{job_id}."""
+
+    async def generate(directory: Path) -> JobArtifact:
+        workflow = await get_graph_registry().aget("podcast")
+        final_state = await workflow.ainvoke({"input": request.content})
+        path = directory / "podcast.mp3"
+        await asyncio.to_thread(path.write_bytes, final_state["output"])
+        return JobArtifact(path, "audio/mp3", "podcast.mp3")
+
+    return _submit_job("podcast", generate)
+
+
+@app.post("/api/jobs/ppt", status_code=202)
+async def submit_ppt_job(request: GeneratePPTRequest):
+    """Generate slides in the background, see /api/jobs/{job_id}."""
+
+    def generate(directory: Path) -> JobArtifact:
+        workflow = get_graph_registry().get("ppt")
+        final_state = workflow.invoke({"input": request.content})
+        path = directory / "slides.pptx"
+        path.write_bytes(final_state["output"])
+        return JobArtifact(
+            path,
+            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            "slides.pptx",
+        )
+
+    return _submit_job("ppt", generate)
+
+
+@app.get("/api/jobs")
+async def job_queue_stats():
+    """Workers, queue depth and number of jobs by status."""
+    return get_job_queue().stats()
+
+
+def _get_job(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a background job."""
+    return _get_job(job_id).snapshot()
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job(job_id: str):
+    """Stream the status of a background job as server-sent events until it finishes."""
+    _get_job(job_id)
+
+    async def events():
+        async for snapshot in get_job_queue().watch(job_id):
+            yield _make_event("job_status", snapshot)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/api/jobs/{job_id}/artifact")
+async def get_job_artifact(job_id: str):
+    """Download the artifact of a job that succeeded."""
+    job = _get_job(job_id)
+    if job.artifact is None:
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} is {job.status.value}"
+        )
+    return FileResponse(
+        job.artifact.path,
+        media_type=job.artifact.media_type,
+        filename=job.artifact.filename,
+    )
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a background job."""
+    _get_job(job_id)
+    return get_job_queue().cancel(job_id).snapshot()
+
+
 @app.post("/api/prose/generate")
 async def generate_prose(request: GenerateProseRequest):
     try:
         logger.info(f"Generating prose for prompt: {request.prompt}")
-        workflow = build_prose_graph()
+        workflow = await get_graph_registry().aget("prose")
         events = workflow.astream(
             {
                 "content": request.prompt,
@@ -297,6 +470,24 @@ async def generate_prose(request: GenerateProseRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _load_mcp_catalog(connection: dict, timeout_seconds: int) -> list:
+    return await load_mcp_tools(
+        server_type=connection["transport"],
+        command=connection.get("command"),
+        args=connection.get("args"),
+        url=connection.get("url"),
+        env=connection.get("env"),
+        timeout_seconds=timeout_seconds,
+    )
+
+
+mcp_tool_catalog = MCPToolCatalog(
+    loader=_load_mcp_catalog,
+    ttl_seconds=float(os.getenv("MCP_CATALOG_TTL_SECONDS", "3600")),
+    cache_path=os.getenv("MCP_CATALOG_CACHE_FILE") or None,
+)
+
+
 @app.post("/api/mcp/server/metadata", response_model=MCPServerMetadataResponse)
 async def mcp_server_metadata(request: MCPServerMetadataRequest):
     """Get information about an MCP server."""
@@ -312,14 +503,11 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
 
         logger.info(f"Loading MCP tools with timeout: {timeout}")
         
-        # Load tools from the MCP server using the utility function
-        tools = await load_mcp_tools(
-            server_type=request.transport,
-            command=request.command,
-            args=request.args,
-            url=request.url,
-            env=request.env,
+        # Load tools from the MCP server, reusing the cached catalog if possible
+        tools = await mcp_tool_catalog.get_tools(
+            request.model_dump(include={"transport", "command", "args", "url", "env"}),
             timeout_seconds=timeout,
+            refresh=request.refresh,
         )
 
         logger.info(f"Loaded {len(tools)} tools from MCP server")
@@ -343,6 +531,83 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         raise
 
 
+@app.delete("/api/mcp/server/metadata/cache")
+async def clear_mcp_server_metadata_cache():
+    """Drop every cached MCP tool catalog."""
+    mcp_tool_catalog.invalidate()
+    return {"status": "ok"}
+
+
+@app.get("/api/crawl/cache")
+async def crawl_cache_stats():
+    """Hit/miss counters and size of the crawl cache."""
+    cache = get_crawl_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.get("/api/graphs")
+async def graph_compile_metrics():
+    """Seconds taken to import and compile every workflow graph."""
+    return {"compile_seconds": get_graph_registry().metrics()}
+
+
+@app.get("/api/crawl/extraction")
+async def crawl_extraction_stats():
+    """Counters and time distribution of article extractions."""
+    return get_extraction_service().stats.snapshot()
+
+
+@app.delete("/api/crawl/cache")
+async def clear_crawl_cache():
+    """Drop every cached crawl result."""
+    cache = get_crawl_cache()
+    if cache is not None:
+        cache.invalidate()
+    return {"status": "ok"}
+
+
+@app.get("/api/local-index")
+async def local_index_stats():
+    """Number of pages and passages in the local index."""
+    from src.tools.local_index import get_local_index
+
+    index = get_local_index()
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.stats()}
+
+
+@app.delete("/api/local-index")
+async def clear_local_index():
+    """Drop every page of the local index."""
+    from src.tools.local_index import get_local_index
+
+    index = get_local_index()
+    if index is not None:
+        index.clear()
+    return {"status": "ok"}
+
+
+@app.get("/api/search/cache")
+async def search_cache_stats():
+    """Hit/miss counters of the search result cache."""
+    cache = get_search_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.delete("/api/search/cache")
+async def clear_search_cache():
+    """Drop every cached search result."""
+    cache = get_search_cache()
+    if cache is not None:
+        cache.clear()
+    return {"status": "ok"}
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
@@ -7,9 +7,6 @@ from datetime import timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from mcp.client.sse import sse_client
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +27,8 @@ async def _get_tools_from_client_session(
     Raises:
         Exception: If there's an error during the process
     """
+    from mcp import ClientSession
+
     async with client_context_manager as (read, write):
         async with ClientSession(
             read, write, read_timeout_seconds=timedelta(seconds=timeout_seconds)
@@ -67,6 +66,11 @@ async def load_mcp_tools(
     Raises:
         HTTPException: If there's a configuration error (not a runtime error)
     """
+    # The MCP client is imported on first use, it is slow to import
+    from mcp import StdioServerParameters
+    from mcp.client.sse import sse_client
+    from mcp.client.stdio import stdio_client
+
     try:
         if server_type == "stdio":
             if not command:
@@ -1,16 +1,26 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import os
+import importlib
 
-from .crawl import crawl_tool
-from .python_repl import python_repl_tool
-from .search import get_web_search_tool
-from .tts import VolcengineTTS
+# The tools are imported on first use: their search, REPL and index
+# dependencies are slow to import and most importers need only one of them
+_EXPORTS = {
+    "crawl_tool": ".crawl",
+    "crawl_many_tool": ".crawl",
+    "local_retrieve_tool": ".local_index",
+    "python_repl_tool": ".python_repl",
+    "get_web_search_tool": ".search",
+    "VolcengineTTS": ".tts",
+}
 
-__all__ = [
-    "crawl_tool",
-    "python_repl_tool",
-    "get_web_search_tool",
-    "VolcengineTTS",
-]
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_EXPORTS)
@@ -1,28 +1,77 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from typing import Annotated
+import os
+from typing import Annotated, Optional
 
 from langchain_core.tools import tool
 from .decorators import log_io
 
-from src.crawler import Crawler
+from src.crawler import Article, Crawler
+from src.crawler.extraction import get_extraction_service
+from src.tools.local_index import index_page
+from src.utils.text_budget import select_passages
 
 logger = logging.getLogger(__name__)
 
 
+def _crawled_content(markdown: str, query: Optional[str]) -> str:
+    """Cut a crawled page down to its parts most relevant to the query."""
+    max_tokens = int(os.getenv("CRAWL_CONTENT_TOKEN_BUDGET") or 1000)
+    return select_passages(markdown, query or "", max_tokens)
+
+
+def _page_result(url: str, article: Article, query: Optional[str]) -> dict:
+    """Index a crawled page and return its parts most relevant to the query."""
+    # Extracted and cached articles come with their markdown, older cache
+    # entries are converted within the same bound as the extraction workers
+    markdown = article.to_markdown(
+        max_chars=get_extraction_service().max_markdown_chars
+    )
+    index_page(url, article.title, markdown, source="crawl")
+    return {"url": url, "crawled_content": _crawled_content(markdown, query)}
+
+
 @tool
 @log_io
 def crawl_tool(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[
+        Optional[str],
+        "What you are looking for in the page, to keep its relevant parts.",
+    ] = None,
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
     try:
         crawler = Crawler()
         article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        return _page_result(url, article, query)
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+@tool
+@log_io
+async def crawl_many_tool(
+    urls: Annotated[list[str], "The urls to crawl."],
+    query: Annotated[
+        Optional[str],
+        "What you are looking for in the pages, to keep their relevant parts.",
+    ] = None,
+) -> list[dict]:
+    """Use this to crawl several urls at once and get their readable content in markdown format."""
+    max_concurrency_per_host = int(os.getenv("CRAWL_MAX_CONCURRENCY_PER_HOST", "2"))
+    results = []
+    async for url, article in Crawler().acrawl_many(urls, max_concurrency_per_host):
+        if isinstance(article, Exception):
+            error_msg = f"Failed to crawl. Error: {repr(article)}"
+            logger.error(f"{url}: {error_msg}")
+            results.append({"url": url, "error": error_msg})
+        else:
+            # Passage selection and indexing are CPU bound, keep them off the loop
+            results.append(await asyncio.to_thread(_page_result, url, article, query))
+    return results
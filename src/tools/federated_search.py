@@ -0,0 +1,190 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Federated search over several search engines.
+
+The query is sent to every configured engine concurrently. Each engine has
+its own deadline, so a slow engine only loses its results instead of
+stalling the step. Results are de-duplicated by canonical URL and ranked
+with reciprocal rank fusion.
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.crawler.cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Damping constant of reciprocal rank fusion, as in Cormack et al. (2009)
+RRF_K = 60
+
+_executor = ThreadPoolExecutor(thread_name_prefix="federated-search")
+
+
+def canonical_url(url: str) -> str:
+    """Return the URL used to recognize the same page across engines."""
+    parts = urlsplit(normalize_url(url))
+    # http and https, and www and bare host versions of a page are one result
+    host = parts.netloc.removeprefix("www.")
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def to_pages(output: Any) -> tuple[list[dict], list[dict]]:
+    """
+    Convert the output of a search tool to pages and images.
+
+    Args:
+        output: A list of result dicts, or its JSON encoding
+
+    Returns:
+        Pages as {"title", "url", "content"} dicts, and Tavily's image results
+    """
+    if isinstance(output, str):
+        try:
+            output = json.loads(output)
+        except ValueError:
+            return [], []
+    if not isinstance(output, list):
+        return [], []
+    pages, images = [], []
+    for item in output:
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "image":
+            images.append(item)
+            continue
+        url = item.get("url") or item.get("link")
+        if not url:
+            continue
+        page = {
+            "title": item.get("title", ""),
+            "url": url,
+            "content": item.get("content") or item.get("snippet", ""),
+        }
+        if item.get("raw_content"):
+            page["raw_content"] = item["raw_content"]
+        pages.append(page)
+    return pages, images
+
+
+def fuse_results(
+    ranked_results: dict[str, list[dict]], max_results: Optional[int] = None
+) -> list[dict]:
+    """
+    Merge the ranked pages of several engines with reciprocal rank fusion.
+
+    Args:
+        ranked_results: Pages of each engine, best first
+        max_results: Number of fused pages to return (None: all)
+
+    Returns:
+        Pages ordered by fused score, each with the engines that found it
+    """
+    fused: dict[str, dict] = {}
+    for engine, pages in ranked_results.items():
+        seen = set()
+        for rank, page in enumerate(pages, start=1):
+            key = canonical_url(page["url"])
+            if key in seen:
+                continue
+            seen.add(key)
+            if key not in fused:
+                fused[key] = {"type": "page", **page, "score": 0.0, "engines": []}
+            entry = fused[key]
+            entry["score"] += 1 / (RRF_K + rank)
+            entry["engines"].append(engine)
+            # Keep the most informative snippet
+            if len(page.get("content", "")) > len(entry.get("content", "")):
+                entry["content"] = page["content"]
+    ordered = sorted(fused.values(), key=lambda page: page["score"], reverse=True)
+    return ordered[:max_results] if max_results else ordered
+
+
+class FederatedSearchInput(BaseModel):
+    """Input for the federated search tool."""
+
+    query: str = Field(description="search query to look up")
+
+
+class FederatedSearch(BaseTool):
+    """Tool that searches several engines at once and fuses their results."""
+
+    name: str = "web_search"
+    description: str = (
+        "A search engine combining several web and academic search engines. "
+        "Useful for when you need to answer questions about current events. "
+        "Input should be a search query."
+    )
+    args_schema: type[BaseModel] = FederatedSearchInput
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    engines: dict[str, BaseTool]
+    """The search tools to query, by engine name."""
+    max_results: int = 5
+    """Number of fused results returned."""
+    engine_timeout_seconds: float = 10
+    """Deadline of every engine, results arriving later are dropped."""
+
+    def _fuse(self, outputs: dict[str, Any]) -> list[dict]:
+        ranked_results, images = {}, []
+        for engine, output in outputs.items():
+            pages, engine_images = to_pages(output)
+            ranked_results[engine] = pages
+            images.extend(engine_images)
+        logger.info(
+            "Federated search results: "
+            + ", ".join(f"{e}={len(p)}" for e, p in ranked_results.items())
+        )
+        return fuse_results(ranked_results, self.max_results) + images
+
+    def _run(self, query: str, **kwargs: Any) -> list[dict]:
+        """Use the tool."""
+        futures = {
+            _executor.submit(tool.invoke, {"query": query}): engine
+            for engine, tool in self.engines.items()
+        }
+        done, not_done = wait(futures, timeout=self.engine_timeout_seconds)
+        outputs = {}
+        for future in done:
+            if future.exception() is not None:
+                logger.warning(
+                    f"Search engine {futures[future]} failed: {future.exception()!r}"
+                )
+            else:
+                outputs[futures[future]] = future.result()
+        for future in not_done:
+            logger.warning(f"Search engine {futures[future]} missed its deadline")
+        return self._fuse(outputs)
+
+    async def _arun(self, query: str, **kwargs: Any) -> list[dict]:
+        """Use the tool asynchronously."""
+        engines = list(self.engines)
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.engines[engine].ainvoke({"query": query}),
+                    self.engine_timeout_seconds,
+                )
+                for engine in engines
+            ),
+            return_exceptions=True,
+        )
+        outputs = {}
+        for engine, result in zip(engines, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"Search engine {engine} missed its deadline")
+            elif isinstance(result, Exception):
+                logger.warning(f"Search engine {engine} failed: {result!r}")
+            else:
+                outputs[engine] = result
+        return self._fuse(outputs)
@@ -0,0 +1,376 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Local vector index of the pages fetched during research.
+
+Every crawled page and web search result is split into passages, embedded
+and kept in an in-process NumPy index persisted under `LOCAL_INDEX_DIR`, so
+agents can retrieve evidence fetched by earlier steps with the
+`local_retrieve_tool` instead of searching the web again.
+
+Passages are embedded on the CPU with `HashingEmbeddings`, a stand-in model
+hashing words and word pairs into a fixed-size vector; any LangChain
+`Embeddings` can be used instead. The index keeps the latest
+`LOCAL_INDEX_MAX_DOCUMENTS` pages; 0 disables it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Any, ClassVar, Optional, Type, TypeVar
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import BaseTool, tool
+
+from src.crawler.cache import normalize_url
+from src.tools.decorators import log_io
+from src.tools.federated_search import to_pages
+from src.utils.text_budget import split_passages, terms
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DIMENSIONS = 512
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Embeddings hashing words and word pairs into a fixed number of dimensions.
+
+    Needs no model download and runs in well under a millisecond per passage;
+    similar texts share words, so their vectors are close.
+    """
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.dimensions}"
+
+    def _embed(self, text: str) -> list[float]:
+        words = terms(text)
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in features.items():
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign * (1 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+@dataclass
+class Evidence:
+    """A passage retrieved from the local index."""
+
+    url: str
+    title: str
+    content: str
+    score: float
+
+
+@dataclass
+class _Document:
+    url: str
+    title: str
+    source: str
+    digest: str
+    passages: list[str]
+    vectors: np.ndarray
+
+
+class LocalIndex:
+    """
+    Vector index of fetched pages, one persisted file per page.
+
+    Args:
+        directory: Directory the index is persisted to
+        embeddings: The model embedding passages and queries
+        max_documents: Number of pages kept, the oldest are dropped first
+        passage_tokens: Size of the passages pages are split into
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        embeddings: Optional[Embeddings] = None,
+        max_documents: int = 2000,
+        passage_tokens: int = 200,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.embeddings = embeddings or HashingEmbeddings()
+        self.embedding_name = getattr(
+            self.embeddings, "name", type(self.embeddings).__name__
+        )
+        self.max_documents = max_documents
+        self.passage_tokens = passage_tokens
+        self._documents: OrderedDict[str, _Document] = OrderedDict()
+        self._lock = threading.Lock()
+        # Passage vectors of all documents, stacked lazily for search
+        self._matrix: Optional[np.ndarray] = None
+        self._rows: list[tuple[_Document, int]] = []
+        self._load()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.npz"
+
+    def _load(self) -> None:
+        paths = sorted(self.directory.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        for path in paths:
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    meta = json.loads(str(data["meta"]))
+                    vectors = data["vectors"]
+            except Exception as e:
+                logger.warning(f"Skipping unreadable local index file {path}: {e!r}")
+                continue
+            if meta.get("embedding") != self.embedding_name:
+                continue
+            self._documents[normalize_url(meta["url"])] = _Document(
+                url=meta["url"],
+                title=meta["title"],
+                source=meta["source"],
+                digest=meta["digest"],
+                passages=meta["passages"],
+                vectors=vectors,
+            )
+        logger.info(f"Loaded {len(self._documents)} page(s) from the local index")
+
+    def _save(self, key: str, document: _Document) -> None:
+        meta = {
+            "url": document.url,
+            "title": document.title,
+            "source": document.source,
+            "digest": document.digest,
+            "passages": document.passages,
+            "embedding": self.embedding_name,
+        }
+        path = self._path(key)
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            np.savez(file, vectors=document.vectors, meta=np.array(json.dumps(meta)))
+        os.replace(temporary, path)
+
+    def add(self, url: str, title: str, text: str, source: str = "search") -> int:
+        """
+        Index the content of a page, replacing what was indexed for it before.
+
+        Args:
+            url: URL of the page
+            title: Title of the page
+            text: Content of the page
+            source: "crawl" for full pages, "search" for search results;
+                search results never replace a crawled page
+
+        Returns:
+            The number of passages indexed
+        """
+        key = normalize_url(url)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            existing = self._documents.get(key)
+            if existing is not None and (
+                existing.digest == digest
+                or (existing.source == "crawl" and source != "crawl")
+            ):
+                return 0
+        passages = split_passages(text, self.passage_tokens)
+        if not passages:
+            return 0
+        vectors = np.asarray(
+            self.embeddings.embed_documents(passages), dtype=np.float32
+        )
+        document = _Document(url, title, source, digest, passages, vectors)
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            self._save(key, document)
+            while len(self._documents) > self.max_documents:
+                evicted, _ = self._documents.popitem(last=False)
+                self._path(evicted).unlink(missing_ok=True)
+            self._matrix = None
+        return len(passages)
+
+    def search(self, query: str, k: int = 5) -> list[Evidence]:
+        """
+        Return the indexed passages most similar to a query.
+
+        Args:
+            query: The query text
+            k: Maximum number of passages returned
+
+        Returns:
+            Passages with their cosine similarity, best first
+        """
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        with self._lock:
+            if self._matrix is None:
+                self._rows = [
+                    (document, position)
+                    for document in self._documents.values()
+                    for position in range(len(document.passages))
+                ]
+                self._matrix = (
+                    np.vstack([d.vectors for d in self._documents.values()])
+                    if self._documents
+                    else np.zeros((0, len(query_vector)), dtype=np.float32)
+                )
+            matrix, rows = self._matrix, self._rows
+        if not rows:
+            return []
+        scores = matrix @ query_vector
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [
+            Evidence(
+                url=rows[i][0].url,
+                title=rows[i][0].title,
+                content=rows[i][0].passages[rows[i][1]],
+                score=float(scores[i]),
+            )
+            for i in best
+            if scores[i] > 0
+        ]
+
+    def clear(self) -> None:
+        """Drop every indexed page."""
+        with self._lock:
+            for key in self._documents:
+                self._path(key).unlink(missing_ok=True)
+            self._documents.clear()
+            self._matrix = None
+
+    def stats(self) -> dict:
+        """Number of indexed pages and passages."""
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "passages": sum(len(d.passages) for d in self._documents.values()),
+                "max_documents": self.max_documents,
+                "embedding": self.embedding_name,
+            }
+
+
+_local_index: Optional[LocalIndex] = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index() -> Optional[LocalIndex]:
+    """Return the process-wide local index, None if disabled."""
+    global _local_index
+    max_documents = int(os.getenv("LOCAL_INDEX_MAX_DOCUMENTS") or 2000)
+    if max_documents <= 0:
+        return None
+    with _local_index_lock:
+        if _local_index is None:
+            _local_index = LocalIndex(
+                directory=os.getenv("LOCAL_INDEX_DIR") or ".cache/local_index",
+                max_documents=max_documents,
+            )
+        return _local_index
+
+
+def index_page(url: str, title: str, text: str, source: str = "search") -> None:
+    """Add a page to the local index; failures are logged and ignored."""
+    try:
+        index = get_local_index()
+        if index is not None:
+            index.add(url, title, text, source)
+    except Exception as e:
+        logger.warning(f"Failed to index {url} locally: {e!r}")
+
+
+def index_search_results(output: Any) -> None:
+    """Add the pages of a search tool output to the local index."""
+    pages, _ = to_pages(output)
+    for page in pages:
+        text = page.get("raw_content") or page["content"]
+        index_page(page["url"], page["title"], f"# {page['title']}\n\n{text}")
+
+
+class IndexedToolMixin:
+    """A mixin class that adds the results of a search tool to the local index."""
+
+    # Whether the tool has its own async implementation
+    index_async: ClassVar[bool] = False
+
+    def _index(self, result: Any) -> None:
+        if self.response_format == "content_and_artifact":
+            result = result[0]
+        index_search_results(result)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _run method to index the search results."""
+        result = super()._run(*args, **kwargs)
+        self._index(result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _arun method to index the search results."""
+        result = await super()._arun(*args, **kwargs)
+        # Without a native async implementation the base ran `_run`, which
+        # already indexed the results
+        if self.index_async:
+            await asyncio.to_thread(self._index, result)
+        return result
+
+
+def create_indexed_tool(base_tool_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class whose results
+    are added to the local index.
+
+    Args:
+        base_tool_class: The search tool class to be enhanced with indexing
+
+    Returns:
+        A new class that inherits from both IndexedToolMixin and the base tool class
+    """
+
+    class IndexedTool(IndexedToolMixin, base_tool_class):
+        index_async: ClassVar[bool] = base_tool_class._arun is not BaseTool._arun
+
+    IndexedTool.__name__ = base_tool_class.__name__
+    return IndexedTool
+
+
+@tool
+@log_io
+def local_retrieve_tool(
+    query: Annotated[str, "What to look for in the pages fetched so far."],
+    max_results: Annotated[int, "Maximum number of passages to return."] = 5,
+) -> list[dict] | str:
+    """Use this to retrieve passages of pages already fetched by earlier searches and crawls, before searching the web again."""
+    index = get_local_index()
+    if index is None:
+        return "The local index is disabled."
+    return [
+        {
+            "title": evidence.title,
+            "url": evidence.url,
+            "content": evidence.content,
+            "score": round(evidence.score, 3),
+        }
+        for evidence in index.search(query, max_results)
+    ]
@@ -8,26 +8,46 @@ import os
 from langchain_community.tools import BraveSearch, DuckDuckGoSearchResults
 from langchain_community.tools.arxiv import ArxivQueryRun
 from langchain_community.utilities import ArxivAPIWrapper, BraveSearchWrapper
+from langchain_core.tools import StructuredTool
 
-from src.config import SearchEngine, SELECTED_SEARCH_ENGINE
+from src.config import (
+    FEDERATED_SEARCH_ENGINES,
+    SEARCH_ENGINE_TIMEOUT_SECONDS,
+    SELECTED_SEARCH_ENGINE,
+    SearchEngine,
+)
 from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchResultsWithImages,
 )
 
 from src.tools.decorators import create_logged_tool
+from src.tools.federated_search import FederatedSearch
+from src.tools.local_index import create_indexed_tool
+from src.tools.search_cache import create_cached_tool
 
 logger = logging.getLogger(__name__)
 
-# Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
+# Create logged versions of the search tools, answering repeated queries from
+# the search cache and adding their results to the local index
+LoggedTavilySearch = create_cached_tool(
+    create_indexed_tool(create_logged_tool(TavilySearchResultsWithImages)),
+    SearchEngine.TAVILY.value,
+)
+LoggedDuckDuckGoSearch = create_cached_tool(
+    create_indexed_tool(create_logged_tool(DuckDuckGoSearchResults)),
+    SearchEngine.DUCKDUCKGO.value,
+)
+LoggedBraveSearch = create_cached_tool(
+    create_indexed_tool(create_logged_tool(BraveSearch)),
+    SearchEngine.BRAVE_SEARCH.value,
+)
+LoggedArxivSearch = create_cached_tool(
+    create_indexed_tool(create_logged_tool(ArxivQueryRun)), SearchEngine.ARXIV.value
+)
 
 
-# Get the selected search tool
-def get_web_search_tool(max_search_results: int):
-    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
+def _create_search_tool(engine: str, max_search_results: int, **kwargs):
+    if engine == SearchEngine.TAVILY.value:
         return LoggedTavilySearch(
             name="web_search",
             max_results=max_search_results,
@@ -35,9 +55,11 @@ def get_web_search_tool(max_search_results: int):
             include_images=True,
             include_image_descriptions=True,
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.DUCKDUCKGO.value:
-        return LoggedDuckDuckGoSearch(name="web_search", max_results=max_search_results)
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.BRAVE_SEARCH.value:
+    elif engine == SearchEngine.DUCKDUCKGO.value:
+        return LoggedDuckDuckGoSearch(
+            name="web_search", max_results=max_search_results, **kwargs
+        )
+    elif engine == SearchEngine.BRAVE_SEARCH.value:
         return LoggedBraveSearch(
             name="web_search",
             search_wrapper=BraveSearchWrapper(
@@ -45,7 +67,7 @@ def get_web_search_tool(max_search_results: int):
                 search_kwargs={"count": max_search_results},
             ),
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.ARXIV.value:
+    elif engine == SearchEngine.ARXIV.value:
         return LoggedArxivSearch(
             name="web_search",
             api_wrapper=ArxivAPIWrapper(
@@ -55,7 +77,54 @@ def get_web_search_tool(max_search_results: int):
             ),
         )
     else:
-        raise ValueError(f"Unsupported search engine: {SELECTED_SEARCH_ENGINE}")
+        raise ValueError(f"Unsupported search engine: {engine}")
+
+
+def _create_arxiv_pages_tool(max_search_results: int):
+    # ArxivQueryRun returns plain text without links, list the papers instead
+    api_wrapper = ArxivAPIWrapper(top_k_results=max_search_results)
+
+    def arxiv_search(query: str) -> list[dict]:
+        return [
+            {
+                "title": doc.metadata.get("Title", ""),
+                "url": doc.metadata["Entry ID"],
+                "content": doc.page_content,
+            }
+            for doc in api_wrapper.get_summaries_as_docs(query)
+            if "Entry ID" in doc.metadata
+        ]
+
+    return StructuredTool.from_function(
+        arxiv_search, name="arxiv_search", description="Search arxiv papers."
+    )
+
+
+def get_federated_search_tool(max_search_results: int) -> FederatedSearch:
+    """Return a search tool querying every engine of FEDERATED_SEARCH_ENGINES."""
+    engines = {}
+    for engine in FEDERATED_SEARCH_ENGINES:
+        if engine == SearchEngine.ARXIV.value:
+            engines[engine] = _create_arxiv_pages_tool(max_search_results)
+        elif engine == SearchEngine.DUCKDUCKGO.value:
+            engines[engine] = _create_search_tool(
+                engine, max_search_results, output_format="list"
+            )
+        else:
+            engines[engine] = _create_search_tool(engine, max_search_results)
+    return FederatedSearch(
+        name="web_search",
+        engines=engines,
+        max_results=max_search_results,
+        engine_timeout_seconds=SEARCH_ENGINE_TIMEOUT_SECONDS,
+    )
+
+
+# Get the selected search tool
+def get_web_search_tool(max_search_results: int):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.FEDERATED.value:
+        return get_federated_search_tool(max_search_results)
+    return _create_search_tool(SELECTED_SEARCH_ENGINE, max_search_results)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,349 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cache of web search results.
+
+Search tools created with `create_cached_tool` answer repeated queries from a
+cache keyed by search engine, normalized query and search parameters.
+`SEARCH_CACHE_BACKEND` selects where results are kept:
+
+- `memory` (default): an in-process LRU cache
+- `sqlite`: a local SQLite file shared by the API workers of one host
+- `redis`: a Redis server shared by every API worker (requires `redis`)
+- `none`: no caching
+
+Results expire after `SEARCH_CACHE_TTL_SECONDS`; the memory and SQLite
+backends keep at most `SEARCH_CACHE_MAX_ENTRIES` results.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, ClassVar, Optional, Type, TypeVar
+
+from langchain_core.tools import BaseTool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tool and API wrapper fields that change the results of a query
+_TOOL_PARAMS = (
+    "max_results",
+    "search_depth",
+    "include_domains",
+    "exclude_domains",
+    "include_answer",
+    "include_raw_content",
+    "include_images",
+    "include_image_descriptions",
+    "backend",
+    "output_format",
+)
+_WRAPPER_PARAMS = (
+    "search_kwargs",
+    "top_k_results",
+    "load_max_docs",
+    "load_all_available_meta",
+    "doc_content_chars_max",
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share results."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def search_cache_key(engine: str, query: str, params: dict) -> str:
+    """Return the cache key of a query sent to a search engine with `params`."""
+    payload = json.dumps(
+        {"engine": engine, "query": normalize_query(query), "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemorySearchCache:
+    """In-process LRU cache of search results."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteSearchCache:
+    """Search results kept in a SQLite file shared by local processes."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM search_results WHERE key = ? AND expires_at >= ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE search_results SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            self._db.execute(
+                "DELETE FROM search_results WHERE expires_at < ? OR key IN ("
+                " SELECT key FROM search_results ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (now, self.max_entries),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM search_results")
+
+
+class RedisSearchCache:
+    """
+    Search results kept in Redis, shared by every API worker.
+
+    Entries expire after the TTL; size is bounded by the server's
+    `maxmemory` policy.
+    """
+
+    def __init__(self, url: str, ttl_seconds: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "SEARCH_CACHE_BACKEND=redis requires `pip install redis`"
+            ) from e
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(f"search:{key}")
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        self._client.set(f"search:{key}", value, ex=max(int(self.ttl_seconds), 1))
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter("search:*"):
+            self._client.delete(key)
+
+
+class SearchCache:
+    """
+    Search result cache with hit/miss counters, on top of a storage backend.
+
+    Backend errors are logged and treated as misses, so an unavailable cache
+    never fails a search.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Search cache lookup failed: {e!r}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.backend.set(key, json.dumps(value, ensure_ascii=False))
+        except Exception as e:
+            logger.warning(f"Search cache update failed: {e!r}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the search cache selected by `SEARCH_CACHE_BACKEND`, None if disabled."""
+    global _search_cache
+    backend = os.getenv("SEARCH_CACHE_BACKEND", "memory").lower()
+    if backend == "none":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            ttl_seconds = float(os.getenv("SEARCH_CACHE_TTL_SECONDS") or 3600)
+            max_entries = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES") or 1000)
+            if backend == "memory":
+                storage = MemorySearchCache(ttl_seconds, max_entries)
+            elif backend == "sqlite":
+                storage = SQLiteSearchCache(
+                    os.getenv("SEARCH_CACHE_SQLITE_PATH") or ".cache/search.sqlite",
+                    ttl_seconds,
+                    max_entries,
+                )
+            elif backend == "redis":
+                storage = RedisSearchCache(
+                    os.getenv("SEARCH_CACHE_REDIS_URL") or "redis://localhost:6379/0",
+                    ttl_seconds,
+                )
+            else:
+                raise ValueError(f"Unsupported SEARCH_CACHE_BACKEND: {backend}")
+            _search_cache = SearchCache(storage)
+        return _search_cache
+
+
+class CachedToolMixin:
+    """A mixin class that answers repeated queries of a search tool from the cache."""
+
+    cache_engine: ClassVar[str] = ""
+    # Whether the tool has its own async implementation
+    cache_async: ClassVar[bool] = False
+
+    def _cache_key(self, query: str) -> str:
+        params = {
+            name: getattr(self, name) for name in _TOOL_PARAMS if hasattr(self, name)
+        }
+        for wrapper_name in ("api_wrapper", "search_wrapper"):
+            wrapper = getattr(self, wrapper_name, None)
+            for name in _WRAPPER_PARAMS:
+                if hasattr(wrapper, name):
+                    params[f"{wrapper_name}.{name}"] = getattr(wrapper, name)
+        return search_cache_key(self.cache_engine, query, params)
+
+    def _from_cache(self, value: Any) -> Any:
+        # JSON turns the (content, artifact) tuple into a list
+        if self.response_format == "content_and_artifact":
+            return tuple(value)
+        return value
+
+    def _cacheable(self, result: Any) -> bool:
+        # Failed Tavily searches return the error with an empty artifact
+        if self.response_format == "content_and_artifact":
+            return bool(result[1])
+        return bool(result)
+
+    def _run(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        """Override _run method to serve repeated queries from the cache."""
+        cache = get_search_cache()
+        if cache is None:
+            return super()._run(query, *args, **kwargs)
+        key = self._cache_key(query)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {self.cache_engine} query: {query}")
+            return self._from_cache(cached)
+        result = super()._run(query, *args, **kwargs)
+        if self._cacheable(result):
+            cache.set(key, result)
+        return result
+
+    async def _arun(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        """Override _arun method to serve repeated queries from the cache."""
+        cache = get_search_cache()
+        # Without a native async implementation the base runs `_run`, which
+        # already goes through the cache
+        if cache is None or not self.cache_async:
+            return await super()._arun(query, *args, **kwargs)
+        key = self._cache_key(query)
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {self.cache_engine} query: {query}")
+            return self._from_cache(cached)
+        result = await super()._arun(query, *args, **kwargs)
+        if self._cacheable(result):
+            await asyncio.to_thread(cache.set, key, result)
+        return result
+
+
+def create_cached_tool(base_tool_class: Type[T], engine: str) -> Type[T]:
+    """
+    Factory function to create a cached version of a search tool class.
+
+    Args:
+        base_tool_class: The search tool class to be enhanced with caching
+        engine: Name of the search engine, part of the cache key
+
+    Returns:
+        A new class that inherits from both CachedToolMixin and the base tool class
+    """
+
+    class CachedTool(CachedToolMixin, base_tool_class):
+        cache_engine: ClassVar[str] = engine
+        cache_async: ClassVar[bool] = base_tool_class._arun is not BaseTool._arun
+
+    CachedTool.__name__ = base_tool_class.__name__
+    return CachedTool
@@ -1,14 +1,12 @@
 import json
 from typing import Dict, List, Optional
-import certifi
-import ssl
-import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.utils.http_client import async_http_request, http_request
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -35,11 +33,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
-            # type: ignore
-            f"{TAVILY_API_URL}/search",
-            json=params,
-        )
+        response = http_request("POST", f"{TAVILY_API_URL}/search", json=params)
         response.raise_for_status()
         return response.json()
 
@@ -71,14 +65,14 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 "include_images": include_images,
                 "include_image_descriptions": include_image_descriptions,
             }
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=ssl_context)) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+            # Reuse the pooled keep-alive connections to the Tavily API
+            res = await async_http_request(
+                "POST", f"{TAVILY_API_URL}/search", json=params
+            )
+            if res.status_code == 200:
+                return res.text
+            else:
+                raise Exception(f"Error {res.status_code}: {res.reason_phrase}")
 
         results_json_str = await fetch()
         return json.loads(results_json_str)
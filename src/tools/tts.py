@@ -8,9 +8,10 @@ Text-to-Speech module using volcengine TTS API.
 import json
 import uuid
 import logging
-import requests
 from typing import Optional, Dict, Any
 
+from src.utils.http_client import async_http_request, http_request
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +46,65 @@ class VolcengineTTS:
         self.api_url = f"https://{host}/api/v1/tts"
         self.header = {"Authorization": f"Bearer;{access_token}"}
 
+    def _request_json(
+        self,
+        text: str,
+        encoding: str,
+        speed_ratio: float,
+        volume_ratio: float,
+        pitch_ratio: float,
+        text_type: str,
+        with_frontend: int,
+        frontend_type: str,
+        uid: Optional[str],
+        voice_type: Optional[str],
+    ) -> Dict[str, Any]:
+        return {
+            "app": {
+                "appid": self.appid,
+                "token": self.access_token,
+                "cluster": self.cluster,
+            },
+            "user": {"uid": uid or str(uuid.uuid4())},
+            "audio": {
+                "voice_type": voice_type or self.voice_type,
+                "encoding": encoding,
+                "speed_ratio": speed_ratio,
+                "volume_ratio": volume_ratio,
+                "pitch_ratio": pitch_ratio,
+            },
+            "request": {
+                "reqid": str(uuid.uuid4()),
+                "text": text,
+                "text_type": text_type,
+                "operation": "query",
+                "with_frontend": with_frontend,
+                "frontend_type": frontend_type,
+            },
+        }
+
+    @staticmethod
+    def _parse_response(response) -> Dict[str, Any]:
+        response_json = response.json()
+
+        if response.status_code != 200:
+            logger.error(f"TTS API error: {response_json}")
+            return {"success": False, "error": response_json, "audio_data": None}
+
+        if "data" not in response_json:
+            logger.error(f"TTS API returned no data: {response_json}")
+            return {
+                "success": False,
+                "error": "No audio data returned",
+                "audio_data": None,
+            }
+
+        return {
+            "success": True,
+            "response": response_json,
+            "audio_data": response_json["data"],  # Base64 encoded audio data
+        }
+
     def text_to_speech(
         self,
         text: str,
@@ -56,6 +116,7 @@ class VolcengineTTS:
         with_frontend: int = 1,
         frontend_type: str = "unitTson",
         uid: Optional[str] = None,
+        voice_type: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Convert text to speech using volcengine TTS API.
@@ -70,61 +131,76 @@ class VolcengineTTS:
             with_frontend: Whether to use frontend processing
             frontend_type: Frontend type
             uid: User ID (generated if not provided)
+            voice_type: Voice type of this request, defaults to the client's
 
         Returns:
             Dictionary containing the API response and base64-encoded audio data
         """
-        if not uid:
-            uid = str(uuid.uuid4())
-
-        request_json = {
-            "app": {
-                "appid": self.appid,
-                "token": self.access_token,
-                "cluster": self.cluster,
-            },
-            "user": {"uid": uid},
-            "audio": {
-                "voice_type": self.voice_type,
-                "encoding": encoding,
-                "speed_ratio": speed_ratio,
-                "volume_ratio": volume_ratio,
-                "pitch_ratio": pitch_ratio,
-            },
-            "request": {
-                "reqid": str(uuid.uuid4()),
-                "text": text,
-                "text_type": text_type,
-                "operation": "query",
-                "with_frontend": with_frontend,
-                "frontend_type": frontend_type,
-            },
-        }
+        request_json = self._request_json(
+            text,
+            encoding,
+            speed_ratio,
+            volume_ratio,
+            pitch_ratio,
+            text_type,
+            with_frontend,
+            frontend_type,
+            uid,
+            voice_type,
+        )
 
         try:
             logger.debug(f"Sending TTS request for text: {text[:50]}...")
-            response = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
+            response = http_request(
+                "POST",
+                self.api_url,
+                content=json.dumps(request_json),
+                headers=self.header,
             )
-            response_json = response.json()
+            return self._parse_response(response)
 
-            if response.status_code != 200:
-                logger.error(f"TTS API error: {response_json}")
-                return {"success": False, "error": response_json, "audio_data": None}
+        except Exception as e:
+            logger.exception(f"Error in TTS API call: {str(e)}")
+            return {"success": False, "error": str(e), "audio_data": None}
 
-            if "data" not in response_json:
-                logger.error(f"TTS API returned no data: {response_json}")
-                return {
-                    "success": False,
-                    "error": "No audio data returned",
-                    "audio_data": None,
-                }
+    async def atext_to_speech(
+        self,
+        text: str,
+        encoding: str = "mp3",
+        speed_ratio: float = 1.0,
+        volume_ratio: float = 1.0,
+        pitch_ratio: float = 1.0,
+        text_type: str = "plain",
+        with_frontend: int = 1,
+        frontend_type: str = "unitTson",
+        uid: Optional[str] = None,
+        voice_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of `text_to_speech`, sent through the shared async client.
+        """
+        request_json = self._request_json(
+            text,
+            encoding,
+            speed_ratio,
+            volume_ratio,
+            pitch_ratio,
+            text_type,
+            with_frontend,
+            frontend_type,
+            uid,
+            voice_type,
+        )
 
-            return {
-                "success": True,
-                "response": response_json,
-                "audio_data": response_json["data"],  # Base64 encoded audio data
-            }
+        try:
+            logger.debug(f"Sending TTS request for text: {text[:50]}...")
+            response = await async_http_request(
+                "POST",
+                self.api_url,
+                content=json.dumps(request_json),
+                headers=self.header,
+            )
+            return self._parse_response(response)
 
         except Exception as e:
             logger.exception(f"Error in TTS API call: {str(e)}")
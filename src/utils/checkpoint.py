@@ -0,0 +1,330 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Checkpointer backends for the agent workflow graph.
+
+`CHECKPOINT_BACKEND` selects where thread state is kept:
+
+- `memory` (default): in-process `BoundedMemorySaver`, for development
+- `sqlite`: a local SQLite file (requires `langgraph-checkpoint-sqlite`)
+- `postgres`: a PostgreSQL database (requires `langgraph-checkpoint-postgres`)
+
+All backends keep only the latest `CHECKPOINT_KEEP_LAST` checkpoints of every
+thread and drop threads that have been inactive for longer than
+`CHECKPOINT_THREAD_TTL_SECONDS`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+logger = logging.getLogger(__name__)
+
+# Offset between the UUID epoch (1582-10-15) and the Unix epoch, in 100 ns ticks
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if not value:
+        return default
+    value = int(value)
+    return value if value > 0 else None
+
+
+def checkpoint_id_floor(timestamp: float) -> str:
+    """
+    Return the smallest checkpoint id that can be created at `timestamp`.
+
+    Checkpoint ids are time-ordered UUIDv6 strings, so comparing an id with
+    this value tells whether the checkpoint was created before `timestamp`.
+    """
+    ticks = int(timestamp * 10_000_000) + _UUID_EPOCH_OFFSET
+    value = (ticks >> 12) << 80 | 0x6 << 76 | (ticks & 0x0FFF) << 64 | 0x8 << 60
+    return str(uuid.UUID(int=value))
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer with bounded growth.
+
+    Only the latest `keep_last` checkpoints of every thread namespace are
+    kept, threads unused for `thread_ttl_seconds` are dropped, and at most
+    `max_threads` threads are kept (least recently used first out).
+    """
+
+    def __init__(
+        self,
+        *,
+        keep_last: Optional[int] = 20,
+        thread_ttl_seconds: Optional[float] = 24 * 3600,
+        max_threads: Optional[int] = 1000,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.keep_last = keep_last
+        self.thread_ttl_seconds = thread_ttl_seconds
+        self.max_threads = max_threads
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        # Per thread, the channel versions of every kept checkpoint and how many
+        # kept checkpoints refer to every version, so compaction only looks at
+        # the checkpoints it drops
+        self._checkpoint_versions: dict[str, dict[tuple[str, str], dict]] = {}
+        self._version_refs: dict[str, Counter] = {}
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._last_access:
+            self._touch(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        versions = dict(checkpoint["channel_versions"])
+        self._checkpoint_versions.setdefault(thread_id, {})[
+            (checkpoint_ns, checkpoint["id"])
+        ] = versions
+        self._version_refs.setdefault(thread_id, Counter()).update(
+            (checkpoint_ns, *version) for version in versions.items()
+        )
+        self._touch(thread_id)
+        self._compact(thread_id, checkpoint_ns)
+        self.evict()
+        return next_config
+
+    def _compact(self, thread_id: str, checkpoint_ns: str) -> None:
+        if not self.keep_last:
+            return
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_last:
+            return
+        checkpoint_versions = self._checkpoint_versions.get(thread_id, {})
+        refs = self._version_refs.get(thread_id, Counter())
+        for checkpoint_id in sorted(checkpoints)[: -self.keep_last]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            # Drop the channel values no remaining checkpoint refers to
+            versions = checkpoint_versions.pop((checkpoint_ns, checkpoint_id), {})
+            for channel, version in versions.items():
+                ref = (checkpoint_ns, channel, version)
+                refs[ref] -= 1
+                if refs[ref] <= 0:
+                    del refs[ref]
+                    self.blobs.pop((thread_id, *ref), None)
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._checkpoint_versions.pop(thread_id, None)
+        self._version_refs.pop(thread_id, None)
+
+    def evict(self) -> None:
+        """Drop the expired threads and the least recently used extra threads."""
+        now = time.monotonic()
+        while self._last_access:
+            thread_id, last_access = next(iter(self._last_access.items()))
+            expired = (
+                self.thread_ttl_seconds is not None
+                and now - last_access > self.thread_ttl_seconds
+            )
+            over_limit = (
+                self.max_threads is not None
+                and len(self._last_access) > self.max_threads
+            )
+            if not (expired or over_limit):
+                break
+            logger.info(f"Evicting checkpoints of thread {thread_id}")
+            del self._last_access[thread_id]
+            self.delete_thread(thread_id)
+
+
+def create_memory_checkpointer() -> BoundedMemorySaver:
+    """Return a bounded in-memory checkpointer configured from the environment."""
+    return BoundedMemorySaver(
+        keep_last=_env_int("CHECKPOINT_KEEP_LAST", 20),
+        thread_ttl_seconds=_env_int("CHECKPOINT_THREAD_TTL_SECONDS", 24 * 3600),
+        max_threads=_env_int("CHECKPOINT_MAX_THREADS", 1000),
+    )
+
+
+# Compaction statements of the durable backends, run in order. Parameters are
+# the number of checkpoints to keep and the id floor of the TTL cutoff.
+_SQLITE_PRUNE = (
+    """
+    DELETE FROM checkpoints WHERE thread_id IN (
+        SELECT thread_id FROM checkpoints
+        GROUP BY thread_id HAVING MAX(checkpoint_id) < :cutoff
+    )
+    """,
+    """
+    DELETE FROM checkpoints WHERE rowid IN (
+        SELECT rowid FROM (
+            SELECT rowid, ROW_NUMBER() OVER (
+                PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+            ) AS position FROM checkpoints
+        ) WHERE position > :keep_last
+    )
+    """,
+    """
+    DELETE FROM writes WHERE NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = writes.thread_id
+        AND c.checkpoint_ns = writes.checkpoint_ns
+        AND c.checkpoint_id = writes.checkpoint_id
+    )
+    """,
+)
+
+_POSTGRES_PRUNE = (
+    """
+    DELETE FROM checkpoints WHERE thread_id IN (
+        SELECT thread_id FROM checkpoints
+        GROUP BY thread_id HAVING MAX(checkpoint_id) < %(cutoff)s
+    )
+    """,
+    """
+    DELETE FROM checkpoints c USING (
+        SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER (
+            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+        ) AS position FROM checkpoints
+    ) ranked
+    WHERE ranked.position > %(keep_last)s
+    AND c.thread_id = ranked.thread_id
+    AND c.checkpoint_ns = ranked.checkpoint_ns
+    AND c.checkpoint_id = ranked.checkpoint_id
+    """,
+    """
+    DELETE FROM checkpoint_writes w WHERE NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = w.thread_id
+        AND c.checkpoint_ns = w.checkpoint_ns
+        AND c.checkpoint_id = w.checkpoint_id
+    )
+    """,
+    """
+    DELETE FROM checkpoint_blobs b WHERE NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = b.thread_id
+        AND c.checkpoint_ns = b.checkpoint_ns
+        AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+    )
+    """,
+)
+
+
+async def prune_checkpoints(
+    checkpointer: BaseCheckpointSaver,
+    keep_last: Optional[int],
+    thread_ttl_seconds: Optional[float],
+) -> None:
+    """
+    Compact a checkpointer: drop expired threads and old checkpoints.
+
+    Args:
+        checkpointer: The checkpointer to compact
+        keep_last: Number of checkpoints kept per thread namespace (None: all)
+        thread_ttl_seconds: Inactivity after which a thread is dropped (None: never)
+    """
+    if isinstance(checkpointer, BoundedMemorySaver):
+        checkpointer.evict()
+        return
+    params = {
+        # Nothing sorts before the empty string, so no thread expires
+        "cutoff": (
+            checkpoint_id_floor(time.time() - thread_ttl_seconds)
+            if thread_ttl_seconds
+            else ""
+        ),
+        # SQLite and PostgreSQL both accept a huge bound as "keep everything"
+        "keep_last": keep_last or 2**62,
+    }
+    backend = type(checkpointer).__name__
+    if backend == "AsyncSqliteSaver":
+        await checkpointer.setup()
+        async with checkpointer.lock:
+            for statement in _SQLITE_PRUNE:
+                await checkpointer.conn.execute(statement, params)
+            await checkpointer.conn.commit()
+    elif backend == "AsyncPostgresSaver":
+        async with checkpointer._cursor() as cursor:
+            for statement in _POSTGRES_PRUNE:
+                await cursor.execute(statement, params)
+    else:
+        logger.warning(f"Checkpoint compaction is not supported for {backend}")
+
+
+@asynccontextmanager
+async def open_checkpointer() -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Open the checkpointer selected by `CHECKPOINT_BACKEND`.
+
+    Durable backends are compacted every `CHECKPOINT_PRUNE_INTERVAL_SECONDS`
+    for as long as the context is open.
+
+    Yields:
+        The checkpointer to compile the graph with
+    """
+    backend = os.getenv("CHECKPOINT_BACKEND", "memory").lower()
+    if backend == "memory":
+        yield create_memory_checkpointer()
+        return
+
+    if backend == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError as e:
+            raise ImportError(
+                "CHECKPOINT_BACKEND=sqlite requires `pip install langgraph-checkpoint-sqlite`"
+            ) from e
+        saver_context = AsyncSqliteSaver.from_conn_string(
+            os.getenv("CHECKPOINT_SQLITE_PATH", "checkpoints.sqlite")
+        )
+    elif backend == "postgres":
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        except ImportError as e:
+            raise ImportError(
+                "CHECKPOINT_BACKEND=postgres requires `pip install langgraph-checkpoint-postgres`"
+            ) from e
+        postgres_url = os.getenv("CHECKPOINT_POSTGRES_URL")
+        if not postgres_url:
+            raise ValueError("CHECKPOINT_POSTGRES_URL is not set")
+        saver_context = AsyncPostgresSaver.from_conn_string(postgres_url)
+    else:
+        raise ValueError(f"Unsupported CHECKPOINT_BACKEND: {backend}")
+
+    keep_last = _env_int("CHECKPOINT_KEEP_LAST", 20)
+    thread_ttl_seconds = _env_int("CHECKPOINT_THREAD_TTL_SECONDS", 24 * 3600)
+    interval = _env_int("CHECKPOINT_PRUNE_INTERVAL_SECONDS", 600) or 600
+
+    async def prune_periodically():
+        while True:
+            try:
+                await prune_checkpoints(saver, keep_last, thread_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Failed to compact checkpoints: {e!r}")
+            await asyncio.sleep(interval)
+
+    async with saver_context as saver:
+        await saver.setup()
+        logger.info(f"Using {backend} checkpointer")
+        pruner = asyncio.create_task(prune_periodically())
+        try:
+            yield saver
+        finally:
+            pruner.cancel()
@@ -0,0 +1,153 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compaction of agent message histories to a token budget.
+
+ReAct agents resend their whole history on every model call, and tool
+results such as raw search content and crawled pages make it grow quickly.
+Before each call, the pre-model hook counts the tokens of the history and,
+when it exceeds the budget, cuts the oldest tool results down to their
+opening until it fits. Results of the latest tool calls are always passed
+whole. The history kept in the agent state is not changed, only the input
+of the model; the tokens saved are recorded for every step.
+"""
+
+import logging
+import operator
+from dataclasses import dataclass
+from typing import Annotated, Callable, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.prebuilt.chat_agent_executor import AgentState
+
+from src.config.configuration import Configuration
+from src.utils.text_budget import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tokens kept of every compacted tool result
+COMPACTED_TOOL_TOKENS = 150
+
+
+class CompactingAgentState(AgentState):
+    """Agent state recording the context compaction of every model call."""
+
+    context_compaction: Annotated[list[dict], operator.add]
+
+
+@dataclass
+class CompactionStats:
+    """Token counts of a history before and after compaction."""
+
+    tokens_before: int
+    tokens_after: int
+    compacted_messages: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Estimate the tokens of a message, including its tool calls."""
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+        )
+    tokens = estimate_tokens(content)
+    if isinstance(message, AIMessage):
+        tokens += sum(estimate_tokens(str(call)) for call in message.tool_calls)
+    return tokens
+
+
+def compact_messages(
+    messages: list[BaseMessage],
+    token_budget: int,
+    compacted_tokens: int = COMPACTED_TOOL_TOKENS,
+) -> tuple[list[BaseMessage], CompactionStats]:
+    """
+    Cut the oldest tool results of a history until it fits `token_budget`.
+
+    Args:
+        messages: The message history, oldest first
+        token_budget: Maximum estimated tokens of the history
+        compacted_tokens: Tokens kept of every compacted tool result
+
+    Returns:
+        The compacted history and its token counts
+    """
+    sizes = [message_tokens(message) for message in messages]
+    total = tokens_before = sum(sizes)
+    if total <= token_budget:
+        return messages, CompactionStats(total, total, 0)
+
+    # Results after the last model turn are what the model is about to read
+    last_turn = max(
+        (i for i, message in enumerate(messages) if isinstance(message, AIMessage)),
+        default=len(messages),
+    )
+    compacted = list(messages)
+    count = 0
+    for index, message in enumerate(messages[:last_turn]):
+        if total <= token_budget:
+            break
+        if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+            continue
+        if sizes[index] <= compacted_tokens:
+            continue
+        omitted = sizes[index] - compacted_tokens
+        content = truncate_to_tokens(
+            message.content,
+            compacted_tokens,
+            f"\n[... about {omitted} tokens of this earlier tool result omitted]",
+        )
+        compacted[index] = message.model_copy(update={"content": content})
+        total += message_tokens(compacted[index]) - sizes[index]
+        count += 1
+    return compacted, CompactionStats(tokens_before, total, count)
+
+
+def context_compaction_hook(
+    agent_name: str, token_budget: Optional[int] = None
+) -> Callable[[dict, RunnableConfig], dict]:
+    """
+    Create a pre-model hook compacting the history of an agent.
+
+    Args:
+        agent_name: Name of the agent, for logging
+        token_budget: Token budget of the history, defaults to the
+            `agent_context_token_budget` configuration
+
+    Returns:
+        A hook for `create_react_agent(pre_model_hook=...)`, to be used with
+        `CompactingAgentState`
+    """
+
+    def compact_context(state: dict, config: RunnableConfig) -> dict:
+        budget = token_budget or int(
+            Configuration.from_runnable_config(config).agent_context_token_budget
+        )
+        messages, stats = compact_messages(state["messages"], budget)
+        if stats.compacted_messages:
+            logger.info(
+                f"Compacted {stats.compacted_messages} tool result(s) of {agent_name}: "
+                f"{stats.tokens_before} -> {stats.tokens_after} tokens "
+                f"({stats.tokens_saved} saved)"
+            )
+        return {
+            "llm_input_messages": messages,
+            "context_compaction": [
+                {
+                    "tokens_before": stats.tokens_before,
+                    "tokens_after": stats.tokens_after,
+                    "tokens_saved": stats.tokens_saved,
+                    "compacted_messages": stats.compacted_messages,
+                }
+            ],
+        }
+
+    return compact_context
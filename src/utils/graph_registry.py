@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Registry of the compiled workflow graphs of the API server.
+
+Compiled graphs hold no per-run state, so every workflow is compiled once
+and shared by all requests instead of being rebuilt by every handler. The
+API server compiles them in the background after startup (`compile_all`);
+a request arriving earlier compiles or waits for its own graph.
+"""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# "module:attribute" of the workflows; functions are called to build the graph
+GRAPHS = {
+    "main": "src.graph.builder:build_graph_with_memory",
+    "enhanced": "src.graph.builder:build_enhanced_graph_with_memory",
+    "podcast": "src.podcast.graph.builder:workflow",
+    "ppt": "src.ppt.graph.builder:workflow",
+    "prose": "src.prose.graph.builder:build_graph",
+}
+
+
+def _load(spec: str) -> Callable[[], Any]:
+    def load():
+        module, _, attribute = spec.partition(":")
+        value = getattr(importlib.import_module(module), attribute)
+        return value() if inspect.isfunction(value) else value
+
+    return load
+
+
+class GraphRegistry:
+    """Compiles every registered graph once and hands out the compiled graphs."""
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._graphs: dict[str, Any] = {}
+        self._seconds: dict[str, float] = {}
+        self._lock = threading.RLock()
+        self.checkpointer: Optional[Any] = None
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a graph.
+
+        Args:
+            name: Name of the graph
+            factory: Returns the compiled graph
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._graphs.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the compiled graph `name`, compiling it on first use."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        with self._lock:
+            if name not in self._graphs:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown graph: {name}")
+                started = time.perf_counter()
+                self._graphs[name] = self._factories[name]()
+                self._seconds[name] = time.perf_counter() - started
+                self._attach_checkpointer(self._graphs[name])
+                logger.info(f"Compiled the {name} graph in {self._seconds[name]:.3f}s")
+            return self._graphs[name]
+
+    async def aget(self, name: str) -> Any:
+        """Return the compiled graph `name` without blocking the event loop."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        return await asyncio.to_thread(self.get, name)
+
+    def use_checkpointer(self, checkpointer: Any) -> None:
+        """Keep the threads of the graphs compiled with memory in `checkpointer`."""
+        with self._lock:
+            self.checkpointer = checkpointer
+            for graph in self._graphs.values():
+                self._attach_checkpointer(graph)
+
+    def _attach_checkpointer(self, graph: Any) -> None:
+        if self.checkpointer is not None and getattr(graph, "checkpointer", None):
+            graph.checkpointer = self.checkpointer
+
+    def compile_all(self) -> dict[str, float]:
+        """
+        Compile every registered graph not compiled yet.
+
+        Returns:
+            The seconds taken to import and compile every graph
+        """
+        for name in list(self._factories):
+            self.get(name)
+        return self.metrics()
+
+    def metrics(self) -> dict[str, float]:
+        """Seconds taken to import and compile every compiled graph."""
+        return {name: round(seconds, 4) for name, seconds in self._seconds.items()}
+
+
+_graph_registry: Optional[GraphRegistry] = None
+_graph_registry_lock = threading.Lock()
+
+
+def get_graph_registry() -> GraphRegistry:
+    """Return the process-wide graph registry with the workflows of `GRAPHS`."""
+    global _graph_registry
+    with _graph_registry_lock:
+        if _graph_registry is None:
+            _graph_registry = GraphRegistry()
+            for name, spec in GRAPHS.items():
+                _graph_registry.register(name, _load(spec))
+        return _graph_registry
@@ -0,0 +1,252 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Shared HTTP clients for the search, crawl and TTS integrations.
+
+A keep-alive connection pool is reused by every outgoing request instead of
+opening a new session (and TLS handshake) per call: one for the synchronous
+requests and one per event loop for the asynchronous ones. Requests are
+limited per host, time out after `HTTP_TIMEOUT_SECONDS`, and idempotent
+requests are retried with jittered exponential backoff on transport errors
+and 429/5xx responses. Other requests, e.g. POST, are sent once unless the
+caller opts in with `retries=max_retries()`.
+HTTP/2 is used when the `h2` package is installed.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limited or a temporarily unavailable upstream
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Methods that can be sent again without repeating a side effect
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
+def _client_options() -> dict[str, Any]:
+    return {
+        "timeout": httpx.Timeout(
+            _env_float("HTTP_TIMEOUT_SECONDS", 60),
+            connect=_env_float("HTTP_CONNECT_TIMEOUT_SECONDS", 10),
+        ),
+        "limits": httpx.Limits(
+            max_connections=int(_env_float("HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(
+                _env_float("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+            ),
+            keepalive_expiry=30,
+        ),
+        "http2": importlib.util.find_spec("h2") is not None,
+        "follow_redirects": True,
+    }
+
+
+def _max_connections_per_host() -> int:
+    return int(_env_float("HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Full-jitter exponential backoff, honoring a numeric Retry-After header."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+    return random.uniform(0, min(8.0, 0.5 * 2**attempt))
+
+
+def max_retries() -> int:
+    """Retries of a failed request, `HTTP_MAX_RETRIES`."""
+    return int(_env_float("HTTP_MAX_RETRIES", 2))
+
+
+def _retries(method: str, retries: Optional[int]) -> int:
+    if retries is not None:
+        return retries
+    return max_retries() if method.upper() in IDEMPOTENT_METHODS else 0
+
+
+def _should_retry(attempt: int, retries: int, response: httpx.Response) -> bool:
+    return attempt < retries and response.status_code in RETRY_STATUS_CODES
+
+
+_sync_client: Optional[httpx.Client] = None
+_sync_lock = threading.Lock()
+_sync_host_limits: dict[str, threading.BoundedSemaphore] = {}
+
+
+@dataclass
+class _LoopClient:
+    """The asynchronous client of an event loop and its per-host limits."""
+
+    client: httpx.AsyncClient
+    host_limits: dict[str, asyncio.Semaphore]
+    # Held here, the loop only keeps a weak reference to its tasks
+    closing: Optional[asyncio.Task] = None
+
+
+# Connections and semaphores belong to the loop that created them, so every
+# loop (the server's, a new `asyncio.run` in the CLI or a worker thread) has
+# its own client, closed when the loop shuts down
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide synchronous HTTP client."""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+async def _close_on_shutdown(
+    loop: asyncio.AbstractEventLoop, entry: _LoopClient
+) -> None:
+    """Close the client of `loop` once the loop cancels its tasks at shutdown."""
+    try:
+        await asyncio.Event().wait()
+    finally:
+        with _async_lock:
+            if _async_clients.get(loop) is entry:
+                del _async_clients[loop]
+        await entry.client.aclose()
+
+
+def _loop_client() -> _LoopClient:
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        entry = _async_clients.get(loop)
+        if entry is None or entry.client.is_closed:
+            entry = _LoopClient(
+                httpx.AsyncClient(**_client_options()),
+                defaultdict(lambda: asyncio.Semaphore(_max_connections_per_host())),
+            )
+            _async_clients[loop] = entry
+            # `asyncio.run` and uvicorn cancel the pending tasks before closing
+            # the loop, while the connections can still be closed
+            entry.closing = loop.create_task(_close_on_shutdown(loop, entry))
+        return entry
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the asynchronous HTTP client of the running event loop."""
+    return _loop_client().client
+
+
+def http_request(
+    method: str, url: str, *, retries: Optional[int] = None, **kwargs
+) -> httpx.Response:
+    """
+    Send a request through the shared synchronous client.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        retries: Number of retries, defaults to `max_retries()` for idempotent
+            methods and to none for the others
+        **kwargs: Passed to `httpx.Client.request`
+
+    Returns:
+        The last response received; raises the last transport error if none
+    """
+    client = get_http_client()
+    retries = _retries(method, retries)
+    host = httpx.URL(url).host
+    with _sync_lock:
+        if host not in _sync_host_limits:
+            _sync_host_limits[host] = threading.BoundedSemaphore(
+                _max_connections_per_host()
+            )
+        host_limit = _sync_host_limits[host]
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            with host_limit:
+                response = client.request(method, url, **kwargs)
+            if not _should_retry(attempt, retries, response):
+                return response
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            logger.warning(f"{method} {url} failed: {e!r}, retrying")
+        delay = _retry_delay(attempt, response)
+        logger.info(f"Retrying {method} {url} in {delay:.2f}s")
+        time.sleep(delay)
+
+
+async def async_http_request(
+    method: str, url: str, *, retries: Optional[int] = None, **kwargs
+) -> httpx.Response:
+    """
+    Send a request through the shared asynchronous client.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        retries: Number of retries, defaults to `max_retries()` for idempotent
+            methods and to none for the others
+        **kwargs: Passed to `httpx.AsyncClient.request`
+
+    Returns:
+        The last response received; raises the last transport error if none
+    """
+    entry = _loop_client()
+    client = entry.client
+    retries = _retries(method, retries)
+    host_limit = entry.host_limits[httpx.URL(url).host]
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            async with host_limit:
+                response = await client.request(method, url, **kwargs)
+            if not _should_retry(attempt, retries, response):
+                return response
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            logger.warning(f"{method} {url} failed: {e!r}, retrying")
+        delay = _retry_delay(attempt, response)
+        logger.info(f"Retrying {method} {url} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients and their connection pools."""
+    global _sync_client
+    with _sync_lock:
+        sync_client, _sync_client = _sync_client, None
+    if sync_client is not None:
+        sync_client.close()
+    with _async_lock:
+        entries = list(_async_clients.items())
+        _async_clients.clear()
+    current = asyncio.get_running_loop()
+    for loop, entry in entries:
+        if loop is current:
+            entry.closing.cancel()
+            await entry.client.aclose()
+        elif loop.is_running():
+            # The client of another loop is closed on that loop
+            loop.call_soon_threadsafe(entry.closing.cancel)
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(entry.client.aclose(), loop)
+            )
@@ -0,0 +1,153 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Import-time profile of a module, measured in a fresh interpreter.
+
+Startup of the API server and the CLI is dominated by imports. The module is
+imported in a subprocess run with `python -X importtime`, whose report gives
+the time spent importing every module (`self`) and it with its own imports
+(`cumulative`); see `benchmarks/startup` and `tests/test_import_time.py`.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_SCRIPT = """
+import sys, time
+startup = list(sys.modules)
+started = time.perf_counter()
+import {module}
+print((time.perf_counter() - started) * 1000)
+print(" ".join(startup))
+print(" ".join(sys.modules))
+"""
+
+
+@dataclass
+class ImportedModule:
+    name: str
+    # Microseconds spent in the module itself and with its imports
+    self_us: int
+    cumulative_us: int
+    # 0 for the modules imported by the profiled import statement itself
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    # Wall time of the import, including the overhead of `-X importtime`
+    total_ms: float
+    imported: list[ImportedModule] = field(default_factory=list)
+    # Every module loaded once the import finished
+    loaded: set[str] = field(default_factory=set)
+
+    def slowest(self, count: int = 20) -> list[ImportedModule]:
+        """The modules with the longest cumulative import time."""
+        # The profiled module and its packages include everything
+        modules = [
+            m
+            for m in self.imported
+            if m.name != self.module and not self.module.startswith(m.name + ".")
+        ]
+        return sorted(modules, key=lambda m: m.cumulative_us, reverse=True)[:count]
+
+    def loaded_of(self, modules: Sequence[str]) -> list[str]:
+        """The modules of `modules` loaded by the import, packages included."""
+        return [
+            name
+            for name in modules
+            if any(m == name or m.startswith(name + ".") for m in self.loaded)
+        ]
+
+    def report(self, count: int = 20) -> dict:
+        return {
+            "module": self.module,
+            "total_ms": round(self.total_ms, 1),
+            "slowest": [
+                {
+                    "module": m.name,
+                    "self_ms": round(m.self_us / 1000, 1),
+                    "cumulative_ms": round(m.cumulative_us / 1000, 1),
+                }
+                for m in self.slowest(count)
+            ],
+        }
+
+
+def parse_importtime(report: str) -> list[ImportedModule]:
+    """
+    Parse the report of `python -X importtime`.
+
+    Args:
+        report: The stderr of the interpreter
+
+    Returns:
+        The imported modules, in the order of the report
+    """
+    imported = []
+    for line in report.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imported.append(
+                ImportedModule(
+                    name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2
+                )
+            )
+    return imported
+
+
+def profile_import(
+    module: str,
+    python: str = sys.executable,
+    cwd: Optional[str] = None,
+    timeout: float = 120,
+) -> ImportProfile:
+    """
+    Import a module in a fresh interpreter and profile the import.
+
+    Args:
+        module: Name of the module to import
+        python: The interpreter
+        cwd: Working directory of the interpreter, the repository root by default
+        timeout: Deadline of the import, in seconds
+
+    Returns:
+        The profile; raises RuntimeError when the import failed
+    """
+    if cwd is None:
+        cwd = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    # Under pytest-cov these start coverage in the interpreter, which would
+    # import most of the standard library before the statement
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith(("COV_CORE_", "COVERAGE_"))
+    }
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", _SCRIPT.format(module=module)],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    total_ms, startup, loaded = result.stdout.splitlines()[-3:]
+    # Leave out the modules imported by the interpreter before the statement
+    startup = set(startup.split())
+    return ImportProfile(
+        module=module,
+        total_ms=float(total_ms),
+        imported=[m for m in parse_importtime(result.stderr) if m.name not in startup],
+        loaded=set(loaded.split()) - startup,
+    )
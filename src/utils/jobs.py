@@ -0,0 +1,292 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Background jobs for long running generations (podcasts, slides).
+
+A job is submitted, gets an id right away and runs on a bounded pool of
+workers; clients poll or stream its status and download its artifact once
+it succeeded. Synchronous job functions run in the queue's own threads, so
+neither LLM calls nor subprocesses block the event loop:
+
+- `JOBS_WORKERS`: jobs running at the same time
+- `JOBS_MAX_QUEUED`: jobs waiting for a worker, more submissions are refused
+  (0 for no limit)
+- `JOBS_TIMEOUT_SECONDS`: jobs running longer fail as timed out
+- `JOBS_DIR`: directory of the artifacts of the jobs
+- `JOBS_RETENTION_SECONDS`: finished jobs and their artifacts are dropped
+  after this long
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = (
+    JobStatus.SUCCEEDED,
+    JobStatus.FAILED,
+    JobStatus.TIMED_OUT,
+    JobStatus.CANCELLED,
+)
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+
+@dataclass
+class JobArtifact:
+    """File produced by a job."""
+
+    path: Path
+    media_type: str
+    filename: str
+
+
+# Job functions receive the directory to write their artifact to
+JobFunction = Callable[[Path], Union[JobArtifact, Awaitable[JobArtifact]]]
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    function: JobFunction
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    artifact: Optional[JobArtifact] = None
+    _task: Optional[asyncio.Task] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def update(self, status: JobStatus, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        if status == JobStatus.RUNNING:
+            self.started_at = time.time()
+        elif status in FINISHED_STATUSES:
+            self.finished_at = time.time()
+        # Wake up the watchers of the job
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "artifact": self.artifact.filename if self.artifact else None,
+        }
+
+
+class JobQueue:
+    """
+    Runs jobs in the background on a bounded pool of workers.
+
+    Args:
+        workers: Jobs running at the same time
+        max_queued: Jobs waiting for a worker before submissions are refused
+        timeout_seconds: Deadline of every job
+        directory: Directory of the artifacts of the jobs
+        retention_seconds: Finished jobs are dropped after this long
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 16,
+        timeout_seconds: float = 900,
+        directory: Union[str, Path] = ".cache/jobs",
+        retention_seconds: float = 3600,
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.timeout_seconds = timeout_seconds
+        self.directory = Path(directory)
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queued)
+        self._worker_tasks: list[asyncio.Task] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="job"
+        )
+
+    def _start(self) -> None:
+        if not self._worker_tasks:
+            self._worker_tasks = [
+                asyncio.create_task(self._work(), name=f"job-worker-{i}")
+                for i in range(self.workers)
+            ]
+
+    def submit(self, kind: str, function: JobFunction) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Kind of the job, e.g. "podcast"
+            function: Produces the artifact of the job in the given directory;
+                synchronous functions run in a thread
+
+        Returns:
+            The queued job; raises QueueFull when too many jobs are waiting
+        """
+        self._purge()
+        self._start()
+        job = Job(id=str(uuid.uuid4()), kind=kind, function=function)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f"{self.max_queued} jobs are already waiting")
+        self._jobs[job.id] = job
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a job waiting for a worker or running."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            # The worker skips it
+            job.update(JobStatus.CANCELLED)
+        return job
+
+    async def watch(self, job_id: str) -> AsyncIterator[dict]:
+        """Yield the snapshot of a job every time its status changes, until it finishes."""
+        job = self._jobs[job_id]
+        while True:
+            changed = job._changed
+            yield job.snapshot()
+            if job.finished:
+                return
+            await changed.wait()
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status == JobStatus.QUEUED:
+                    job._task = asyncio.create_task(self._run(job))
+                    await asyncio.wait([job._task])
+                    if not job.finished:
+                        # Cancelled before it started
+                        job.update(JobStatus.CANCELLED)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.update(JobStatus.RUNNING)
+        directory = self.directory / job.id
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+            if inspect.iscoroutinefunction(job.function):
+                running = job.function(directory)
+            else:
+                running = asyncio.get_running_loop().run_in_executor(
+                    self._executor, job.function, directory
+                )
+            job.artifact = await asyncio.wait_for(running, self.timeout_seconds)
+            job.update(JobStatus.SUCCEEDED)
+        except asyncio.TimeoutError:
+            # A job running in a thread cannot be stopped, it finishes unobserved
+            job.update(
+                JobStatus.TIMED_OUT,
+                f"The job took longer than {self.timeout_seconds}s",
+            )
+        except asyncio.CancelledError:
+            job.update(JobStatus.CANCELLED)
+        except Exception as e:
+            logger.exception(f"{job.kind} job {job.id} failed")
+            job.update(JobStatus.FAILED, str(e))
+        finally:
+            job._task = None
+        logger.info(
+            f"{job.kind} job {job.id} {job.status.value} "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _purge(self) -> None:
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and now - job.finished_at > self.retention_seconds:
+                del self._jobs[job_id]
+                shutil.rmtree(self.directory / job_id, ignore_errors=True)
+
+    def stats(self) -> dict:
+        statuses = [job.status.value for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "queued": self._queue.qsize(),
+            "jobs": {
+                status.value: statuses.count(status.value) for status in JobStatus
+            },
+        }
+
+    async def close(self) -> None:
+        """Cancel the running jobs and stop the workers."""
+        for job in self._jobs.values():
+            if job._task is not None:
+                job._task.cancel()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                workers=int(os.getenv("JOBS_WORKERS") or 2),
+                max_queued=int(os.getenv("JOBS_MAX_QUEUED") or 16),
+                timeout_seconds=float(os.getenv("JOBS_TIMEOUT_SECONDS") or 900),
+                directory=os.getenv("JOBS_DIR") or ".cache/jobs",
+                retention_seconds=float(os.getenv("JOBS_RETENTION_SECONDS") or 3600),
+            )
+        return _job_queue
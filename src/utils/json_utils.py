@@ -1,8 +1,11 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import bisect
 import logging
 import json
+from typing import Any, Optional
+
 import json_repair
 
 logger = logging.getLogger(__name__)
@@ -37,3 +40,144 @@ def repair_json_output(content: str) -> str:
         except Exception as e:
             logger.warning(f"JSON repair failed: {e}")
     return content
+
+
+def _loads_tolerant(content: str) -> Any:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return json_repair.loads(content)
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for a JSON object that is streamed in chunks.
+
+    Text before the opening brace (e.g. a ```json fence) is skipped. Every
+    top-level field is parsed as soon as its value is complete, and the
+    elements of the array stored under `array_key` are parsed one by one as
+    each of them closes, so callers can act on them before the object ends.
+    Each character is scanned once, whatever the chunk boundaries are, and
+    the chunks are kept as they arrive instead of being concatenated.
+    """
+
+    def __init__(self, array_key: str):
+        """
+        Args:
+            array_key (str): Top-level key of the array whose items are yielded
+        """
+        self.array_key = array_key
+        self.fields: dict = {}
+        self.items: list = []
+        self._chunks: list[str] = []
+        # Position of the first character of every chunk in the stream
+        self._starts: list[int] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> list:
+        """
+        Consume the next chunk of the stream.
+
+        Args:
+            chunk (str): Next piece of the JSON text
+
+        Returns:
+            list: Items of the `array_key` array completed by this chunk
+        """
+        new_items = []
+        if not chunk:
+            return new_items
+        start = self._length
+        self._chunks.append(chunk)
+        self._starts.append(start)
+        self._length += len(chunk)
+        for pos, char in enumerate(chunk, start):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = _loads_tolerant(
+                            self._slice(self._string_start, pos + 1)
+                        )
+                continue
+            if char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+                    self._string_start = pos
+            elif char in "{[":
+                if self._depth == 0 and char == "{":
+                    self._expect_key = True
+                elif self._depth == 1 and char == "[" and self._key == self.array_key:
+                    self._in_array = True
+                elif self._depth == 2 and self._in_array:
+                    self._item_start = pos
+                if self._depth > 0 or char == "{":
+                    self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    continue
+                self._depth -= 1
+                if self._depth == 2 and self._item_start is not None:
+                    item = self._parse(self._slice(self._item_start, pos + 1))
+                    self._item_start = None
+                    if item is not None:
+                        self.items.append(item)
+                        new_items.append(item)
+                elif self._depth == 1:
+                    self._in_array = False
+                elif self._depth == 0:
+                    self._end_value(pos)
+            elif self._depth == 1:
+                if char == ":":
+                    self._expect_key = False
+                    self._value_start = pos + 1
+                elif char == ",":
+                    self._end_value(pos)
+                    self._expect_key = True
+        return new_items
+
+    def _slice(self, start: int, end: int) -> str:
+        """The text of the stream between two positions."""
+        first = bisect.bisect_right(self._starts, start) - 1
+        last = bisect.bisect_left(self._starts, end)
+        offset = self._starts[first]
+        return "".join(self._chunks[first:last])[start - offset : end - offset]
+
+    def _end_value(self, pos: int) -> None:
+        if self._key is None or self._value_start is None:
+            return
+        content = self._slice(self._value_start, pos)
+        value = self._parse(content)
+        if value is not None or content.strip() == "null":
+            self.fields[self._key] = value
+        self._key = None
+        self._value_start = None
+
+    @staticmethod
+    def _parse(content: str) -> Any:
+        try:
+            return _loads_tolerant(content)
+        except Exception as e:
+            logger.warning(f"Failed to parse streamed JSON value: {e}")
+            return None
+
+    @property
+    def partial(self) -> dict:
+        """The fields completed so far, with the completed array items."""
+        partial = dict(self.fields)
+        if self.items or self.array_key in partial:
+            partial[self.array_key] = list(self.items)
+        return partial
@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cache of the tool lists advertised by MCP servers.
+
+Listing the tools of a server means launching it and doing the MCP handshake,
+which can take many seconds, while the settings page asks for the same servers
+over and over. Catalogs are cached per normalized connection config, concurrent
+identical lookups share a single load, and the cache can be persisted to a JSON
+file so it survives a server restart.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from src.utils.mcp_pool import server_config_key
+
+logger = logging.getLogger(__name__)
+
+# Loads the tool list of a server from its connection config and a timeout
+CatalogLoader = Callable[[Dict[str, Any], int], Awaitable[List[Dict[str, Any]]]]
+
+
+class MCPToolCatalog:
+    """TTL cache of MCP tool lists keyed by server config hash."""
+
+    def __init__(
+        self,
+        loader: CatalogLoader,
+        ttl_seconds: float = 3600,
+        cache_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            loader: Coroutine function listing the tools of a server
+            ttl_seconds: How long a catalog is served from the cache
+            cache_path: Optional JSON file the catalog is persisted to
+        """
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.cache_path = Path(cache_path) if cache_path else None
+        # Wall-clock timestamps so that persisted entries can expire
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._load_from_disk()
+
+    async def get_tools(
+        self,
+        connection: Dict[str, Any],
+        timeout_seconds: int = 300,
+        refresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the tools of an MCP server, from the cache when possible.
+
+        Args:
+            connection: Server connection config (transport, command, args, url, env)
+            timeout_seconds: Timeout for loading the tools on a cache miss
+            refresh: Ignore the cached catalog and load it again
+
+        Returns:
+            List of tool descriptions as returned by the loader
+        """
+        key = server_config_key(connection)
+        if refresh:
+            self.invalidate(connection)
+        else:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and time.time() - entry["cached_at"] < self.ttl_seconds
+            ):
+                logger.debug(f"MCP tool catalog cache hit for {key[:12]}")
+                return entry["tools"]
+
+        # Single flight: concurrent requests for the same server share one load
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._load(key, connection, timeout_seconds))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: str, connection: Dict[str, Any], timeout_seconds: int
+    ) -> List[Dict[str, Any]]:
+        try:
+            tools = await self.loader(connection, timeout_seconds)
+            # Failed loads return an empty list; don't pin them in the cache
+            if tools:
+                self._entries[key] = {"tools": tools, "cached_at": time.time()}
+                self._save_to_disk()
+            return tools
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, connection: Optional[Dict[str, Any]] = None) -> None:
+        """Drop the cached catalog of a server, or of every server if None."""
+        if connection is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(server_config_key(connection), None)
+        self._save_to_disk()
+
+    def _load_from_disk(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            entries = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable MCP tool catalog cache: {e}")
+            return
+        now = time.time()
+        self._entries = {
+            key: entry
+            for key, entry in entries.items()
+            if now - entry.get("cached_at", 0) < self.ttl_seconds
+        }
+        logger.info(f"Loaded {len(self._entries)} MCP tool catalogs from disk")
+
+    def _save_to_disk(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            tmp_path.write_text(
+                json.dumps(self._entries, ensure_ascii=False), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist MCP tool catalog cache: {e}")
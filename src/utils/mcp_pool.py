@@ -0,0 +1,308 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide pool of warm MCP server sessions.
+
+Starting an MCP server (spawning `npx`/`uvx` and doing the MCP handshake) takes
+seconds, so instead of opening a `MultiServerMCPClient` for every step, servers
+are started once per normalized connection config and shared by all steps and
+requests. Sessions are health-checked with a ping, restarted when they die and
+closed after being idle for `MCP_POOL_IDLE_TTL_SECONDS`.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import anyio
+from langchain_core.tools import BaseTool, StructuredTool
+
+logger = logging.getLogger(__name__)
+
+# Connection fields that identify an MCP server process or SSE session
+MCP_CONNECTION_KEYS = (
+    "transport",
+    "command",
+    "args",
+    "url",
+    "env",
+    "headers",
+    "timeout",
+    "sse_read_timeout",
+)
+
+# Errors raised when the transport of a session has gone away
+_CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def server_config_key(connection: Dict[str, Any]) -> str:
+    """Return a stable hash of the connection fields of an MCP server config."""
+    normalized = {key: connection.get(key) for key in MCP_CONNECTION_KEYS}
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _PooledServer:
+    """A single MCP server kept alive by a dedicated background task.
+
+    The MCP transports are anyio context managers that must be exited by the
+    task that entered them, so the client lives in its own task for the whole
+    lifetime of the session instead of in the task of the current request.
+    """
+
+    def __init__(self, name: str, connection: Dict[str, Any]):
+        self.name = name
+        self.connection = {
+            key: value
+            for key, value in connection.items()
+            if key in MCP_CONNECTION_KEYS
+        }
+        self.tools: Dict[str, BaseTool] = {}
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self._session = None
+        self._error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"mcp-server-{self.name}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close(timeout=1)
+            raise
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        # Imported on first use, the MCP client is slow to import
+        from langchain_mcp_adapters.client import MultiServerMCPClient
+
+        try:
+            async with MultiServerMCPClient({self.name: self.connection}) as client:
+                self._session = client.sessions[self.name]
+                self.tools = {tool.name: tool for tool in client.get_tools()}
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"MCP server '{self.name}' stopped with error: {e!r}")
+        finally:
+            self._session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self._session.send_ping(), timeout)
+            self.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server '{self.name}' failed health check: {e!r}")
+            return False
+
+    async def close(self, timeout: float = 5) -> None:
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except Exception:
+            self._task.cancel()
+
+
+class MCPClientPool:
+    """Pool of warm MCP server sessions keyed by normalized server config."""
+
+    def __init__(
+        self,
+        idle_ttl_seconds: float = 600,
+        startup_timeout_seconds: float = 60,
+        health_check_interval_seconds: float = 30,
+        ping_timeout_seconds: float = 5,
+    ):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.ping_timeout_seconds = ping_timeout_seconds
+        self._servers: Dict[str, _PooledServer] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    def _bind_loop(self) -> None:
+        # Sessions belong to the event loop that started them; a new loop
+        # (e.g. a new `asyncio.run` in the CLI) starts from an empty pool.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._servers = {}
+            self._locks = {}
+            self._loop = loop
+            self._reaper = None
+        if self._reaper is None or self._reaper.done():
+            self._reaper = loop.create_task(self._reap_idle(), name="mcp-pool-reaper")
+
+    async def _reap_idle(self) -> None:
+        interval = max(1.0, min(self.idle_ttl_seconds, 60) / 2)
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle()
+
+    async def _acquire(self, name: str, connection: Dict[str, Any]) -> _PooledServer:
+        key = server_config_key(connection)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            server = self._servers.get(key)
+            if server is not None:
+                stale = (
+                    time.monotonic() - server.last_checked
+                    > self.health_check_interval_seconds
+                )
+                if not server.alive or (
+                    stale and not await server.ping(self.ping_timeout_seconds)
+                ):
+                    logger.info(f"Restarting dead MCP server '{server.name}'")
+                    self._servers.pop(key, None)
+                    await server.close()
+                    server = None
+            if server is None:
+                logger.info(f"Starting MCP server '{name}' for the pool")
+                server = _PooledServer(name, connection)
+                await server.start(self.startup_timeout_seconds)
+                self._servers[key] = server
+            server.last_used = time.monotonic()
+            return server
+
+    async def _restart(self, connection: Dict[str, Any]) -> None:
+        key = server_config_key(connection)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            server = self._servers.pop(key, None)
+        if server is not None:
+            await server.close()
+
+    async def get_tools(self, servers: Dict[str, Dict[str, Any]]) -> List[BaseTool]:
+        """
+        Return LangChain tools for the given MCP servers, starting them if needed.
+
+        Servers are connected concurrently; a server that fails to start is
+        skipped with a warning so the others can still be used.
+
+        Args:
+            servers: Mapping of server name to its connection config
+
+        Returns:
+            Fresh tool objects that route calls through the pooled sessions
+        """
+        self._bind_loop()
+        names = list(servers)
+        results = await asyncio.gather(
+            *(self._acquire(name, servers[name]) for name in names),
+            return_exceptions=True,
+        )
+        tools: List[BaseTool] = []
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to start MCP server '{name}': {result!r}")
+                continue
+            for tool in result.tools.values():
+                tools.append(self._pooled_tool(name, servers[name], tool))
+        return tools
+
+    def _pooled_tool(
+        self, name: str, connection: Dict[str, Any], tool: BaseTool
+    ) -> BaseTool:
+        async def call_tool(**arguments: Any):
+            return await self.call_tool(name, connection, tool.name, arguments)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=call_tool,
+            response_format="content_and_artifact",
+        )
+
+    async def call_tool(
+        self,
+        name: str,
+        connection: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+    ):
+        """Call an MCP tool, restarting the server and retrying once if it died."""
+        self._bind_loop()
+        server = await self._acquire(name, connection)
+        try:
+            return await server.tools[tool_name].coroutine(**arguments)
+        except _CONNECTION_ERRORS as e:
+            logger.warning(
+                f"MCP server '{name}' connection lost during '{tool_name}': {e!r}, "
+                "restarting and retrying"
+            )
+            await self._restart(connection)
+            server = await self._acquire(name, connection)
+            return await server.tools[tool_name].coroutine(**arguments)
+
+    async def evict_idle(self) -> None:
+        """Close the servers that have not been used within the idle TTL."""
+        now = time.monotonic()
+        for key, server in list(self._servers.items()):
+            if now - server.last_used < self.idle_ttl_seconds:
+                continue
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            if lock.locked():
+                continue
+            async with lock:
+                if self._servers.get(key) is server:
+                    logger.info(f"Evicting idle MCP server '{server.name}'")
+                    del self._servers[key]
+                    await server.close()
+
+    async def close(self) -> None:
+        """Close every pooled server."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        servers, self._servers = list(self._servers.values()), {}
+        for server in servers:
+            await server.close()
+
+    def __len__(self) -> int:
+        return len(self._servers)
+
+
+_pool: Optional[MCPClientPool] = None
+
+
+def get_mcp_client_pool() -> MCPClientPool:
+    """Return the process-wide MCP client pool."""
+    global _pool
+    if _pool is None:
+        _pool = MCPClientPool(
+            idle_ttl_seconds=float(os.getenv("MCP_POOL_IDLE_TTL_SECONDS", "600")),
+            startup_timeout_seconds=float(
+                os.getenv("MCP_POOL_STARTUP_TIMEOUT_SECONDS", "60")
+            ),
+        )
+    return _pool
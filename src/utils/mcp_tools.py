@@ -1,7 +1,5 @@
 import json
 import os
-from langchain_mcp_adapters.client import MultiServerMCPClient
-import asyncio
 
 # 优先读取 active_mcp_tools.json
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -62,11 +60,3 @@ def recommend_tools_for_step(step_title, step_description, mcp_tools):
                 matched_tools.append(tool)
                 break
     return matched_tools
-
-async def call_mcp_tool_with_retry(client, tool_name, *args, **kwargs):
-    try:
-        return await client.call_tool(tool_name, *args, **kwargs)
-    except ClosedResourceError:
-        # 尝试重启MCP子进程并重试
-        await client.restart()
-        return await client.call_tool(tool_name, *args, **kwargs) 
\ No newline at end of file
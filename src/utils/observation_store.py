@@ -0,0 +1,188 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Research findings read through a token budget.
+
+The full findings of the research steps stay in the graph state; prompts only
+receive a view of them that fits a token budget. When everything fits, the
+findings are passed as is. Otherwise every finding keeps its opening passage,
+usually the agent's own summary, and the remaining budget goes to the
+passages most relevant to the current task, ranked with BM25. Agents can page
+through the full findings with the `read_findings` tool.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Annotated, Iterable, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from src.utils.text_budget import (
+    bm25_scores,
+    estimate_tokens,
+    split_passages,
+    truncate_to_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+_OMITTED = "[...]"
+
+
+@dataclass
+class FindingView:
+    """A finding as it is shown in a prompt."""
+
+    title: str
+    content: str
+    complete: bool
+
+
+class ObservationStore:
+    """
+    Findings of the research steps, readable within a token budget.
+
+    Args:
+        findings: (title, content) of every finding, in research order
+        passage_tokens: Size of the passages findings are split into
+    """
+
+    def __init__(self, findings: Iterable[tuple[str, str]], passage_tokens: int = 200):
+        self.findings = [(title, content or "") for title, content in findings]
+        self.passage_tokens = passage_tokens
+        self._passages = [
+            split_passages(content, passage_tokens) for _, content in self.findings
+        ]
+
+    @classmethod
+    def from_observations(cls, observations: Iterable[str]) -> "ObservationStore":
+        """Create a store from the `observations` of the graph state."""
+        return cls(
+            (f"Finding {i}", observation)
+            for i, observation in enumerate(observations, start=1)
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(estimate_tokens(content) for _, content in self.findings)
+
+    def select(self, query: str, token_budget: int) -> list[FindingView]:
+        """
+        Return the findings fitted into `token_budget` tokens.
+
+        Args:
+            query: The task the findings are used for, to rank passages
+            token_budget: Maximum number of tokens of all finding contents
+
+        Returns:
+            A view of every finding, complete when it fits
+        """
+        if self.total_tokens <= token_budget:
+            return [
+                FindingView(title, content, True) for title, content in self.findings
+            ]
+
+        # The opening passage of every finding, cut to a fair share of the budget
+        lead_tokens = max(
+            1, min(self.passage_tokens, token_budget // (2 * len(self.findings)))
+        )
+        selected: list[set[int]] = [set() for _ in self.findings]
+        remaining = token_budget
+        candidates = []
+        for index, passages in enumerate(self._passages):
+            if not passages:
+                continue
+            if estimate_tokens(passages[0]) <= lead_tokens:
+                selected[index].add(0)
+                remaining -= estimate_tokens(passages[0])
+                candidates.extend(
+                    (index, position) for position in range(1, len(passages))
+                )
+            else:
+                remaining -= lead_tokens
+                candidates.extend(
+                    (index, position) for position in range(len(passages))
+                )
+
+        # Spend the rest of the budget on the passages most relevant to the task
+        scores = bm25_scores(
+            query, [self._passages[index][position] for index, position in candidates]
+        )
+        ranked = sorted(
+            zip(candidates, scores), key=lambda item: (-item[1], item[0][1], item[0][0])
+        )
+        for (index, position), _ in ranked:
+            tokens = estimate_tokens(self._passages[index][position])
+            if tokens <= remaining:
+                selected[index].add(position)
+                remaining -= tokens
+
+        views = []
+        for (title, _), passages, positions in zip(
+            self.findings, self._passages, selected
+        ):
+            parts = []
+            for position, passage in enumerate(passages):
+                if position in positions:
+                    parts.append(passage)
+                elif position == 0:
+                    # Only room for the beginning of the opening passage
+                    parts.append(
+                        truncate_to_tokens(passage, lead_tokens, f" {_OMITTED}")
+                    )
+                elif not parts[-1].endswith(_OMITTED):
+                    parts.append(_OMITTED)
+            complete = len(positions) == len(passages)
+            views.append(FindingView(title, "\n\n".join(parts), complete))
+        return views
+
+    def page(self, number: int, page: int = 1, page_tokens: int = 2000) -> str:
+        """
+        Return a page of the full content of a finding.
+
+        Args:
+            number: Number of the finding, starting at 1
+            page: Number of the page, starting at 1
+            page_tokens: Size of the pages
+
+        Returns:
+            The page, headed with its position in the finding
+        """
+        if not 1 <= number <= len(self.findings):
+            return f"There is no finding {number}, findings are numbered 1 to {len(self.findings)}."
+        title, content = self.findings[number - 1]
+        pages = split_passages(content, page_tokens) or [""]
+        if not 1 <= page <= len(pages):
+            return f"Finding {number} has {len(pages)} page(s)."
+        return f"# {title} (page {page} of {len(pages)})\n\n{pages[page - 1]}"
+
+    def table_of_contents(self, page_tokens: int = 2000) -> str:
+        """List the findings with their size in pages."""
+        lines = []
+        for number, (title, content) in enumerate(self.findings, start=1):
+            pages = len(split_passages(content, page_tokens)) or 1
+            lines.append(f"{number}. {title} ({pages} page(s))")
+        return "\n".join(lines)
+
+    def as_tool(self, page_tokens: int = 2000) -> BaseTool:
+        """Return a tool paging through the full findings."""
+
+        def read_findings(
+            finding: Annotated[
+                Optional[int], "Number of the finding to read, omit to list them"
+            ] = None,
+            page: Annotated[int, "Page of the finding to read, starting at 1"] = 1,
+        ) -> str:
+            if finding is None:
+                return self.table_of_contents(page_tokens)
+            return self.page(finding, page, page_tokens)
+
+        return StructuredTool.from_function(
+            read_findings,
+            name="read_findings",
+            description=(
+                "Read the full research findings page by page. Findings shown "
+                f"in the task may be abridged where marked with {_OMITTED}."
+            ),
+        )
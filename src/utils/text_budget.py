@@ -0,0 +1,201 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Helpers to fit text into a token budget.
+
+Token counts are estimated without a tokenizer: about four characters per
+token for latin text and one token per CJK character. This is close enough
+to budget prompts and needs neither a model download nor network access.
+"""
+
+import math
+import re
+from collections import Counter
+
+_CJK = r"぀-ヿ㐀-䶿一-鿿가-힯"
+_CJK_CHAR = re.compile(f"[{_CJK}]")
+_TERM = re.compile(f"[{_CJK}]|[^\\W_]+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# ATX (# Title) and setext (Title followed by === or ---) markdown headings
+_HEADING = r"#{1,6}\s[^\n]*|[^\n]+\n(?:=+|-+)[ \t]*$"
+_SECTION_START = re.compile(f"^(?={_HEADING})", re.MULTILINE)
+_SECTION_HEADING = re.compile(_HEADING, re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of `text`."""
+    if not text:
+        return 0
+    cjk = len(_CJK_CHAR.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def _prefix_length(text: str, max_tokens: int) -> int:
+    """Length of the longest prefix of `text` within `max_tokens` tokens."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """Cut `text` to about `max_tokens` tokens, ending with `marker` if cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[: _prefix_length(text, max_tokens)].rstrip() + marker
+
+
+def split_passages(text: str, max_tokens: int = 200) -> list[str]:
+    """
+    Split text into passages of at most about `max_tokens` tokens.
+
+    Paragraphs are kept whole when they fit and merged with their neighbours
+    while the passage stays under the limit; longer paragraphs are split on
+    lines, then hard-wrapped.
+    """
+    passages: list[str] = []
+    current = ""
+    for block in _PARAGRAPH_BREAK.split(text):
+        block = block.strip()
+        if not block:
+            continue
+        pieces = [block]
+        if estimate_tokens(block) > max_tokens:
+            pieces = []
+            for line in block.splitlines():
+                while estimate_tokens(line) > max_tokens:
+                    cut = max(1, _prefix_length(line, max_tokens))
+                    pieces.append(line[:cut])
+                    line = line[cut:]
+                if line.strip():
+                    pieces.append(line)
+        for piece in pieces:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if current and estimate_tokens(candidate) > max_tokens:
+                passages.append(current)
+                current = piece
+            else:
+                current = candidate
+    if current:
+        passages.append(current)
+    return passages
+
+
+def terms(text: str) -> list[str]:
+    """Split text into lowercase search terms, one per CJK character."""
+    return _TERM.findall(text.lower())
+
+
+def bm25_scores(
+    query: str, passages: list[str], k1: float = 1.5, b: float = 0.75
+) -> list[float]:
+    """
+    Score passages against a query with Okapi BM25.
+
+    Args:
+        query: The query text
+        passages: The passages to score
+        k1: Term frequency saturation
+        b: Passage length normalization
+
+    Returns:
+        The score of every passage, in order
+    """
+    if not passages:
+        return []
+    passage_terms = [Counter(terms(passage)) for passage in passages]
+    lengths = [sum(counts.values()) for counts in passage_terms]
+    average_length = sum(lengths) / len(lengths) or 1
+    query_terms = set(terms(query))
+    document_frequency = {
+        term: sum(1 for counts in passage_terms if term in counts)
+        for term in query_terms
+    }
+    scores = []
+    for counts, length in zip(passage_terms, lengths):
+        score = 0.0
+        for term in query_terms:
+            frequency = counts.get(term, 0)
+            if not frequency:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+            score += (
+                idf
+                * frequency
+                * (k1 + 1)
+                / (frequency + k1 * (1 - b + b * length / average_length))
+            )
+        scores.append(score)
+    return scores
+
+
+def select_passages(
+    text: str,
+    query: str,
+    max_tokens: int,
+    passage_tokens: int = 200,
+    marker: str = "[...]",
+) -> str:
+    """
+    Cut markdown text down to the passages most relevant to a query.
+
+    The text is split into sections at its headings and the sections into
+    passages. The opening passage is always kept; the rest of the budget goes
+    to the passages ranked highest with BM25, scored together with the
+    heading of their section. Passages keep their order in the text, with
+    `marker` where passages were left out.
+
+    Args:
+        text: The markdown text
+        query: What the text is read for; without one the leading passages
+            are kept
+        max_tokens: Maximum number of tokens of the selected passages
+        passage_tokens: Size of the passages
+        marker: Separator standing for left out passages
+
+    Returns:
+        The text itself if it fits, otherwise the selected passages
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    passage_tokens = min(passage_tokens, max_tokens)
+    passages, headings = [], []
+    for section in _SECTION_START.split(text):
+        match = _SECTION_HEADING.match(section)
+        heading = match.group(0) if match else ""
+        for passage in split_passages(section, passage_tokens):
+            passages.append(passage)
+            headings.append(heading)
+    if not passages:
+        return truncate_to_tokens(text, max_tokens, f" {marker}")
+
+    # Without query terms all scores are 0 and passages are taken in order
+    scores = bm25_scores(
+        query,
+        [
+            passage if passage.startswith(heading) else f"{heading}\n{passage}"
+            for heading, passage in zip(headings, passages)
+        ],
+    )
+    ranked = sorted(range(1, len(passages)), key=lambda i: (-scores[i], i))
+    selected, remaining = set(), max_tokens
+    for index in [0, *ranked]:
+        tokens = estimate_tokens(passages[index])
+        if tokens <= remaining:
+            selected.add(index)
+            remaining -= tokens
+
+    parts = []
+    for index, passage in enumerate(passages):
+        if index in selected:
+            parts.append(passage)
+        elif not parts or parts[-1] != marker:
+            parts.append(marker)
+    return "\n\n".join(parts)
@@ -4,6 +4,7 @@
 import asyncio
 import logging
 from src.graph import build_graph
+from src.utils.mcp_pool import get_mcp_client_pool
 
 # Configure logging
 logging.basicConfig(
@@ -75,25 +76,29 @@ async def run_agent_workflow_async(
         "recursion_limit": 100,
     }
     last_message_cnt = 0
-    async for s in graph.astream(
-        input=initial_state, config=config, stream_mode="values"
-    ):
-        try:
-            if isinstance(s, dict) and "messages" in s:
-                if len(s["messages"]) <= last_message_cnt:
-                    continue
-                last_message_cnt = len(s["messages"])
-                message = s["messages"][-1]
-                if isinstance(message, tuple):
-                    print(message)
+    try:
+        async for s in graph.astream(
+            input=initial_state, config=config, stream_mode="values"
+        ):
+            try:
+                if isinstance(s, dict) and "messages" in s:
+                    if len(s["messages"]) <= last_message_cnt:
+                        continue
+                    last_message_cnt = len(s["messages"])
+                    message = s["messages"][-1]
+                    if isinstance(message, tuple):
+                        print(message)
+                    else:
+                        message.pretty_print()
                 else:
-                    message.pretty_print()
-            else:
-                # For any other output format
-                print(f"Output: {s}")
-        except Exception as e:
-            logger.error(f"Error processing stream output: {e}")
-            print(f"Error processing output: {str(e)}")
+                    # For any other output format
+                    print(f"Output: {s}")
+            except Exception as e:
+                logger.error(f"Error processing stream output: {e}")
+                print(f"Error processing output: {str(e)}")
+    finally:
+        # Shut down the MCP servers started during this run
+        await get_mcp_client_pool().close()
 
     logger.info("Async workflow completed successfully")
 
@@ -1,8 +1,16 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
-from src.crawler import Crawler
+from src.crawler import Crawler, extraction
+from src.crawler.extraction import ExtractionService, ExtractionTimeout
+from src.crawler.jina_client import JinaClient
+from src.tools.crawl import crawl_many_tool, crawl_tool
 
 
 def test_crawler_initialization():
@@ -28,3 +36,171 @@ def test_crawler_markdown_output():
     markdown = result.to_markdown()
     assert isinstance(markdown, str)
     assert len(markdown) > 0
+
+
+def _fake_acrawl(delays, active, peak):
+    async def acrawl(self, url, return_format="html"):
+        host = url.split("/")[2]
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(delays.get(url, 0.01))
+        active[host] -= 1
+        if "broken" in url:
+            raise ConnectionError("unreachable")
+        return (
+            f"<html><head><title>{url}</title></head><body><p>{url}</p></body></html>"
+        )
+
+    return acrawl
+
+
+@pytest.fixture
+def offline_crawler(monkeypatch):
+    """Crawl without the disk cache, the local index and Readability.js."""
+    monkeypatch.setenv("CRAWL_CACHE_MAX_MB", "0")
+    monkeypatch.setenv("LOCAL_INDEX_MAX_DOCUMENTS", "0")
+    monkeypatch.setattr(extraction, "_extraction_service", ExtractionService(workers=0))
+    with patch("readabilipy.simple_json.have_node", return_value=False):
+        yield
+
+
+def test_crawler_acrawl_many_yields_in_completion_order(offline_crawler):
+    """Results come back as soon as each URL is crawled, failures included."""
+    delays = {"https://a.com/slow": 0.3, "https://b.com/fast": 0.01}
+    urls = ["https://a.com/slow", "https://b.com/fast", "https://c.com/broken"]
+
+    async def run():
+        with patch.object(JinaClient, "acrawl", _fake_acrawl(delays, {}, {})):
+            return [item async for item in Crawler().acrawl_many(urls)]
+
+    results = asyncio.run(run())
+    assert [url for url, _ in results][-1] == "https://a.com/slow"
+    assert isinstance(dict(results)["https://c.com/broken"], ConnectionError)
+    assert dict(results)["https://b.com/fast"].url == "https://b.com/fast"
+
+
+def test_crawler_acrawl_many_limits_concurrency_per_host(offline_crawler):
+    """No more than the per-host limit of requests run against one host."""
+    active, peak = {}, {}
+    urls = [f"https://a.com/{i}" for i in range(6)] + ["https://b.com/1"]
+
+    async def run():
+        with patch.object(JinaClient, "acrawl", _fake_acrawl({}, active, peak)):
+            return [item async for item in Crawler().acrawl_many(urls, 2)]
+
+    assert len(asyncio.run(run())) == 7
+    assert peak == {"a.com": 2, "b.com": 1}
+
+
+def test_crawl_many_tool_reports_each_url(offline_crawler):
+    """The batch tool returns content or an error for every URL."""
+    urls = ["https://a.com/page", "https://b.com/broken"]
+    with patch.object(JinaClient, "acrawl", _fake_acrawl({}, {}, {})):
+        results = asyncio.run(crawl_many_tool.ainvoke({"urls": urls}))
+    by_url = {result["url"]: result for result in results}
+    assert "https://a.com/page" in by_url["https://a.com/page"]["crawled_content"]
+    assert by_url["https://b.com/broken"]["error"].startswith("Failed to crawl")
+
+
+def test_crawl_many_tool_selects_passages_off_the_event_loop(offline_crawler):
+    """Markdown conversion and passage selection run in a thread."""
+    threads = []
+
+    def select_passages(markdown, query, max_tokens):
+        threads.append(threading.current_thread())
+        return markdown
+
+    urls = ["https://a.com/1", "https://b.com/2"]
+    with (
+        patch.object(JinaClient, "acrawl", _fake_acrawl({}, {}, {})),
+        patch("src.tools.crawl.select_passages", select_passages),
+    ):
+        results = asyncio.run(crawl_many_tool.ainvoke({"urls": urls}))
+    assert len(results) == 2
+    assert threads and threading.main_thread() not in threads
+
+
+def test_crawl_tool_returns_the_parts_relevant_to_the_query(
+    offline_crawler, monkeypatch
+):
+    """Long pages are cut down to the sections matching the query."""
+    monkeypatch.setenv("CRAWL_CONTENT_TOKEN_BUDGET", "400")
+    sections = "".join(
+        f"<h2>{topic}</h2>" + f"<p>{topic} details. {'Filler text. ' * 40}</p>" * 3
+        for topic in ("History", "Pricing", "Reviews")
+    )
+    html = f"<html><head><title>Product</title></head><body>{sections}</body></html>"
+    with patch.object(JinaClient, "crawl", lambda self, url, return_format: html):
+        result = crawl_tool.invoke({"url": "https://a.com/p", "query": "pricing"})
+    content = result["crawled_content"]
+    assert len(content) < len(html) / 3
+    assert "Pricing details" in content
+    assert "Reviews details" not in content
+
+
+def _page(paragraphs):
+    body = "".join(f"<p>Paragraph {i} of the article.</p>" for i in range(paragraphs))
+    return f"<html><head><title>Title</title></head><body>{body}</body></html>"
+
+
+def test_extraction_service_extracts_in_worker_processes():
+    """Articles come back from the workers with their markdown converted."""
+    service = ExtractionService(workers=1, use_readability=False)
+    try:
+        service.start()
+        article = service.extract(_page(3), "https://a.com/page")
+        assert article.url == "https://a.com/page"
+        assert "Paragraph 2 of the article." in article.to_markdown()
+        article = asyncio.run(service.aextract(_page(1), "https://a.com/other"))
+        assert article.title == "Title"
+        assert service.stats.snapshot()["extractions"] == 2
+    finally:
+        service.shutdown()
+
+
+def test_extraction_service_limits_size_and_time():
+    """Oversized HTML is truncated and slow extractions time out."""
+    service = ExtractionService(workers=1, max_html_bytes=2000, use_readability=False)
+    try:
+        service.start()
+        article = service.extract(_page(200), "https://a.com/huge")
+        assert "Paragraph 0" in article.to_markdown()
+        assert "Paragraph 199" not in article.to_markdown()
+
+        service.max_html_bytes = 10_000_000
+        service.timeout_seconds = 0.05
+        with pytest.raises(ExtractionTimeout):
+            service.extract(_page(100_000), "https://a.com/slow")
+
+        # The stuck worker is replaced and later pages are extracted again
+        service.timeout_seconds = 30
+        assert service.extract(_page(1), "https://a.com/next").title == "Title"
+        stats = service.stats.snapshot()
+        assert (stats["truncated"], stats["timeouts"], stats["extractions"]) == (
+            1,
+            1,
+            3,
+        )
+        assert sum(stats["histogram"].values()) == 3
+        assert stats["seconds"]["max"] >= 0.05
+    finally:
+        service.shutdown()
+
+
+def test_extraction_without_workers_times_out():
+    """Extractions in threads are bounded by the same deadline."""
+
+    def slow_extract(html, *arguments):
+        time.sleep(0.5)
+        return "Title", html, ""
+
+    service = ExtractionService(workers=0, timeout_seconds=0.05)
+    try:
+        with patch.object(extraction, "_extract", slow_extract):
+            with pytest.raises(ExtractionTimeout):
+                service.extract(_page(1), "https://a.com/slow")
+            with pytest.raises(ExtractionTimeout):
+                asyncio.run(service.aextract(_page(1), "https://a.com/slow"))
+        assert service.stats.snapshot()["timeouts"] == 2
+    finally:
+        service.shutdown()
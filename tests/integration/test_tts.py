@@ -1,12 +1,19 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
+import threading
+import time
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 import uuid
 import base64
 
+from src.podcast.audio_stream import AudioSpool, stream_podcast_audio
+from src.podcast.graph.tts_node import TTSError, synthesize_lines, tts_node
+from src.podcast.types import Script, ScriptLine
 from src.tools.tts import VolcengineTTS
 
 
@@ -45,7 +52,7 @@ class TestVolcengineTTS:
         assert tts.host == "openspeech.bytedance.com"
         assert tts.api_url == "https://openspeech.bytedance.com/api/v1/tts"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_request")
     def test_text_to_speech_success(self, mock_post):
         """Test successful text-to-speech conversion."""
         # Mock response
@@ -76,11 +83,11 @@ class TestVolcengineTTS:
 
         # Verify the request
         mock_post.assert_called_once()
-        args, _ = mock_post.call_args
-        assert args[0] == "https://openspeech.bytedance.com/api/v1/tts"
+        args, kwargs = mock_post.call_args
+        assert args == ("POST", "https://openspeech.bytedance.com/api/v1/tts")
 
-        # Verify request JSON - the data is passed as the second positional argument
-        request_json = json.loads(args[1])
+        # Verify request JSON - the data is passed as the request content
+        request_json = json.loads(kwargs["content"])
         assert request_json["app"]["appid"] == "test_appid"
         assert request_json["app"]["token"] == "test_token"
         assert request_json["app"]["cluster"] == "volcano_tts"
@@ -88,7 +95,7 @@ class TestVolcengineTTS:
         assert request_json["audio"]["encoding"] == "mp3"
         assert request_json["request"]["text"] == "Hello, world!"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_request")
     def test_text_to_speech_api_error(self, mock_post):
         """Test error handling when API returns an error."""
         # Mock response
@@ -114,7 +121,7 @@ class TestVolcengineTTS:
         assert result["error"] == {"code": 400, "message": "Bad request"}
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_request")
     def test_text_to_speech_no_data(self, mock_post):
         """Test error handling when API response doesn't contain data."""
         # Mock response
@@ -141,7 +148,7 @@ class TestVolcengineTTS:
         assert result["error"] == "No audio data returned"
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_request")
     def test_text_to_speech_with_custom_parameters(self, mock_post):
         """Test text_to_speech with custom parameters."""
         # Mock response
@@ -179,9 +186,9 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify request JSON - the data is passed as the second positional argument
+        # Verify request JSON - the data is passed as the request content
         args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        request_json = json.loads(kwargs["content"])
         assert request_json["audio"]["encoding"] == "wav"
         assert request_json["audio"]["speed_ratio"] == 1.2
         assert request_json["audio"]["volume_ratio"] == 0.8
@@ -192,7 +199,7 @@ class TestVolcengineTTS:
         assert request_json["request"]["frontend_type"] == "custom"
         assert request_json["user"]["uid"] == "custom-uid"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_request")
     @patch("src.tools.tts.uuid.uuid4")
     def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_post):
         """Test that UUID is auto-generated if not provided."""
@@ -225,7 +232,188 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify the request JSON - the data is passed as the second positional argument
+        # Verify the request JSON - the data is passed as the request content
         args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        request_json = json.loads(kwargs["content"])
         assert request_json["user"]["uid"] == str(mock_uuid_value)
+
+
+class StubTTSServer(ThreadingHTTPServer):
+    """Local TTS API answering with the text of the request as audio.
+
+    Texts starting with "slow" take longer, "flaky" fails on its first
+    request and "broken" always fails.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubTTSHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests: list[dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1/tts"
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        text = body["request"]["text"]
+        with server.lock:
+            server.requests.append(body)
+            attempts = sum(r["request"]["text"] == text for r in server.requests)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(0.2 if text.startswith("slow") else 0.05)
+        with server.lock:
+            server.in_flight -= 1
+        if text.startswith("broken") or (text.startswith("flaky") and attempts == 1):
+            status, payload = 500, {"code": 3000, "message": "stub failure"}
+        else:
+            status = 200
+            payload = {"code": 3000, "data": base64.b64encode(text.encode()).decode()}
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+@pytest.fixture
+def stub_tts():
+    server = StubTTSServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    tts = VolcengineTTS(appid="test_appid", access_token="test_token")
+    tts.api_url = server.url
+    yield server, tts
+    server.shutdown()
+    server.server_close()
+
+
+class TestConcurrentSynthesis:
+    """Test suite for the concurrent synthesis of podcast scripts."""
+
+    def test_atext_to_speech(self, stub_tts):
+        server, tts = stub_tts
+        result = asyncio.run(tts.atext_to_speech("Hello", voice_type="BV002_streaming"))
+        assert result["success"] is True
+        assert base64.b64decode(result["audio_data"]) == b"Hello"
+        assert server.requests[0]["audio"]["voice_type"] == "BV002_streaming"
+
+    def test_lines_are_synthesized_concurrently_in_order(self, stub_tts):
+        server, tts = stub_tts
+        lines = [
+            ScriptLine(speaker="male" if i % 2 else "female", paragraph=text)
+            for i, text in enumerate(["slow one", "two", "slow three", "four", "five"])
+        ]
+        started = time.perf_counter()
+        syntheses = asyncio.run(synthesize_lines(tts, lines, concurrency=3))
+        elapsed = time.perf_counter() - started
+
+        assert [s.audio for s in syntheses] == [
+            line.paragraph.encode() for line in lines
+        ]
+        assert server.max_in_flight == 3
+        # Sequentially the lines would take 0.55s
+        assert elapsed < 0.5
+        voices = {
+            r["request"]["text"]: r["audio"]["voice_type"] for r in server.requests
+        }
+        assert voices["two"] == "BV002_streaming"
+        assert voices["four"] == "BV002_streaming"
+        assert voices["five"] == "BV001_streaming"
+        assert all(len(s.latencies) == 1 and s.latencies[0] > 0 for s in syntheses)
+
+    def test_failed_lines_are_retried(self, stub_tts):
+        server, tts = stub_tts
+        lines = [ScriptLine(paragraph="one"), ScriptLine(paragraph="flaky two")]
+        syntheses = asyncio.run(synthesize_lines(tts, lines, retry_delay=0))
+        assert [s.audio for s in syntheses] == [b"one", b"flaky two"]
+        assert [s.attempts for s in syntheses] == [1, 2]
+        assert syntheses[1].report()["success"] is True
+
+    def test_tts_node_fails_on_lines_failing_every_retry(self, stub_tts, monkeypatch):
+        server, tts = stub_tts
+        monkeypatch.setenv("PODCAST_TTS_RETRIES", "1")
+        script = Script(
+            lines=[ScriptLine(paragraph="one"), ScriptLine(paragraph="broken two")]
+        )
+        with patch("src.podcast.graph.tts_node.create_tts_client", return_value=tts):
+            with pytest.raises(TTSError, match="1 of 2 lines: line 1"):
+                asyncio.run(tts_node({"script": script, "audio_chunks": []}))
+        assert sum(r["request"]["text"] == "broken two" for r in server.requests) == 2
+
+    def test_tts_node_reports_every_line(self, stub_tts):
+        server, tts = stub_tts
+        script = Script(
+            lines=[ScriptLine(paragraph="one"), ScriptLine(paragraph="two")]
+        )
+        with patch("src.podcast.graph.tts_node.create_tts_client", return_value=tts):
+            result = asyncio.run(tts_node({"script": script, "audio_chunks": []}))
+        assert result["audio_chunks"] == [b"one", b"two"]
+        assert [line["line"] for line in result["tts_report"]] == [0, 1]
+        assert all(line["attempts"] == 1 for line in result["tts_report"])
+
+
+class TestPodcastAudioStream:
+    """Test suite for streaming the podcast audio."""
+
+    @staticmethod
+    async def _collect(stream):
+        received = []
+        async for chunk in stream:
+            received.append((chunk, time.perf_counter()))
+        return received
+
+    def test_audio_is_streamed_in_script_order(self, stub_tts):
+        server, tts = stub_tts
+        lines = [
+            ScriptLine(paragraph=text) for text in ["one", "slow two", "three", "four"]
+        ]
+        received = asyncio.run(
+            self._collect(stream_podcast_audio(tts, lines, concurrency=4))
+        )
+        assert [chunk for chunk, _ in received] == [
+            b"one",
+            b"slow two",
+            b"three",
+            b"four",
+        ]
+        # The first line is sent before the slow second line is ready
+        assert received[1][1] - received[0][1] > 0.1
+        assert server.max_in_flight == 4
+
+    def test_failed_line_stops_the_stream(self, stub_tts):
+        server, tts = stub_tts
+        lines = [ScriptLine(paragraph="one"), ScriptLine(paragraph="broken two")]
+
+        async def consume():
+            received = []
+            with pytest.raises(TTSError, match="line 1"):
+                async for chunk in stream_podcast_audio(
+                    tts, lines, retries=1, retry_delay=0
+                ):
+                    received.append(chunk)
+            return received
+
+        assert asyncio.run(consume()) == [b"one"]
+
+    def test_audio_spool_moves_to_disk(self):
+        spool = AudioSpool(max_memory_bytes=4)
+        spool.put(2, b"two")
+        assert not spool.on_disk
+        spool.put(1, b"one!")
+        assert spool.on_disk
+        assert 1 in spool and 0 not in spool
+        assert spool.pop(1) == b"one!"
+        assert spool.pop(2) == b"two"
+        assert 2 not in spool
+        spool.close()
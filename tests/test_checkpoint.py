@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import operator
+import time
+from typing import Annotated
+from unittest.mock import patch
+
+import pytest
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.graph import START, StateGraph
+from typing_extensions import TypedDict
+
+from src.utils.checkpoint import (
+    BoundedMemorySaver,
+    checkpoint_id_floor,
+    prune_checkpoints,
+)
+
+
+class CounterState(TypedDict):
+    count: Annotated[int, operator.add]
+
+
+def _build_counter_graph(checkpointer):
+    builder = StateGraph(CounterState)
+    builder.add_node("increment", lambda state: {"count": 1})
+    builder.add_edge(START, "increment")
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_memory_saver_keeps_latest_checkpoints():
+    """Old checkpoints and their channel values are dropped, state is kept."""
+    saver = BoundedMemorySaver(keep_last=3)
+    graph = _build_counter_graph(saver)
+    blob_counts = []
+    for _ in range(10):
+        graph.invoke({"count": 0}, _config("thread"))
+        blob_counts.append(len(saver.blobs))
+
+    assert graph.get_state(_config("thread")).values["count"] == 10
+    assert len(list(saver.list(_config("thread")))) == 3
+    assert blob_counts[-1] == blob_counts[4]
+
+
+def test_memory_saver_compacts_without_reading_kept_checkpoints():
+    """Only the dropped checkpoints are looked at, the kept ones stay whole."""
+    saver = BoundedMemorySaver(keep_last=3)
+    graph = _build_counter_graph(saver)
+    graph.invoke({"count": 0}, _config("other"))
+    for _ in range(5):
+        graph.invoke({"count": 0}, _config("thread"))
+
+    latest = saver.get_tuple(_config("thread"))
+    checkpoint = {**latest.checkpoint, "id": str(uuid6())}
+    before = len(saver.blobs)
+    with patch.object(
+        saver.serde, "loads_typed", side_effect=AssertionError("checkpoint read")
+    ):
+        saver.put(latest.config, checkpoint, latest.metadata, {})
+    assert len(saver.blobs) <= before
+
+    history = [s.values["count"] for s in graph.get_state_history(_config("thread"))]
+    assert history[0] == 5 and len(history) == 3
+    assert graph.get_state(_config("other")).values["count"] == 1
+
+
+def test_memory_saver_evicts_least_recently_used_threads():
+    """Threads beyond max_threads are dropped, oldest first."""
+    saver = BoundedMemorySaver(max_threads=2)
+    graph = _build_counter_graph(saver)
+    for thread_id in ("a", "b"):
+        graph.invoke({"count": 0}, _config(thread_id))
+    graph.get_state(_config("a"))
+    graph.invoke({"count": 0}, _config("c"))
+
+    assert saver.get_tuple(_config("b")) is None
+    assert graph.get_state(_config("a")).values["count"] == 1
+    assert graph.get_state(_config("c")).values["count"] == 1
+
+
+def test_memory_saver_expires_inactive_threads():
+    """Threads unused for longer than the TTL are dropped."""
+    saver = BoundedMemorySaver(thread_ttl_seconds=60)
+    graph = _build_counter_graph(saver)
+    graph.invoke({"count": 0}, _config("old"))
+    later = time.monotonic() + 120
+    with patch("src.utils.checkpoint.time.monotonic", return_value=later):
+        graph.invoke({"count": 0}, _config("new"))
+
+    assert saver.get_tuple(_config("old")) is None
+    assert saver.get_tuple(_config("new")) is not None
+
+
+def test_checkpoint_id_floor_orders_like_checkpoint_ids():
+    """Ids created after a timestamp sort after its floor, earlier ones before."""
+    before = str(uuid6(clock_seq=5))
+    time.sleep(0.01)
+    cutoff = checkpoint_id_floor(time.time())
+    time.sleep(0.01)
+    after = str(uuid6(clock_seq=0))
+    assert before < cutoff < after
+
+
+def test_prune_sqlite_checkpoints(tmp_path):
+    """The SQLite backend is compacted and expired threads are removed."""
+    aio = pytest.importorskip("langgraph.checkpoint.sqlite.aio")
+
+    async def run():
+        path = str(tmp_path / "checkpoints.sqlite")
+        async with aio.AsyncSqliteSaver.from_conn_string(path) as saver:
+            graph = _build_counter_graph(saver)
+            for _ in range(5):
+                await graph.ainvoke({"count": 0}, _config("thread"))
+
+            await prune_checkpoints(saver, keep_last=2, thread_ttl_seconds=3600)
+            checkpoints = [c async for c in saver.alist(_config("thread"))]
+            assert len(checkpoints) == 2
+            state = await graph.aget_state(_config("thread"))
+            assert state.values["count"] == 5
+
+            await asyncio.sleep(0.01)
+            await prune_checkpoints(saver, keep_last=2, thread_ttl_seconds=0.001)
+            assert await saver.aget_tuple(_config("thread")) is None
+
+    asyncio.run(run())
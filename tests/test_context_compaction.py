@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.utils.context_compaction import (
+    compact_messages,
+    context_compaction_hook,
+    message_tokens,
+)
+
+
+def _round(index, result_tokens):
+    call = {"name": "web_search", "args": {"query": f"q{index}"}, "id": f"call{index}"}
+    return [
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(
+            content="word " * (result_tokens * 4 // 5), tool_call_id=f"call{index}"
+        ),
+    ]
+
+
+def _history(rounds=4, result_tokens=1000):
+    messages = [HumanMessage(content="Research battery storage")]
+    for index in range(rounds):
+        messages.extend(_round(index, result_tokens))
+    return messages
+
+
+def test_history_within_budget_is_unchanged():
+    """Nothing is compacted while the history fits."""
+    messages = _history(rounds=2)
+    compacted, stats = compact_messages(messages, 10_000)
+    assert compacted is messages
+    assert stats.tokens_saved == 0
+
+
+def test_oldest_tool_results_are_compacted_first():
+    """Old results are cut until the history fits; the latest stays whole."""
+    messages = _history(rounds=4)
+    compacted, stats = compact_messages(messages, 2500, compacted_tokens=100)
+
+    assert stats.tokens_before > 4000
+    assert stats.tokens_after <= 2500
+    assert stats.tokens_saved == stats.tokens_before - stats.tokens_after
+    assert stats.compacted_messages == 2
+    assert sum(message_tokens(message) for message in compacted) == stats.tokens_after
+
+    tool_results = [m for m in compacted if isinstance(m, ToolMessage)]
+    assert "tool result omitted]" in tool_results[0].content
+    assert "tool result omitted]" in tool_results[1].content
+    assert tool_results[2].content == messages[6].content
+    assert tool_results[3].content == messages[8].content
+    assert tool_results[0].tool_call_id == "call0"
+    # The history itself is left untouched
+    assert "omitted" not in messages[2].content
+
+
+def test_latest_tool_results_are_never_compacted():
+    """Results of the latest tool calls stay whole even over the budget."""
+    messages = _history(rounds=1, result_tokens=5000)
+    compacted, stats = compact_messages(messages, 1000)
+    assert compacted[-1].content == messages[-1].content
+    assert stats.compacted_messages == 0
+
+
+def test_hook_records_the_tokens_saved():
+    """The hook passes the compacted history to the model and records savings."""
+    hook = context_compaction_hook("researcher", token_budget=2500)
+    update = hook({"messages": _history(rounds=4)}, {})
+    [record] = update["context_compaction"]
+    assert record["tokens_saved"] > 0
+    assert record["tokens_after"] <= 2500
+    assert len(update["llm_input_messages"]) == 9
+
+    hook = context_compaction_hook("researcher")
+    update = hook({"messages": _history(rounds=4)}, {"configurable": {}})
+    assert update["context_compaction"][0]["tokens_saved"] == 0
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.cache import CrawlCache, Validators, normalize_url
+
+
+def _article(text):
+    return Article(title=text, html_content=f"<p>{text}</p>")
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers or {})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CrawlCache(str(tmp_path), max_bytes=1024 * 1024, ttl_seconds=60)
+
+
+def test_normalize_url():
+    """Equivalent URLs share a cache key."""
+    assert (
+        normalize_url("HTTPS://Example.com:443/a?b=2&utm_source=x&a=1#section")
+        == "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_cache_hit_and_miss(cache):
+    """Stored articles are served under any equivalent URL."""
+    assert cache.get("https://example.com/a") is None
+    cache.put("https://example.com/a", _article("a"), Validators(etag='"v1"'))
+
+    cached = cache.get("https://EXAMPLE.com/a#top")
+    assert cached.fresh
+    assert cached.article.title == "a"
+    assert cached.article.url == "https://EXAMPLE.com/a#top"
+    assert cached.validators == Validators(etag='"v1"')
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_cache_hit_keeps_the_converted_markdown(cache):
+    """A cached article is not converted to markdown again."""
+    article = Article("a", "<p>a</p>", markdown_content="Converted *a*")
+    cache.put("https://example.com/a", article)
+
+    with patch(
+        "src.crawler.article.iter_markdown", side_effect=AssertionError("converted")
+    ):
+        cached = cache.get("https://example.com/a")
+        assert cached.article.to_markdown() == "# a\n\nConverted *a*"
+
+
+def test_cache_stores_identical_content_once(cache, tmp_path):
+    """Pages with the same content share one object on disk."""
+    cache.put("https://example.com/a", _article("same"))
+    cache.put("https://mirror.example.com/a", _article("same"))
+    objects = [files for _, _, files in os.walk(tmp_path / "objects") if files]
+    assert sum(len(files) for files in objects) == 1
+
+    cache.invalidate("https://example.com/a")
+    assert cache.get("https://mirror.example.com/a").article.title == "same"
+    cache.invalidate()
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Entries beyond the size bound are evicted, least recently used first."""
+    cache = CrawlCache(str(tmp_path), max_bytes=250, ttl_seconds=60)
+    cache.put("https://example.com/1", _article("1" * 20))
+    cache.put("https://example.com/2", _article("2" * 20))
+    cache.get("https://example.com/1")
+    cache.put("https://example.com/3", _article("3" * 20))
+
+    assert cache.get("https://example.com/2") is None
+    assert cache.get("https://example.com/1") is not None
+    assert cache.get("https://example.com/3") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_validators_detect_unchanged_pages():
+    """A 304, or a 200 with the same validators, confirms the cached page."""
+    validators = Validators(etag='"v1"')
+    assert validators.request_headers() == {"If-None-Match": '"v1"'}
+    assert validators.unchanged(_response(304))
+    assert validators.unchanged(_response(200, {"ETag": '"v1"'}))
+    assert not validators.unchanged(_response(200, {"ETag": '"v2"'}))
+    assert not validators.unchanged(_response(200))
+
+
+def test_crawler_uses_cache_and_revalidates(cache):
+    """Fresh entries skip crawling, stale ones are revalidated at the origin."""
+    jina_crawl = MagicMock(return_value="<html><body><p>page</p></body></html>")
+    extracted = _article("page")
+    with (
+        patch("src.crawler.crawler.get_crawl_cache", return_value=cache),
+        patch("src.crawler.crawler.JinaClient.crawl", jina_crawl),
+        patch("src.crawler.crawler.get_extraction_service") as extraction,
+        patch("src.crawler.cache.http_request") as origin,
+    ):
+        extraction.return_value.extract.return_value = extracted
+        origin.return_value = _response(200, {"ETag": '"v1"'})
+        assert Crawler().crawl("https://example.com/page").title == "page"
+        assert Crawler().crawl("https://example.com/page").title == "page"
+        assert jina_crawl.call_count == 1
+
+        # Once stale, a 304 from the origin renews the entry
+        cache.ttl_seconds = 0
+        origin.return_value = _response(304)
+        assert Crawler().crawl("https://example.com/page").title == "page"
+        assert jina_crawl.call_count == 1
+        assert origin.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+        # A changed page is crawled again
+        origin.return_value = _response(200, {"ETag": '"v2"'})
+        Crawler().crawl("https://example.com/page")
+        assert jina_crawl.call_count == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["revalidations"], stats["stale"]) == (1, 1, 2)
+
+
+def test_async_crawler_uses_the_cache_off_the_event_loop(cache):
+    """The sqlite and file work of the cache runs in threads."""
+    threads = []
+
+    def in_thread(method):
+        def call(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        return call
+
+    with (
+        patch("src.crawler.crawler.get_crawl_cache", return_value=cache),
+        patch.object(cache, "get", in_thread(cache.get)),
+        patch.object(cache, "put", in_thread(cache.put)),
+        patch(
+            "src.crawler.crawler.JinaClient.acrawl",
+            AsyncMock(return_value="<html><body><p>page</p></body></html>"),
+        ),
+        patch(
+            "src.crawler.crawler.afetch_validators",
+            AsyncMock(return_value=Validators(etag='"v1"')),
+        ),
+        patch("src.crawler.crawler.get_extraction_service") as extraction,
+    ):
+        extraction.return_value.aextract = AsyncMock(return_value=_article("page"))
+        assert asyncio.run(Crawler().acrawl("https://example.com/page")).title == "page"
+        assert asyncio.run(Crawler().acrawl("https://example.com/page")).title == "page"
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
@@ -0,0 +1,58 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.crawler.extraction import ExtractionService
+from src.crawler.fast_extractor import FastExtractor
+from src.utils.text_budget import terms
+
+CORPUS = Path(__file__).parents[1] / "benchmarks" / "extraction" / "corpus"
+
+PAGE = """<?xml version="1.0" encoding="utf-8"?>
+<html><head><title>Tidal power | Energy Weekly</title></head><body>
+<header><nav><a href="/">Home</a> <a href="/news">News</a></nav></header>
+<div class="sidebar"><ul><li><a href="/a">Popular story one</a></li>
+<li><a href="/b">Popular story two</a></li></ul></div>
+<div id="content"><h1>Tidal power</h1>
+<p>Tidal turbines in the Pentland Firth produced a record output last year, with availability above ninety percent.</p>
+<img src="/turbine.jpg" alt="A tidal turbine">
+<p>Operators say the results make a case for larger arrays, although costs remain high.</p>
+<div class="share"><a href="#">Share</a></div></div>
+<div class="comments"><p>I visited the site last summer and it was fascinating to see, truly.</p></div>
+<footer>Copyright Energy Weekly, all rights reserved, reproduction prohibited.</footer>
+</body></html>"""
+
+
+def test_fast_extractor_keeps_the_article_only():
+    """Navigation, sidebars, comments and footers are left out."""
+    article = FastExtractor().extract_article(PAGE)
+    assert article.title == "Tidal power | Energy Weekly"
+    markdown = article.to_markdown()
+    assert "record output last year" in markdown
+    assert "larger arrays" in markdown
+    assert "![A tidal turbine](/turbine.jpg)" in markdown
+    for boilerplate in ("Popular story", "Share", "visited the site", "Copyright"):
+        assert boilerplate not in markdown
+    assert FastExtractor().extract_article("").html_content == ""
+
+
+@pytest.mark.parametrize("page", sorted(CORPUS.glob("*.html")), ids=lambda p: p.stem)
+def test_fast_extractor_quality_on_the_benchmark_corpus(page):
+    """The extracted words match the main text of every corpus page."""
+    article = FastExtractor().extract_article(page.read_text("utf-8"))
+    got = Counter(terms(article.to_markdown(including_title=False)))
+    want = Counter(terms(page.with_suffix(".txt").read_text("utf-8")))
+    overlap = sum((got & want).values())
+    assert overlap / sum(got.values()) > 0.7
+    assert overlap / sum(want.values()) > 0.9
+
+
+def test_extraction_service_selects_the_extractor():
+    article = ExtractionService(workers=0, extractor="fast").extract(PAGE, "https://a")
+    assert "record output" in article.to_markdown()
+    with pytest.raises(ValueError):
+        ExtractionService(extractor="unknown")
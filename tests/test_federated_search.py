@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import time
+
+from langchain_core.tools import StructuredTool
+
+from src.tools.federated_search import (
+    FederatedSearch,
+    canonical_url,
+    fuse_results,
+    to_pages,
+)
+
+
+def _engine(name, results, delay=0.0):
+    def search(query: str):
+        time.sleep(delay)
+        return results
+
+    async def asearch(query: str):
+        await asyncio.sleep(delay)
+        return results
+
+    return StructuredTool.from_function(
+        func=search, coroutine=asearch, name=name, description=name
+    )
+
+
+def _page(url, content=""):
+    return {"title": url, "url": url, "content": content}
+
+
+def test_canonical_url():
+    """Scheme, www, trailing slashes and tracking parameters are ignored."""
+    assert canonical_url("https://www.example.com/a/?utm_source=x") == canonical_url(
+        "http://example.com/a"
+    )
+    assert canonical_url("https://example.com/a?id=1") != canonical_url(
+        "https://example.com/a?id=2"
+    )
+
+
+def test_to_pages_reads_every_engine_format():
+    """Tavily, DuckDuckGo and Brave results are converted to pages."""
+    tavily = [
+        {"type": "page", "title": "t", "url": "https://a.com", "content": "c"},
+        {"type": "image", "image_url": "https://a.com/i.png"},
+    ]
+    pages, images = to_pages(tavily)
+    assert pages == [{"title": "t", "url": "https://a.com", "content": "c"}]
+    assert images == [tavily[1]]
+
+    brave = json.dumps([{"title": "t", "link": "https://b.com", "snippet": "s"}])
+    assert to_pages(brave)[0] == [
+        {"title": "t", "url": "https://b.com", "content": "s"}
+    ]
+    assert to_pages("Arxiv exception: timeout") == ([], [])
+
+
+def test_fuse_results_ranks_pages_found_by_several_engines_first():
+    """Reciprocal rank fusion favors pages ranked well by several engines."""
+    fused = fuse_results(
+        {
+            "a": [_page("https://a.com"), _page("https://shared.com", "short")],
+            "b": [
+                _page("https://www.shared.com/", "much longer"),
+                _page("https://b.com"),
+            ],
+        }
+    )
+    assert [page["url"] for page in fused][0] == "https://shared.com"
+    assert fused[0]["engines"] == ["a", "b"]
+    assert fused[0]["content"] == "much longer"
+    assert len(fused) == 3
+    assert (
+        len(fuse_results({"a": [_page("https://a.com"), _page("https://b.com")]}, 1))
+        == 1
+    )
+
+
+def test_federated_search_drops_slow_and_failing_engines():
+    """Results of engines missing the deadline or failing are left out."""
+
+    def broken(query: str):
+        raise ConnectionError("unreachable")
+
+    tool = FederatedSearch(
+        engines={
+            "fast": _engine("fast", [_page("https://fast.com")]),
+            "slow": _engine("slow", [_page("https://slow.com")], delay=1),
+            "broken": StructuredTool.from_function(broken, name="b", description="b"),
+        },
+        engine_timeout_seconds=0.3,
+    )
+
+    started = time.monotonic()
+    results = tool.invoke({"query": "q"})
+    assert time.monotonic() - started < 0.9
+    assert [page["url"] for page in results] == ["https://fast.com"]
+
+    started = time.monotonic()
+    results = asyncio.run(tool.ainvoke({"query": "q"}))
+    assert time.monotonic() - started < 0.9
+    assert [page["url"] for page in results] == ["https://fast.com"]
@@ -0,0 +1,54 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from src.utils.graph_registry import GraphRegistry, _load
+
+
+def test_graphs_are_compiled_once():
+    built = []
+
+    def build():
+        built.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = GraphRegistry()
+    registry.register("podcast", build)
+    graphs = []
+    threads = [
+        threading.Thread(target=lambda: graphs.append(registry.get("podcast")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert all(graph is graphs[0] for graph in graphs)
+    assert registry.metrics()["podcast"] >= 0.05
+
+
+def test_compile_all():
+    registry = GraphRegistry()
+    registry.register("ppt", object)
+    registry.register("prose", object)
+    assert registry.metrics() == {}
+    assert set(registry.compile_all()) == {"ppt", "prose"}
+    graph = registry.get("ppt")
+    registry.compile_all()
+    assert registry.get("ppt") is graph
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+
+
+def test_load_calls_functions_only():
+    # Functions build the graph, other attributes are the compiled graph
+    assert _load("tempfile:gettempdir")() == tempfile.gettempdir()
+    assert _load("os:sep")() == os.sep
@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.utils import http_client
+
+
+@pytest.fixture
+def mock_transport():
+    """Route the shared clients through a mock transport with a scripted reply."""
+    replies = []
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        reply = replies.pop(0) if replies else 200
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply, json={"ok": reply == 200})
+
+    options = {"transport": httpx.MockTransport(handler)}
+    with (
+        patch.object(http_client, "_client_options", return_value=options),
+        patch.object(http_client, "_retry_delay", return_value=0),
+    ):
+        asyncio.run(http_client.close_http_clients())
+        yield replies, requests
+        asyncio.run(http_client.close_http_clients())
+
+
+def test_retries_transient_errors(mock_transport):
+    """5xx responses and transport errors are retried until success."""
+    replies, requests = mock_transport
+    replies += [503, httpx.ConnectError("refused"), 200]
+    response = http_client.http_request("GET", "https://api.test/search")
+    assert response.status_code == 200
+    assert len(requests) == 3
+
+
+def test_post_requests_are_retried_only_on_request(mock_transport):
+    """A POST may have a side effect, it is sent once unless retries are asked."""
+    replies, requests = mock_transport
+    replies += [503]
+    response = http_client.http_request("POST", "https://api.test/tts", json={})
+    assert response.status_code == 503
+    assert len(requests) == 1
+
+    replies += [503, 200]
+    response = http_client.http_request(
+        "POST", "https://api.test/search", json={}, retries=http_client.max_retries()
+    )
+    assert response.status_code == 200
+    assert len(requests) == 3
+
+
+def test_does_not_retry_client_errors(mock_transport):
+    """A 4xx response other than 429 is returned as is."""
+    replies, requests = mock_transport
+    replies += [400]
+    response = http_client.http_request("GET", "https://api.test/")
+    assert response.status_code == 400
+    assert len(requests) == 1
+
+
+def test_gives_up_after_max_retries(mock_transport):
+    """The last transport error is raised once the retries are exhausted."""
+    replies, requests = mock_transport
+    replies += [httpx.ConnectError("refused")] * 3
+    with pytest.raises(httpx.ConnectError):
+        http_client.http_request("GET", "https://api.test/", retries=2)
+    assert len(requests) == 3
+
+
+def test_async_requests_share_one_client(mock_transport):
+    """Concurrent async requests reuse the same pooled client."""
+    replies, requests = mock_transport
+
+    async def run():
+        clients = set()
+        for _ in range(3):
+            clients.add(id(http_client.get_async_http_client()))
+        responses = await asyncio.gather(
+            *(
+                http_client.async_http_request("GET", "https://api.test/")
+                for _ in range(5)
+            )
+        )
+        assert len(clients) == 1
+        assert all(response.status_code == 200 for response in responses)
+
+    asyncio.run(run())
+    assert len(requests) == 5
+
+
+def test_every_event_loop_has_its_own_client(mock_transport):
+    """A client is bound to its loop and closed when the loop shuts down."""
+    clients = []
+
+    async def run():
+        clients.append(http_client.get_async_http_client())
+        assert http_client.get_async_http_client() is clients[-1]
+        response = await http_client.async_http_request("GET", "https://api.test/")
+        assert response.status_code == 200
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+    assert not http_client._async_clients
+
+
+def test_closes_the_clients_of_other_loops(mock_transport):
+    """Shutting down closes the clients of loops running in other threads."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+
+        async def get_client():
+            return http_client.get_async_http_client()
+
+        client = asyncio.run_coroutine_threadsafe(get_client(), loop).result()
+        asyncio.run(http_client.close_http_clients())
+        assert client.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+
+from src.utils.import_profile import parse_importtime, profile_import
+
+# Loaded on first use only: LLM clients, search tools, MCP clients, numpy
+HEAVY_MODULES = [
+    "langchain_openai",
+    "langchain_community",
+    "langchain_experimental",
+    "langchain_mcp_adapters",
+    "mcp",
+    "numpy",
+    "src.graph",
+    "src.llms.llm",
+]
+
+# Generous, the import takes about 4s on a laptop; IMPORT_TIME_BUDGET_MS overrides it
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS") or 20000)
+
+
+def test_parse_importtime():
+    report = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   json.decoder",
+            "import time:       300 |        420 | json",
+            "Traceback (most recent call last):",
+        ]
+    )
+    imported = parse_importtime(report)
+    assert [(m.name, m.self_us, m.cumulative_us, m.depth) for m in imported] == [
+        ("json.decoder", 120, 120, 1),
+        ("json", 300, 420, 0),
+    ]
+
+
+def test_profile_import():
+    profile = profile_import("json")
+    assert profile.total_ms > 0
+    assert "json.decoder" in profile.loaded
+    assert "json" not in [m.name for m in profile.slowest()]
+    assert profile.loaded_of(["json", "numpy"]) == ["json"]
+
+
+def test_api_server_imports_lazily():
+    profile = profile_import("src.server.app")
+    assert profile.loaded_of(HEAVY_MODULES) == []
+    assert profile.total_ms < BUDGET_MS, profile.report(10)
+
+
+def test_llms_are_created_on_first_use():
+    # `basic_llm` no longer creates the client, nor reads conf.yaml, at import
+    profile = profile_import("src.llms.llm")
+    assert profile.loaded_of(["langchain_openai"]) == []
@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.jobs import JobArtifact, JobQueue, JobStatus, QueueFull
+
+
+def _artifact(directory, content=b"audio"):
+    path = directory / "out.mp3"
+    path.write_bytes(content)
+    return JobArtifact(path, "audio/mp3", "out.mp3")
+
+
+async def _wait_finished(queue, job):
+    statuses = []
+    async for snapshot in queue.watch(job.id):
+        statuses.append(snapshot["status"])
+    return statuses
+
+
+def test_sync_job_runs_off_the_event_loop(tmp_path):
+    threads = []
+
+    def generate(directory):
+        threads.append(threading.current_thread())
+        time.sleep(0.2)
+        return _artifact(directory)
+
+    async def main():
+        queue = JobQueue(workers=1, directory=tmp_path)
+        job = queue.submit("podcast", generate)
+        # The event loop keeps running while the job blocks its thread
+        ticks = 0
+        while not job.finished:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await queue.close()
+        return job, ticks
+
+    job, ticks = asyncio.run(main())
+    assert ticks > 5
+    assert threads[0] is not threading.main_thread()
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.artifact.path.read_bytes() == b"audio"
+    assert job.artifact.path.parent == tmp_path / job.id
+    assert job.snapshot()["artifact"] == "out.mp3"
+
+
+def test_watch_streams_status_changes(tmp_path):
+    async def generate(directory):
+        await asyncio.sleep(0.05)
+        return _artifact(directory)
+
+    async def main():
+        queue = JobQueue(workers=1, directory=tmp_path)
+        job = queue.submit("ppt", generate)
+        statuses = await _wait_finished(queue, job)
+        await queue.close()
+        return statuses
+
+    assert asyncio.run(main()) == ["queued", "running", "succeeded"]
+
+
+def test_workers_and_queue_depth_are_bounded(tmp_path):
+    running = []
+    peak = []
+
+    async def generate(directory):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.pop()
+        return _artifact(directory)
+
+    async def main():
+        queue = JobQueue(workers=2, max_queued=3, directory=tmp_path)
+        jobs = [queue.submit("podcast", generate) for _ in range(3)]
+        with pytest.raises(QueueFull):
+            queue.submit("podcast", generate)
+        assert queue.stats()["queued"] == 3
+        for job in jobs:
+            await _wait_finished(queue, job)
+        stats = queue.stats()
+        await queue.close()
+        return jobs, stats
+
+    jobs, stats = asyncio.run(main())
+    assert max(peak) == 2
+    assert all(job.status == JobStatus.SUCCEEDED for job in jobs)
+    assert stats["jobs"]["succeeded"] == 3 and stats["queued"] == 0
+
+
+def test_failed_timed_out_and_cancelled_jobs(tmp_path):
+    def fail(directory):
+        raise RuntimeError("marp not found")
+
+    async def slow(directory):
+        await asyncio.sleep(10)
+
+    async def main():
+        queue = JobQueue(workers=1, timeout_seconds=0.1, directory=tmp_path)
+        failed = queue.submit("ppt", fail)
+        timed_out = queue.submit("podcast", slow)
+        cancelled = queue.submit("podcast", slow)
+        queue.cancel(cancelled.id)
+        for job in (failed, timed_out, cancelled):
+            await _wait_finished(queue, job)
+
+        queue.timeout_seconds = 10
+        stopped = queue.submit("podcast", slow)
+        while stopped.status != JobStatus.RUNNING:
+            await asyncio.sleep(0.01)
+        queue.cancel(stopped.id)
+        await _wait_finished(queue, stopped)
+        await queue.close()
+        return failed, timed_out, cancelled, stopped
+
+    failed, timed_out, cancelled, stopped = asyncio.run(main())
+    assert failed.status == JobStatus.FAILED
+    assert failed.error == "marp not found"
+    assert timed_out.status == JobStatus.TIMED_OUT
+    assert cancelled.status == JobStatus.CANCELLED
+    assert cancelled.started_at is None
+    assert stopped.status == JobStatus.CANCELLED
+    assert stopped.started_at is not None
+
+
+def test_finished_jobs_are_purged(tmp_path):
+    async def main():
+        queue = JobQueue(workers=1, directory=tmp_path, retention_seconds=0)
+        job = queue.submit("podcast", _artifact)
+        await _wait_finished(queue, job)
+        assert (tmp_path / job.id).exists()
+        await asyncio.sleep(0.01)
+        queue.submit("podcast", _artifact)
+        await queue.close()
+        return queue, job
+
+    queue, job = asyncio.run(main())
+    assert queue.get(job.id) is None
+    assert not (tmp_path / job.id).exists()
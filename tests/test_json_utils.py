@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from src.utils.json_utils import StreamingJSONParser
+
+PLAN = {
+    "locale": "en-US",
+    "has_enough_context": False,
+    "thought": 'Braces {and} brackets [inside] "strings"',
+    "title": "Plan",
+    "steps": [
+        {"title": "S1", "description": "d}", "depends_on": []},
+        {"title": "S2", "description": "d", "depends_on": [1], "meta": {"a": [1]}},
+    ],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 10_000])
+def test_streaming_parser_yields_each_item_once_closed(chunk_size):
+    """Array items and fields are parsed whatever the chunk boundaries are."""
+    text = "```json\n" + json.dumps(PLAN, indent=2) + "\n```"
+    parser = StreamingJSONParser("steps")
+    items = []
+    for start in range(0, len(text), chunk_size):
+        items += parser.feed(text[start : start + chunk_size])
+    assert items == PLAN["steps"]
+    assert parser.partial == PLAN
+
+
+def test_streaming_parser_reports_steps_before_the_end():
+    """A step is available as soon as its closing brace is received."""
+    text = json.dumps(PLAN)
+    first_step_end = text.index('"S2"')
+    parser = StreamingJSONParser("steps")
+    assert parser.feed(text[:first_step_end]) == [PLAN["steps"][0]]
+    assert parser.partial == {
+        "locale": "en-US",
+        "has_enough_context": False,
+        "thought": PLAN["thought"],
+        "title": "Plan",
+        "steps": [PLAN["steps"][0]],
+    }
+
+
+def test_streaming_parser_ignores_empty_chunks():
+    text = json.dumps(PLAN)
+    parser = StreamingJSONParser("steps")
+    items = []
+    for char in text:
+        items += parser.feed("") + parser.feed(char)
+    assert items == PLAN["steps"]
+    assert parser.partial == PLAN
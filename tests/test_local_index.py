@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_core.tools import BaseTool
+
+import src.tools.local_index as local_index
+from src.tools.local_index import (
+    HashingEmbeddings,
+    LocalIndex,
+    create_indexed_tool,
+    local_retrieve_tool,
+)
+
+SOLAR = "Solar panel efficiency reached 24 percent in commercial modules."
+WIND = "Offshore wind turbines now exceed 15 megawatts of capacity."
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(local_index, "_local_index", None)
+    return local_index.get_local_index()
+
+
+def test_hashing_embeddings_are_normalized_and_deterministic():
+    """Vectors have unit length and similar texts are closest."""
+    embeddings = HashingEmbeddings()
+    solar, wind, query = embeddings.embed_documents(
+        [SOLAR, WIND, "solar panel efficiency"]
+    )
+    assert np.linalg.norm(solar) == pytest.approx(1.0)
+    assert solar == HashingEmbeddings().embed_query(SOLAR)
+    assert np.dot(query, solar) > np.dot(query, wind)
+
+
+def test_search_returns_the_most_similar_passages(tmp_path):
+    """Passages are ranked by similarity to the query."""
+    index = LocalIndex(str(tmp_path))
+    index.add("https://a.com/solar", "Solar", SOLAR)
+    index.add("https://b.com/wind", "Wind", WIND)
+    results = index.search("how large are offshore wind turbines", k=1)
+    assert [(r.url, r.content) for r in results] == [("https://b.com/wind", WIND)]
+    assert index.search("completely unrelated zebra") == []
+
+
+def test_index_is_persisted(tmp_path):
+    """A new index loads the pages indexed by a previous one."""
+    LocalIndex(str(tmp_path)).add("https://a.com/solar", "Solar", SOLAR)
+    reloaded = LocalIndex(str(tmp_path))
+    assert reloaded.stats()["documents"] == 1
+    assert reloaded.search("solar efficiency")[0].title == "Solar"
+
+
+def test_crawled_pages_are_not_replaced_by_search_snippets(tmp_path):
+    """Full crawled pages win over search results for the same URL."""
+    index = LocalIndex(str(tmp_path))
+    assert index.add("https://a.com/solar", "Solar", SOLAR, source="crawl") == 1
+    assert index.add("https://a.com/solar", "Solar", "snippet") == 0
+    assert index.add("https://a.com/solar", "Solar", SOLAR, source="crawl") == 0
+    assert index.search("solar")[0].content == SOLAR
+
+
+def test_oldest_pages_are_dropped(tmp_path):
+    """Beyond max_documents the oldest pages leave the index and the disk."""
+    index = LocalIndex(str(tmp_path), max_documents=2)
+    for i in range(3):
+        index.add(f"https://a.com/{i}", str(i), f"page number {i} {SOLAR}")
+    assert index.stats()["documents"] == 2
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+    assert {r.url for r in index.search("page number", k=5)} == {
+        "https://a.com/1",
+        "https://a.com/2",
+    }
+    index.clear()
+    assert list(tmp_path.glob("*.npz")) == []
+
+
+def test_search_results_are_indexed_and_retrievable(index):
+    """Results of indexed search tools are served by local_retrieve_tool."""
+
+    class FakeSearch(BaseTool):
+        name: str = "web_search"
+        description: str = "search"
+
+        def _run(self, query: str) -> list[dict]:
+            return [{"title": "Wind", "url": "https://b.com/wind", "content": WIND}]
+
+    search = create_indexed_tool(FakeSearch)()
+    search.invoke({"query": "wind"})
+    asyncio.run(search.ainvoke({"query": "wind"}))
+    assert index.stats()["documents"] == 1
+
+    [result] = local_retrieve_tool.invoke({"query": "offshore turbines"})
+    assert result["url"] == "https://b.com/wind"
+    assert WIND in result["content"]
+
+
+def test_local_retrieve_tool_when_disabled(monkeypatch):
+    monkeypatch.setenv("LOCAL_INDEX_MAX_DOCUMENTS", "0")
+    assert local_retrieve_tool.invoke({"query": "x"}) == "The local index is disabled."
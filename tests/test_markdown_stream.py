@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from markdownify import markdownify as md
+
+from src.crawler.article import Article
+from src.crawler.extraction import ExtractionService
+from src.crawler.markdown_stream import iter_markdown, split_images, take
+
+CORPUS = Path(__file__).parents[1] / "benchmarks" / "extraction" / "corpus"
+
+HTML = """<!DOCTYPE html><!-- comment -->
+<div><p>Intro <b>bold</b> text.</p>Loose text<img src="a.png" alt="A">
+<h2>Section</h2><ul><li>one</li><li>two<ul><li>nested</li></ul></li></ul>
+<div>Inner <i>text</i></div>
+<section><p>More</p><pre>code\n  indented</pre>
+<table><tr><th>h</th></tr><tr><td>1</td></tr></table></section>
+<p>End <img src="/img/b.png" alt="B"> here.</p></div>"""
+
+
+def _normalized(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def test_blocks_match_markdownify():
+    blocks = list(iter_markdown(HTML))
+    assert blocks[0] == "Intro **bold** text."
+    assert blocks[1] == "Loose text![A](a.png)"
+    assert "comment" not in "".join(blocks)
+    assert "\n\n".join(blocks) == md(HTML).strip()
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS.glob("*.html")), ids=lambda p: p.stem)
+def test_blocks_match_markdownify_on_corpus(path):
+    html = path.read_text("utf-8")
+    assert _normalized("\n\n".join(iter_markdown(html))) == _normalized(md(html))
+
+
+def test_take_stops_converting_at_the_budget():
+    converted = []
+
+    def blocks():
+        for block in ("first block", "second block", "third block"):
+            converted.append(block)
+            yield block
+
+    assert list(take(blocks(), 20)) == ["first block", "second"]
+    assert converted == ["first block", "second block"]
+    assert list(take(["first block"], 11)) == ["first block"]
+    assert list(take(["first block", "second"], None)) == ["first block", "second"]
+
+
+def test_split_images():
+    assert list(split_images("a ![x](1.png) b ![](2.png)")) == [
+        ("text", "a "),
+        ("image", "1.png"),
+        ("text", " b "),
+        ("image", "2.png"),
+        ("text", ""),
+    ]
+
+
+def test_article_to_markdown_with_budget():
+    article = Article("Title", HTML)
+    full = article.to_markdown()
+    assert full.startswith("# Title\n\nIntro **bold** text.")
+    assert article.to_markdown(including_title=False) == md(HTML).strip()
+
+    budgeted = Article("Title", HTML).to_markdown(max_chars=40)
+    assert len(budgeted) <= 40
+    assert full.startswith(budgeted)
+
+
+def test_article_to_markdown_stops_converting_early():
+    article = Article("Title", HTML)
+    with patch(
+        "src.crawler.markdown_stream.StreamingMarkdownConverter.process_tag",
+        autospec=True,
+        side_effect=lambda self, node, **kwargs: node.get_text(),
+    ) as process_tag:
+        article.to_markdown(max_chars=20)
+    assert process_tag.call_count == 1
+
+
+def test_article_to_message():
+    article = Article("Title", HTML)
+    article.url = "https://example.com/page/"
+    message = article.to_message()
+    assert [part["type"] for part in message] == [
+        "text",
+        "image_url",
+        "text",
+        "image_url",
+        "text",
+    ]
+    assert message[0]["text"] == "# Title\n\nIntro **bold** text.\n\nLoose text"
+    assert message[1]["image_url"]["url"] == "https://example.com/page/a.png"
+    assert message[3]["image_url"]["url"] == "https://example.com/img/b.png"
+    assert message[4]["text"] == "here."
+
+    short = article.to_message(max_chars=30)
+    assert [part["type"] for part in short] == ["text"]
+
+
+def test_extraction_service_caps_markdown():
+    service = ExtractionService(workers=0, extractor="fast", max_markdown_chars=60)
+    article = service.extract(f"<html><body>{HTML}</body></html>", "https://e.com")
+    assert 0 < len(article.to_markdown(including_title=False)) <= 60
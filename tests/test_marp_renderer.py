@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.ppt.renderer import MarpRenderer, RenderError
+
+# Stands in for the Marp CLI: `fake_marp deck.md -o deck.pptx` converts once,
+# `fake_marp --server dir` serves `GET /deck.md?pptx`. The pptx is the pid of
+# the process followed by the markdown; markdown containing "broken" fails.
+FAKE_MARP = textwrap.dedent("""
+    import os, sys
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from pathlib import Path
+
+    def convert(markdown):
+        if "broken" in markdown:
+            return None
+        return f"{os.getpid()}:{markdown}".encode()
+
+    if sys.argv[1] == "--server":
+        directory = Path(sys.argv[2])
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                name, _, query = self.path.lstrip("/").partition("?")
+                pptx = convert((directory / name).read_text())
+                self.send_response(200 if pptx and query == "pptx" else 500)
+                self.end_headers()
+                self.wfile.write(pptx or b"")
+
+        HTTPServer(("127.0.0.1", int(os.environ["PORT"])), Handler).serve_forever()
+    else:
+        pptx = convert(Path(sys.argv[1]).read_text())
+        if pptx is None:
+            sys.exit(1)
+        Path(sys.argv[3]).write_bytes(pptx)
+    """)
+
+
+@pytest.fixture
+def fake_marp(tmp_path):
+    script = tmp_path / "fake_marp.py"
+    script.write_text(FAKE_MARP)
+    return [sys.executable, str(script)]
+
+
+@pytest.fixture
+def make_renderer(fake_marp, tmp_path):
+    renderers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("cache_dir", tmp_path / "cache")
+        renderer = MarpRenderer(command=fake_marp, timeout_seconds=20, **kwargs)
+        renderers.append(renderer)
+        return renderer
+
+    yield make
+    for renderer in renderers:
+        renderer.close()
+
+
+def _pid(pptx: bytes) -> int:
+    return int(pptx.split(b":", 1)[0])
+
+
+def test_render_once(make_renderer):
+    renderer = make_renderer(workers=0)
+    pptx = renderer.render("# Slide")
+    assert pptx.endswith(b":# Slide")
+    assert _pid(pptx) != os.getpid()
+    # The temporary files are gone
+    assert list(renderer.temp_dir.iterdir()) == []
+    with pytest.raises(RenderError):
+        renderer.render("# broken")
+    assert list(renderer.temp_dir.iterdir()) == []
+
+
+def test_warm_server_is_reused(make_renderer):
+    renderer = make_renderer(workers=1, cache_max_entries=0)
+    first = renderer.render("# One")
+    second = renderer.render("# Two")
+    assert first.endswith(b":# One") and second.endswith(b":# Two")
+    assert _pid(first) == _pid(second)
+    # Decks are removed from the served directory once rendered
+    served = [p for p in renderer.temp_dir.rglob("*") if p.is_file()]
+    assert served == []
+
+
+def test_failed_deck_keeps_the_server(make_renderer):
+    renderer = make_renderer(workers=1, cache_max_entries=0)
+    first = renderer.render("# One")
+    with pytest.raises(RenderError):
+        renderer.render("# broken")
+    assert _pid(renderer.render("# Two")) == _pid(first)
+
+
+def test_dead_server_is_restarted(make_renderer):
+    renderer = make_renderer(workers=1, cache_max_entries=0)
+    first = renderer.render("# One")
+    os.kill(_pid(first), 9)
+    os.waitpid(_pid(first), 0)
+    second = renderer.render("# Two")
+    assert second.endswith(b":# Two")
+    assert _pid(second) != _pid(first)
+
+
+def test_rendered_decks_are_cached(make_renderer, tmp_path):
+    renderer = make_renderer(workers=0, cache_max_entries=2)
+    first = renderer.render("# One")
+    assert renderer.render("# One") == first
+    assert len(list((tmp_path / "cache").glob("*.pptx"))) == 1
+
+    renderer.render("# Two")
+    renderer.render("# Three")
+    # The least recently used deck was evicted and is rendered again
+    assert len(list((tmp_path / "cache").glob("*.pptx"))) == 2
+    assert renderer.render("# One") != first
+
+
+def test_empty_or_evicted_cache_entries_are_misses(make_renderer, tmp_path):
+    renderer = make_renderer(workers=0, cache_max_entries=2)
+    first = renderer.render("# One")
+    (deck,) = (tmp_path / "cache").glob("*.pptx")
+    deck.write_bytes(b"")
+    second = renderer.render("# One")
+    assert second.endswith(b":# One") and second != first
+
+    # A deck evicted while it is read is a miss, and is not left empty
+    read_bytes = Path.read_bytes
+
+    def evicted_while_read(path):
+        if path != deck:
+            return read_bytes(path)
+        pptx = read_bytes(path)
+        path.unlink()
+        return pptx
+
+    with patch.object(Path, "read_bytes", evicted_while_read):
+        third = renderer.render("# One")
+    assert third.endswith(b":# One") and third != second
+    assert deck.read_bytes() == third
+
+
+def test_missing_marp(tmp_path):
+    renderer = MarpRenderer(
+        command=["definitely-not-marp"],
+        workers=1,
+        cache_dir=tmp_path,
+        timeout_seconds=5,
+    )
+    with pytest.raises(RenderError, match="Failed to start"):
+        renderer.render("# Slide")
+    renderer.close()
+    assert not renderer.temp_dir.exists()
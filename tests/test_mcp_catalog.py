@@ -0,0 +1,97 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from src.utils.mcp_catalog import MCPToolCatalog
+
+CONNECTION = {"transport": "stdio", "command": "npx", "args": ["server"], "env": None}
+
+
+class FakeLoader:
+    def __init__(self, tools=None, delay=0):
+        self.calls = 0
+        self.tools = [{"name": "echo"}] if tools is None else tools
+        self.delay = delay
+
+    async def __call__(self, connection, timeout_seconds):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.tools
+
+
+def test_catalog_is_cached_per_server_config():
+    """A second lookup is served from the cache; another config is loaded."""
+    loader = FakeLoader()
+    catalog = MCPToolCatalog(loader)
+
+    async def run():
+        assert await catalog.get_tools(CONNECTION) == [{"name": "echo"}]
+        await catalog.get_tools(dict(CONNECTION))
+        assert loader.calls == 1
+        await catalog.get_tools({**CONNECTION, "args": ["other"]})
+        assert loader.calls == 2
+
+    asyncio.run(run())
+
+
+def test_catalog_expires_and_can_be_invalidated():
+    """Expired, invalidated or refreshed entries are loaded again."""
+    loader = FakeLoader()
+
+    async def run():
+        catalog = MCPToolCatalog(loader, ttl_seconds=0)
+        await catalog.get_tools(CONNECTION)
+        await catalog.get_tools(CONNECTION)
+        assert loader.calls == 2
+
+        catalog = MCPToolCatalog(loader)
+        await catalog.get_tools(CONNECTION)
+        catalog.invalidate(CONNECTION)
+        await catalog.get_tools(CONNECTION)
+        await catalog.get_tools(CONNECTION, refresh=True)
+        assert loader.calls == 5
+
+    asyncio.run(run())
+
+
+def test_concurrent_lookups_share_one_load():
+    """Identical requests made while a load is running do not start another."""
+    loader = FakeLoader(delay=0.1)
+    catalog = MCPToolCatalog(loader)
+
+    async def run():
+        results = await asyncio.gather(
+            *(catalog.get_tools(CONNECTION) for _ in range(5))
+        )
+        assert loader.calls == 1
+        assert all(result == [{"name": "echo"}] for result in results)
+
+    asyncio.run(run())
+
+
+def test_failed_loads_are_not_cached():
+    """An empty tool list (failed load) is retried on the next request."""
+    loader = FakeLoader(tools=[])
+    catalog = MCPToolCatalog(loader)
+
+    async def run():
+        await catalog.get_tools(CONNECTION)
+        await catalog.get_tools(CONNECTION)
+        assert loader.calls == 2
+
+    asyncio.run(run())
+
+
+def test_catalog_survives_restart_when_persisted(tmp_path):
+    """A persisted catalog is reloaded by a new instance."""
+    cache_path = tmp_path / "catalog.json"
+    loader = FakeLoader()
+
+    async def run():
+        await MCPToolCatalog(loader, cache_path=cache_path).get_tools(CONNECTION)
+        restarted = MCPToolCatalog(loader, cache_path=cache_path)
+        assert await restarted.get_tools(CONNECTION) == [{"name": "echo"}]
+        assert loader.calls == 1
+
+    asyncio.run(run())
@@ -0,0 +1,151 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+import signal
+import sys
+import textwrap
+
+import pytest
+
+from src.utils.mcp_pool import MCPClientPool, _PooledServer, server_config_key
+
+ECHO_SERVER = textwrap.dedent('''
+    import os
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("echo")
+
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        """Echo the text back, prefixed by the server pid."""
+        return f"{os.getpid()}:{text}"
+
+
+    if __name__ == "__main__":
+        mcp.run()
+    ''')
+
+
+@pytest.fixture
+def echo_connection(tmp_path):
+    server_path = tmp_path / "echo_server.py"
+    server_path.write_text(ECHO_SERVER)
+    return {"transport": "stdio", "command": sys.executable, "args": [str(server_path)]}
+
+
+def _pid(result: str) -> int:
+    return int(result.split(":")[0])
+
+
+def test_server_config_key_ignores_non_connection_fields(echo_connection):
+    """Only the connection fields identify a pooled server."""
+    with_agent_settings = {
+        **echo_connection,
+        "enabled_tools": ["echo"],
+        "add_to_agents": ["researcher"],
+    }
+    assert server_config_key(echo_connection) == server_config_key(with_agent_settings)
+    assert server_config_key(echo_connection) != server_config_key(
+        {**echo_connection, "env": {"DEBUG": "1"}}
+    )
+
+
+def test_sse_servers_keep_their_headers_and_timeouts():
+    """An authenticated SSE server connects with its headers and timeouts."""
+    connection = {
+        "transport": "sse",
+        "url": "https://mcp.test/sse",
+        "headers": {"Authorization": "Bearer token"},
+        "timeout": 10,
+        "sse_read_timeout": 300,
+        "enabled_tools": ["search"],
+    }
+    server = _PooledServer("search", connection)
+    assert server.connection == {
+        key: value for key, value in connection.items() if key != "enabled_tools"
+    }
+    assert server_config_key(connection) != server_config_key(
+        {**connection, "headers": {"Authorization": "Bearer other"}}
+    )
+
+
+def test_pool_reuses_warm_server(echo_connection):
+    """Tools fetched twice are served by the same server process."""
+
+    async def run():
+        pool = MCPClientPool()
+        try:
+            first = await pool.get_tools({"echo": echo_connection})
+            second = await pool.get_tools({"echo": echo_connection})
+            assert len(pool) == 1
+            assert first[0] is not second[0]
+            result_1 = await first[0].ainvoke({"text": "a"})
+            result_2 = await second[0].ainvoke({"text": "b"})
+            assert _pid(result_1) == _pid(result_2)
+            assert result_2.endswith(":b")
+        finally:
+            await pool.close()
+        assert len(pool) == 0
+
+    asyncio.run(run())
+
+
+def test_pool_restarts_dead_server(echo_connection):
+    """A tool call on a killed server restarts it and retries."""
+
+    async def run():
+        pool = MCPClientPool()
+        try:
+            (tool,) = await pool.get_tools({"echo": echo_connection})
+            old_pid = _pid(await tool.ainvoke({"text": "a"}))
+            os.kill(old_pid, signal.SIGKILL)
+            await asyncio.sleep(0.5)
+            result = await asyncio.wait_for(tool.ainvoke({"text": "b"}), 30)
+            assert _pid(result) != old_pid
+            assert result.endswith(":b")
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_pool_evicts_idle_servers(echo_connection):
+    """Servers unused for longer than the idle TTL are closed."""
+
+    async def run():
+        pool = MCPClientPool(idle_ttl_seconds=0)
+        try:
+            await pool.get_tools({"echo": echo_connection})
+            assert len(pool) == 1
+            await pool.evict_idle()
+            assert len(pool) == 0
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_pool_skips_servers_that_fail_to_start(echo_connection):
+    """A broken server does not prevent the others from being used."""
+
+    async def run():
+        pool = MCPClientPool(startup_timeout_seconds=10)
+        try:
+            tools = await pool.get_tools(
+                {
+                    "echo": echo_connection,
+                    "broken": {
+                        "transport": "stdio",
+                        "command": sys.executable,
+                        "args": ["-c", "raise SystemExit(1)"],
+                    },
+                }
+            )
+            assert [tool.name for tool in tools] == ["echo"]
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
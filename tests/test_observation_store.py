@@ -0,0 +1,105 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.utils.observation_store import ObservationStore
+from src.utils.text_budget import (
+    bm25_scores,
+    estimate_tokens,
+    select_passages,
+    split_passages,
+    truncate_to_tokens,
+)
+
+
+def _finding(topic, paragraphs=10):
+    return "\n\n".join(
+        f"Paragraph {i} about {topic}. " + "Filler sentence. " * 20
+        for i in range(paragraphs)
+    )
+
+
+def test_estimate_tokens():
+    """Latin text counts about four characters per token, CJK one per character."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("深度研究") == 4
+
+
+def test_truncate_and_split_respect_the_budget():
+    """Truncated text and passages stay within their token limit."""
+    text = _finding("solar power")
+    assert estimate_tokens(truncate_to_tokens(text, 50, "")) <= 50
+    passages = split_passages(text, 120)
+    assert len(passages) > 1
+    assert all(estimate_tokens(passage) <= 120 for passage in passages)
+    assert split_passages("x" * 1000, 100)[0] == "x" * 400
+
+
+def test_bm25_prefers_matching_passages():
+    """Passages sharing rare query terms score highest."""
+    scores = bm25_scores(
+        "battery storage costs",
+        ["wind turbines", "battery storage costs fell", "costs of solar"],
+    )
+    assert scores.index(max(scores)) == 1
+    assert scores[0] == 0
+
+
+def test_select_passages_keeps_the_opening_and_relevant_sections():
+    """Passages of sections matching the query are kept, in text order."""
+    text = "# Energy report\n\nIntro paragraph.\n\n" + "\n\n".join(
+        f"## {topic}\n\n{_finding(topic, 3)}"
+        for topic in ("Solar", "Wind", "Storage", "Grid")
+    )
+    selected = select_passages(text, "wind", 300, passage_tokens=100)
+    assert estimate_tokens(selected) <= 320
+    assert selected.startswith("# Energy report")
+    assert "about Wind" in selected
+    assert "about Grid" not in selected
+    assert "[...]" in selected
+    assert select_passages("short", "wind", 300) == "short"
+
+    # Without a query the leading passages are kept, cut at passage boundaries
+    leading = select_passages(text, "", 300, passage_tokens=100)
+    assert leading.startswith("# Energy report")
+    assert leading.endswith("[...]")
+
+
+def test_select_keeps_small_findings_whole():
+    """Findings within the budget are passed unchanged."""
+    store = ObservationStore([("a", "first"), ("b", "second")])
+    views = store.select("anything", 1000)
+    assert [(view.content, view.complete) for view in views] == [
+        ("first", True),
+        ("second", True),
+    ]
+
+
+def test_select_fits_budget_and_keeps_relevant_passages():
+    """Large findings keep their opening and the passages relevant to the task."""
+    findings = [("solar", _finding("solar")), ("wind", _finding("wind"))]
+    findings[1] = ("wind", findings[1][1] + "\n\nTurbine maintenance budgets grew.")
+    store = ObservationStore(findings, passage_tokens=100)
+    assert store.total_tokens > 1000
+
+    views = store.select("turbine maintenance", 500)
+    assert sum(estimate_tokens(view.content) for view in views) <= 520
+    assert not any(view.complete for view in views)
+    assert all(view.content.startswith("Paragraph 0") for view in views)
+    assert "Turbine maintenance budgets grew." in views[1].content
+    assert "[...]" in views[0].content
+
+
+def test_findings_are_paged_through_the_tool():
+    """The read_findings tool lists findings and returns their pages."""
+    store = ObservationStore.from_observations([_finding("solar"), "short"])
+    tool = store.as_tool(page_tokens=200)
+    assert tool.invoke({}).splitlines() == [
+        "1. Finding 1 (5 page(s))",
+        "2. Finding 2 (1 page(s))",
+    ]
+    first_page = tool.invoke({"finding": 1, "page": 1})
+    assert first_page.startswith("# Finding 1 (page 1 of 5)")
+    assert "Paragraph 0 about solar" in first_page
+    assert tool.invoke({"finding": 1, "page": 6}) == "Finding 1 has 5 page(s)."
+    assert tool.invoke({"finding": 3}).startswith("There is no finding 3")
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from pydantic import ValidationError
+
+from src.prompts.planner_model import Plan
+
+
+def _make_plan(*step_types, executed=()):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="Test thought",
+        title="Test Plan",
+        steps=[
+            {
+                "need_web_search": step_type == "research",
+                "title": f"Step {i}",
+                "description": f"Description {i}",
+                "step_type": step_type,
+                "execution_res": f"Result {i}" if i in executed else None,
+            }
+            for i, step_type in enumerate(step_types)
+        ],
+    )
+
+
+def test_next_step_batch_sequential_by_default():
+    """Without a concurrency cap above one, steps run one at a time."""
+    plan = _make_plan("research", "research", "research")
+    assert plan.next_step_batch() == [0]
+
+
+def test_next_step_batch_fans_out_research_steps():
+    """Independent research steps are batched up to the concurrency cap."""
+    plan = _make_plan("research", "research", "research", "research")
+    assert plan.next_step_batch(3) == [0, 1, 2]
+    assert plan.next_step_batch(10) == [0, 1, 2, 3]
+
+
+def test_next_step_batch_processing_step_runs_alone():
+    """Processing steps wait for earlier findings and never share a batch."""
+    plan = _make_plan("research", "research", "processing", "research")
+    assert plan.next_step_batch(5) == [0, 1]
+
+    plan = _make_plan("research", "research", "processing", "research", executed=(0, 1))
+    assert plan.next_step_batch(5) == [2]
+
+
+def test_next_step_batch_skips_executed_steps():
+    """Executed steps are skipped and an empty batch means the plan is done."""
+    plan = _make_plan("research", "research", "research", executed=(0,))
+    assert plan.next_step_batch(2) == [1, 2]
+
+    plan = _make_plan("research", "processing", executed=(0, 1))
+    assert plan.next_step_batch(2) == []
+
+
+def _make_dag_plan(dependencies, executed=()):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="Test thought",
+        title="Test Plan",
+        steps=[
+            {
+                "need_web_search": True,
+                "title": f"Step {step_id}",
+                "description": f"Description {step_id}",
+                "step_type": "research",
+                "id": step_id,
+                "depends_on": depends_on,
+                "execution_res": f"Result {step_id}" if step_id in executed else None,
+            }
+            for step_id, depends_on in dependencies.items()
+        ],
+    )
+
+
+def test_step_ids_default_to_position():
+    """Steps without an id are numbered by their position in the plan."""
+    plan = _make_plan("research", "processing")
+    assert [step.id for step in plan.steps] == [1, 2]
+
+
+def test_next_step_batch_runs_topological_waves():
+    """Steps become ready once every declared dependency has been executed."""
+    dependencies = {1: [], 2: [], 3: [1], 4: [1, 2]}
+    assert _make_dag_plan(dependencies).next_step_batch(4) == [0, 1]
+    assert _make_dag_plan(dependencies, executed=(1,)).next_step_batch(4) == [1, 2]
+    assert _make_dag_plan(dependencies, executed=(1, 2)).next_step_batch(4) == [2, 3]
+
+
+def test_context_steps_only_include_dependencies():
+    """Declared dependencies limit the findings shared with a step."""
+    plan = _make_dag_plan({1: [], 2: [], 3: [2]}, executed=(1, 2))
+    assert [step.id for step in plan.context_steps(plan.steps[2])] == [2]
+
+    plan = _make_plan("research", "research", "processing", executed=(0, 1))
+    assert [step.id for step in plan.context_steps(plan.steps[2])] == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "dependencies",
+    [
+        {1: [2], 2: [1]},
+        {1: [], 2: [2]},
+        {1: [], 2: [3]},
+    ],
+)
+def test_invalid_step_dependencies_are_rejected(dependencies):
+    """Cycles, self references and unknown ids fail validation."""
+    with pytest.raises(ValidationError):
+        _make_dag_plan(dependencies)
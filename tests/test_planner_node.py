@@ -0,0 +1,160 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.types import Command
+
+from src.graph.nodes import _collect_early_steps, planner_node
+
+
+class FakeLLM:
+    """Streams a planner response in small chunks."""
+
+    def __init__(self, response: str, events: list):
+        self.response = response
+        self.events = events
+
+    async def astream(self, messages):
+        for start in range(0, len(self.response), 16):
+            await asyncio.sleep(0.005)
+            yield AIMessageChunk(content=self.response[start : start + 16], id="run")
+        self.events.append("plan complete")
+
+
+class FakeAgent:
+    def __init__(self, events: list):
+        self.events = events
+
+    async def ainvoke(self, input, config=None):
+        task = input["messages"][0].content
+        title = task.split("## Title\\n\\n")[1].split("\\n")[0]
+        self.events.append(f"start {title}")
+        await asyncio.sleep(0.01)
+        return {"messages": [AIMessage(content=f"Findings of {title}")]}
+
+
+def _plan_response(*steps):
+    return json.dumps(
+        {
+            "locale": "en-US",
+            "has_enough_context": False,
+            "thought": "Test thought",
+            "title": "Test Plan",
+            "steps": [
+                {
+                    "need_web_search": step_type == "research",
+                    "title": title,
+                    "description": f"Description of {title}",
+                    "step_type": step_type,
+                    "id": step_id,
+                    "depends_on": depends_on,
+                }
+                for title, step_type, step_id, depends_on in steps
+            ],
+        }
+    )
+
+
+def _run_planner(response, early_start):
+    events = []
+    state = {
+        "messages": [],
+        "locale": "en-US",
+        "auto_accepted_plan": True,
+        "observations": [],
+    }
+    config = {
+        "configurable": {"early_start_steps": early_start, "max_parallel_steps": 2}
+    }
+    with (
+        patch(
+            "src.graph.nodes.get_llm_by_type", return_value=FakeLLM(response, events)
+        ),
+        patch("src.graph.nodes.create_agent", return_value=FakeAgent(events)),
+        patch("src.graph.nodes.get_web_search_tool", return_value=None),
+        patch("src.graph.nodes.get_stream_writer", return_value=lambda chunk: None),
+    ):
+        command = asyncio.run(planner_node(state, config))
+    return command, events
+
+
+def test_ready_steps_start_while_the_plan_is_streamed():
+    response = _plan_response(
+        ("Step A", "research", 1, []),
+        ("Step B", "research", 2, []),
+        ("Step C", "processing", 3, [1, 2]),
+    )
+    command, events = _run_planner(response, early_start=True)
+
+    assert command.goto == "human_feedback"
+    # The independent steps started before the plan was complete, Step C
+    # waits for research_team as it needs their findings
+    assert events.index("start Step A") < events.index("plan complete")
+    assert events.index("start Step B") < events.index("plan complete")
+    assert "start Step C" not in events
+    assert command.update["step_results"] == {
+        0: "Findings of Step A",
+        1: "Findings of Step B",
+    }
+
+
+def test_no_step_starts_early_by_default():
+    response = _plan_response(
+        ("Step A", "research", 1, []),
+        ("Step B", "research", 2, []),
+    )
+    command, events = _run_planner(response, early_start=False)
+
+    assert events == ["plan complete"]
+    assert "step_results" not in command.update
+
+
+def test_invalid_dependencies_fall_back_to_running_steps_in_order():
+    # Step A and Step B depend on each other
+    response = _plan_response(
+        ("Step A", "research", 1, [2]),
+        ("Step B", "research", 2, [1]),
+        ("Step C", "research", 3, []),
+    )
+    command, events = _run_planner(response, early_start=True)
+
+    plan = json.loads(command.update["current_plan"])
+    assert [(step["id"], step["depends_on"]) for step in plan["steps"]] == [
+        (1, []),
+        (2, [1]),
+        (3, [1, 2]),
+    ]
+    # No step starts early from a plan whose dependencies are invalid
+    assert events == ["plan complete"]
+    assert "step_results" not in command.update
+
+
+def test_early_steps_without_an_update_are_skipped():
+    async def step(command):
+        return command
+
+    async def collect():
+        return await _collect_early_steps(
+            {
+                0: asyncio.create_task(step(Command(goto="research_team"))),
+                1: asyncio.create_task(
+                    step(
+                        Command(
+                            update={
+                                "messages": ["Findings of Step B"],
+                                "step_results": {1: "Findings of Step B"},
+                            },
+                            goto="research_team",
+                        )
+                    )
+                ),
+            }
+        )
+
+    step_results, messages = asyncio.run(collect())
+    assert step_results == {1: "Findings of Step B"}
+    assert messages == ["Findings of Step B"]
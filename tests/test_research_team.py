@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.nodes import coder_node, research_team_node, researcher_node
+from src.graph.types import State
+from src.prompts.planner_model import Plan
+
+
+class FakeAgent:
+    """Answers every step after a delay taken from its title."""
+
+    def __init__(self, delays: dict[str, float], log: dict):
+        self.delays = delays
+        self.log = log
+
+    async def ainvoke(self, input, config=None):
+        task = input["messages"][0].content
+        title = next(t for t in self.delays if f"## Title\\n\\n{t}\\n" in task)
+        self.log["inputs"][title] = task
+        self.log["running"] += 1
+        self.log["max_running"] = max(self.log["max_running"], self.log["running"])
+        await asyncio.sleep(self.delays[title])
+        self.log["running"] -= 1
+        return {"messages": [AIMessage(content=f"Findings of {title}")]}
+
+
+def _plan(steps):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="Test thought",
+        title="Test Plan",
+        steps=[
+            {
+                "need_web_search": step_type == "research",
+                "title": title,
+                "description": f"Description of {title}",
+                "step_type": step_type,
+                **extra,
+            }
+            for title, step_type, extra in steps
+        ],
+    )
+
+
+def _research_graph():
+    builder = StateGraph(State)
+    builder.add_edge(START, "research_team")
+    builder.add_node("research_team", research_team_node)
+    builder.add_node("researcher", researcher_node)
+    builder.add_node("coder", coder_node)
+    # research_team hands the finished plan back to the planner
+    builder.add_node("planner", lambda state: {})
+    builder.add_edge("planner", END)
+    return builder.compile()
+
+
+def _run(plan, delays, max_parallel_steps):
+    log = {"inputs": {}, "running": 0, "max_running": 0}
+    with (
+        patch("src.graph.nodes.create_agent", return_value=FakeAgent(delays, log)),
+        patch("src.graph.nodes.get_web_search_tool", return_value=None),
+    ):
+        final = asyncio.run(
+            _research_graph().ainvoke(
+                {"messages": [], "current_plan": plan, "observations": []},
+                {"configurable": {"max_parallel_steps": max_parallel_steps}},
+            )
+        )
+    return final, log
+
+
+def test_fanned_out_steps_merge_back_in_plan_order():
+    plan = _plan(
+        [
+            ("Step A", "research", {"id": 1, "depends_on": []}),
+            ("Step B", "research", {"id": 2, "depends_on": []}),
+            ("Step C", "processing", {"id": 3, "depends_on": [1, 2]}),
+        ]
+    )
+    # Step A finishes after Step B
+    final, log = _run(
+        plan, {"Step A": 0.3, "Step B": 0.05, "Step C": 0.01}, max_parallel_steps=3
+    )
+
+    assert log["max_running"] == 2
+    assert final["observations"] == [
+        "Findings of Step A",
+        "Findings of Step B",
+        "Findings of Step C",
+    ]
+    assert [step.execution_res for step in final["current_plan"].steps] == [
+        "Findings of Step A",
+        "Findings of Step B",
+        "Findings of Step C",
+    ]
+    # The results of the last wave were merged and the channel reset
+    assert not final["step_results"]
+    # The processing step ran after both research steps and got their findings
+    assert "Findings of Step A" in log["inputs"]["Step C"]
+    assert "Findings of Step B" in log["inputs"]["Step C"]
+
+
+def test_steps_run_one_at_a_time_by_default():
+    plan = _plan(
+        [
+            ("Step A", "research", {}),
+            ("Step B", "research", {}),
+        ]
+    )
+    final, log = _run(plan, {"Step A": 0.05, "Step B": 0.01}, max_parallel_steps=1)
+
+    assert log["max_running"] == 1
+    assert final["observations"] == ["Findings of Step A", "Findings of Step B"]
+    assert not final["step_results"]
+
+
+def test_only_steps_with_finished_dependencies_are_dispatched():
+    plan = _plan(
+        [
+            ("Step A", "research", {"id": 1, "depends_on": []}),
+            ("Step B", "processing", {"id": 2, "depends_on": [1]}),
+            ("Step C", "research", {"id": 3, "depends_on": []}),
+        ]
+    )
+    config = {"configurable": {"max_parallel_steps": 3}}
+    command = research_team_node(
+        {"messages": [], "current_plan": plan, "observations": []}, config
+    )
+    assert [(send.node, send.arg["step_index"]) for send in command.goto] == [
+        ("researcher", 0),
+        ("researcher", 2),
+    ]
+
+    # Once Step A and Step C reported back, Step B is ready
+    command = research_team_node(
+        {
+            "messages": [],
+            "current_plan": plan,
+            "observations": [],
+            "step_results": {2: "Findings of Step C", 0: "Findings of Step A"},
+        },
+        config,
+    )
+    assert [(send.node, send.arg["step_index"]) for send in command.goto] == [
+        ("coder", 1)
+    ]
+    assert command.update["step_results"] is None
+    assert command.update["observations"] == [
+        "Findings of Step A",
+        "Findings of Step C",
+    ]
@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.search_cache import (
+    MemorySearchCache,
+    SearchCache,
+    SQLiteSearchCache,
+    create_cached_tool,
+    normalize_query,
+)
+
+
+class FakeSearch(BaseTool):
+    name: str = "web_search"
+    description: str = "Fake search engine."
+    response_format: str = "content_and_artifact"
+    max_results: int = 3
+    calls: int = 0
+
+    def _run(self, query: str) -> tuple:
+        self.calls += 1
+        if query == "fail":
+            return "TimeoutError()", {}
+        return [{"title": query}], {"results": [{"title": query}]}
+
+    async def _arun(self, query: str) -> tuple:
+        return self._run(query)
+
+
+CachedFakeSearch = create_cached_tool(FakeSearch, "fake")
+
+
+@pytest.fixture
+def search_cache():
+    cache = SearchCache(MemorySearchCache(ttl_seconds=60, max_entries=10))
+    with patch("src.tools.search_cache.get_search_cache", return_value=cache):
+        yield cache
+
+
+def test_normalize_query():
+    """Case, width and whitespace differences do not change the query."""
+    assert normalize_query("  Deer   Flow\tＡＩ ") == "deer flow ai"
+
+
+def test_cached_tool_reuses_results(search_cache):
+    """Equivalent queries with the same parameters hit the cache."""
+    tool = CachedFakeSearch()
+    first = tool.invoke({"query": "Deer Flow"})
+    assert tool.invoke({"query": "  deer flow "}) == first
+    assert tool.calls == 1
+
+    # Results depend on the search parameters
+    other = CachedFakeSearch(max_results=5)
+    other.invoke({"query": "deer flow"})
+    assert other.calls == 1
+    assert (search_cache.hits, search_cache.misses) == (1, 2)
+
+
+def test_cached_tool_keeps_tool_call_artifacts(search_cache):
+    """Cached content-and-artifact results still produce tool messages."""
+    tool = CachedFakeSearch()
+    call = {"args": {"query": "q"}, "type": "tool_call", "id": "1", "name": tool.name}
+    tool.invoke(call)
+    message = tool.invoke({**call, "id": "2"})
+    assert message.artifact == {"results": [{"title": "q"}]}
+    assert tool.calls == 1
+
+
+def test_cached_tool_async_and_failures(search_cache):
+    """Async runs share the cache and failed searches are not cached."""
+    tool = CachedFakeSearch()
+    asyncio.run(tool.ainvoke({"query": "async"}))
+    tool.invoke({"query": "async"})
+    tool.invoke({"query": "fail"})
+    tool.invoke({"query": "fail"})
+    assert tool.calls == 3
+
+
+def test_memory_cache_bounds():
+    """Entries expire after the TTL and the least recently used go first."""
+    cache = MemorySearchCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+    with patch("src.tools.search_cache.time.time", return_value=time.time() + 120):
+        assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_shared(tmp_path):
+    """Two processes' caches on the same file see each other's results."""
+    path = str(tmp_path / "search.sqlite")
+    writer = SQLiteSearchCache(path, ttl_seconds=60, max_entries=2)
+    reader = SQLiteSearchCache(path, ttl_seconds=60, max_entries=2)
+    writer.set("a", "1")
+    assert reader.get("a") == "1"
+
+    writer.set("b", "2")
+    writer.set("c", "3")
+    assert reader.get("a") is None
+    with patch("src.tools.search_cache.time.time", return_value=time.time() + 120):
+        assert reader.get("c") is None
@@ -75,9 +75,18 @@ export interface InterruptEvent
     }
   > {}
 
+export interface PartialPlanEvent
+  extends GenericEvent<
+    "partial_plan",
+    {
+      plan: Record<string, unknown>;
+    }
+  > {}
+
 export type ChatEvent =
   | MessageChunkEvent
   | ToolCallsEvent
   | ToolCallChunksEvent
   | ToolCallResultEvent
-  | InterruptEvent;
+  | InterruptEvent
+  | PartialPlanEvent;